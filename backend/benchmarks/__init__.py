@@ -0,0 +1,6 @@
+"""
+Benchmarks de rendimiento del backend de Admin Daily Report
+
+Ejecutar desde el directorio backend, por ejemplo:
+    python -m benchmarks.startup_profile
+"""
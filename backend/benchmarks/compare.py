@@ -0,0 +1,63 @@
+"""
+Comparar dos corridas de benchmarks.suite
+
+Empareja los casos por (grupo, caso, tamaño) y compara las medianas. Termina
+con código 1 si algún caso supera el umbral de regresión, para usarlo en CI.
+
+Uso (desde el directorio backend):
+    python -m benchmarks.compare base.json nuevo.json
+    python -m benchmarks.compare base.json nuevo.json --threshold 1.3 --min-ms 1
+"""
+import argparse
+import json
+from typing import Any, Dict, Tuple
+
+CaseKey = Tuple[str, str, int]
+
+
+def load_results(path: str) -> Dict[CaseKey, Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        (r["group"], r["case"], r["size"]): r
+        for r in data.get("results", [])
+        if "median_ms" in r
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Comparar resultados de benchmarks")
+    parser.add_argument("baseline", help="JSON de referencia")
+    parser.add_argument("candidate", help="JSON a evaluar")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Razón de medianas considerada regresión")
+    parser.add_argument("--min-ms", type=float, default=0.5,
+                        help="Ignorar casos cuya mediana base sea menor (ruido de medición)")
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    candidate = load_results(args.candidate)
+
+    regressions = 0
+    print(f"{'caso':<58} {'base ms':>10} {'nuevo ms':>10} {'razón':>7}")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        base_ms = baseline[key]["median_ms"]
+        new_ms = candidate[key]["median_ms"]
+        ratio = new_ms / base_ms if base_ms else float("inf")
+        flag = ""
+        if base_ms >= args.min_ms and ratio > args.threshold:
+            flag = "  REGRESIÓN"
+            regressions += 1
+        name = f"{key[0]}/{key[1]} [{key[2]}]"
+        print(f"{name:<58} {base_ms:>10.2f} {new_ms:>10.2f} {ratio:>7.2f}{flag}")
+
+    for key in sorted(baseline.keys() - candidate.keys()):
+        print(f"Sin resultado en la corrida nueva: {key[0]}/{key[1]} [{key[2]}]")
+
+    if regressions:
+        print(f"{regressions} caso(s) superan el umbral de {args.threshold:.2f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
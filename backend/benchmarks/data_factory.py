@@ -0,0 +1,230 @@
+"""
+Generador de datos sintéticos para los benchmarks
+
+Produce reportes con incidencias y movimientos (mismas columnas que el Excel y
+mismos valores de config: administradores, operaciones, tipos de incidencia) y
+los vuelca a un libro Excel o a la base de datos.
+
+faker es opcional: si está instalado se usan nombres realistas, si no se
+combinan listas fijas. Con la misma semilla los datos son idénticos.
+"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.config import ADMINISTRATORS, CLIENT_OPERATIONS, INCIDENT_TYPES, EMPLOYEE_STATUSES, EXCEL_SCHEMA, settings
+from src.utils.date_utils import BOGOTA_TZ
+
+try:
+    from faker import Faker
+except ImportError:
+    Faker = None
+
+FIRST_NAMES = ["Ana", "Carlos", "Diana", "Jorge", "Luisa", "Mario", "Paola", "Ricardo", "Sandra", "Tomás"]
+LAST_NAMES = ["Gómez", "Rodríguez", "Martínez", "López", "Hernández", "Pérez", "Díaz", "Rojas", "Torres", "Vargas"]
+POSITIONS = ["Operario", "Técnico", "Supervisor", "Auxiliar administrativo", "Conductor", "Ingeniero de campo"]
+FACTS = [
+    "",
+    "Sin novedades relevantes.",
+    "Se realizó capacitación de seguridad industrial al personal de turno.",
+    "Retraso en el transporte del personal por condiciones de la vía.",
+]
+
+
+@dataclass
+class SyntheticDataset:
+    """Reportes, incidencias y movimientos con las columnas del Excel"""
+    reports: List[Dict[str, Any]] = field(default_factory=list)
+    incidents: List[Dict[str, Any]] = field(default_factory=list)
+    movements: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def dates(self) -> List[date]:
+        return sorted({r["Fecha_Creacion"].date() for r in self.reports})
+
+
+def _name_generator(rng: random.Random, seed: int):
+    if Faker is not None:
+        fake = Faker("es_CO")
+        fake.seed_instance(seed)
+        return fake.name
+    return lambda: f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def generate_dataset(n_reports: int, seed: int = 42, end_date: Optional[date] = None, days: int = 90) -> SyntheticDataset:
+    """
+    Generar n_reports reportes repartidos en los últimos `days` días
+
+    En promedio cada reporte tiene ~1.5 incidencias y ~0.5 movimientos.
+    """
+    rng = random.Random(seed)
+    next_name = _name_generator(rng, seed)
+    end_date = end_date or date.today()
+    dataset = SyntheticDataset()
+
+    for i in range(n_reports):
+        report_date = end_date - timedelta(days=rng.randrange(days))
+        created = datetime.combine(report_date, time(6, 0), tzinfo=BOGOTA_TZ) + timedelta(
+            seconds=rng.randrange(12 * 3600)
+        )
+        report_id = f"RPT-{created:%Y%m%d-%H%M%S}-{i:06d}"
+        n_incidents = rng.choice([0, 0, 1, 1, 2, 3, 4])
+        n_movements = rng.choice([0, 0, 0, 1, 2])
+
+        dataset.reports.append({
+            "ID": report_id,
+            "Fecha_Creacion": created,
+            "Administrador": rng.choice(ADMINISTRATORS),
+            "Cliente_Operacion": rng.choice(CLIENT_OPERATIONS),
+            "Horas_Diarias": rng.choice([8, 9, 10, 12]),
+            "Personal_Staff": rng.randint(0, 40),
+            "Personal_Base": rng.randint(0, 250),
+            "Cantidad_Incidencias": n_incidents,
+            "Cantidad_Ingresos_Retiros": n_movements,
+            "Hechos_Relevantes": rng.choice(FACTS),
+            "Estado": "Completado",
+            "IP_Origen": f"10.0.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+            "User_Agent": "Mozilla/5.0 (benchmark)",
+        })
+        for n in range(1, n_incidents + 1):
+            dataset.incidents.append({
+                "ID_Reporte": report_id,
+                "Numero_Incidencia": n,
+                "Tipo_Incidencia": rng.choice(INCIDENT_TYPES),
+                "Nombre_Empleado": next_name(),
+                "Fecha_Fin_Novedad": report_date + timedelta(days=rng.randint(1, 30)),
+                "Fecha_Registro": created,
+            })
+        for n in range(1, n_movements + 1):
+            dataset.movements.append({
+                "ID_Reporte": report_id,
+                "Numero_Movimiento": n,
+                "Nombre_Empleado": next_name(),
+                "Cargo": rng.choice(POSITIONS),
+                "Estado": rng.choice(EMPLOYEE_STATUSES),
+                "Fecha_Registro": created,
+            })
+
+    dataset.reports.sort(key=lambda r: r["Fecha_Creacion"])
+    return dataset
+
+
+def write_workbook(dataset: SyntheticDataset, path: Path) -> Path:
+    """Escribir el dataset en un libro con la estructura de ExcelHandler (modo write_only)"""
+    from openpyxl import Workbook
+
+    def naive(value):
+        # openpyxl no admite datetimes con zona horaria
+        return value.replace(tzinfo=None) if isinstance(value, datetime) else value
+
+    workbook = Workbook(write_only=True)
+    for sheet_key, rows in (
+        ("reportes", dataset.reports),
+        ("incidencias", dataset.incidents),
+        ("ingresos_retiros", dataset.movements),
+    ):
+        columns = EXCEL_SCHEMA[sheet_key]["columns"]
+        sheet = workbook.create_sheet(settings.excel_sheets[sheet_key])
+        sheet.append(columns)
+        for row in rows:
+            sheet.append([naive(row[c]) for c in columns])
+
+    config_sheet = workbook.create_sheet(settings.excel_sheets["configuracion"])
+    config_sheet.append(["Clave", "Valor", "Descripcion", "Fecha_Modificacion"])
+    config_sheet.append(["version_sistema", "1.0.0", "Version del sistema", datetime.now()])
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    workbook.save(path)
+    return path
+
+
+def load_database(dataset: SyntheticDataset, engine, encryptor) -> Dict[str, int]:
+    """
+    Insertar el dataset en la base de datos (campos sensibles encriptados)
+
+    Crea un usuario por administrador. Las tablas deben existir.
+    """
+    from sqlalchemy import func, insert, select, update
+    from src.database.models import User, Report, Incident, Movement
+
+    def enc(value):
+        return encryptor.encrypt(value) if value else value
+
+    users = {}
+    user_rows = []
+    for admin in ADMINISTRATORS:
+        user_id = uuid.uuid4()
+        users[admin] = user_id
+        user_rows.append({
+            "id": user_id,
+            "username": f"bench_{len(users)}",
+            "email": enc(f"bench_{len(users)}@example.com"),
+            "password_hash": "x",
+            "full_name": enc(admin),
+            "role": "operator",
+            "administrator_name": admin,
+        })
+
+    report_ids = {}
+    report_rows = []
+    for r in dataset.reports:
+        report_id = uuid.uuid4()
+        report_ids[r["ID"]] = (report_id, r["Fecha_Creacion"].date())
+        report_rows.append({
+            "id": report_id,
+            "legacy_id": r["ID"],
+            "user_id": users[r["Administrador"]],
+            "administrator": r["Administrador"],
+            "client_operation": r["Cliente_Operacion"],
+            "daily_hours": r["Horas_Diarias"],
+            "staff_personnel": r["Personal_Staff"],
+            "base_personnel": r["Personal_Base"],
+            "relevant_facts": enc(r["Hechos_Relevantes"]),
+            "status": "completed",
+            "report_date": r["Fecha_Creacion"].date(),
+            "created_at": r["Fecha_Creacion"],
+            "client_ip": r["IP_Origen"],
+            "user_agent": r["User_Agent"],
+        })
+
+    incident_rows = [
+        {
+            "id": uuid.uuid4(),
+            "report_id": report_ids[i["ID_Reporte"]][0],
+            "report_date": report_ids[i["ID_Reporte"]][1],
+            "incident_type": i["Tipo_Incidencia"],
+            "employee_name": enc(i["Nombre_Empleado"]),
+            "end_date": i["Fecha_Fin_Novedad"],
+            "notes": "",
+        }
+        for i in dataset.incidents
+    ]
+    movement_rows = [
+        {
+            "id": uuid.uuid4(),
+            "report_id": report_ids[m["ID_Reporte"]][0],
+            "report_date": report_ids[m["ID_Reporte"]][1],
+            "employee_name": enc(m["Nombre_Empleado"]),
+            "position": m["Cargo"],
+            "movement_type": m["Estado"],
+            "effective_date": report_ids[m["ID_Reporte"]][1],
+            "notes": "",
+        }
+        for m in dataset.movements
+    ]
+
+    with engine.begin() as conn:
+        for model, rows in ((User, user_rows), (Report, report_rows), (Incident, incident_rows), (Movement, movement_rows)):
+            for start in range(0, len(rows), 5000):
+                conn.execute(insert(model), rows[start:start + 5000])
+        # Contadores de hijos: create_all no instala los triggers de sql/init.sql
+        conn.execute(update(Report).values(
+            incident_count=select(func.count()).where(Incident.report_id == Report.id).scalar_subquery(),
+            movement_count=select(func.count()).where(Movement.report_id == Report.id).scalar_subquery(),
+        ))
+
+    return {"users": len(user_rows), "reports": len(report_rows),
+            "incidents": len(incident_rows), "movements": len(movement_rows)}
@@ -0,0 +1,291 @@
+"""
+Prueba de carga del pico de reportes de la mañana
+
+Simula la ventana en la que todos los administradores reportan y el área
+admin refresca el dashboard al mismo tiempo, contra un stack local:
+
+- administradores (--concurrency): login -> /auth/me/operations ->
+  /reportes/admin/{nombre}/today -> POST /reportes -> consultas de estado
+  repetidas (como TodayReportsStatus) con pausas entre requests
+- lectores del dashboard (--dashboard-users): analytics, listado del día y
+  vistas 1 y 2, en bucle con el intervalo de refresco
+
+Reporta por endpoint la cantidad de requests, la tasa de error y los
+percentiles p50/p95/p99 de latencia, y opcionalmente los guarda en JSON.
+
+Las credenciales se leen de un CSV `usuario,contraseña` (un usuario por
+administrador, ver migrate_users.py). El login tiene rate limit por IP: cada
+usuario virtual envía su propio X-Forwarded-For, como si reportara desde una
+sede distinta. Los POST crean reportes reales: usar solo contra un entorno
+local o de pruebas (o --skip-writes).
+
+Uso (desde el directorio backend):
+    python -m benchmarks.loadtest --users usuarios.csv --concurrency 40 --duration 120
+    python -m benchmarks.loadtest --users usuarios.csv --admin-user admin --admin-password ... \\
+        --dashboard-users 5 --json carga.json
+"""
+import argparse
+import asyncio
+import csv
+import json
+import random
+import statistics
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+
+INCIDENT_TYPES = ["Vacaciones", "Permiso por Cita Medica", "Incapacidad Medica Por Enfermedad Comun", "Compensatorios"]
+POSITIONS = ["Operario", "Técnico", "Supervisor", "Conductor"]
+
+
+class LatencyRecorder:
+    """Latencias y errores por endpoint"""
+
+    def __init__(self):
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.timings[name].append((time.perf_counter() - start) * 1000)
+            self.errors[name] += 1
+            self.statuses[name][0] += 1
+            return None
+        self.timings[name].append((time.perf_counter() - start) * 1000)
+        self.statuses[name][response.status_code] += 1
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], pct: float) -> float:
+        index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        names = sorted(self.timings)
+        all_timings = [t for n in names for t in self.timings[n]]
+        for name, values in [(n, self.timings[n]) for n in names] + [("TOTAL", all_timings)]:
+            if not values:
+                continue
+            ordered = sorted(values)
+            errors = sum(self.errors.values()) if name == "TOTAL" else self.errors[name]
+            result[name] = {
+                "requests": len(values),
+                "errors": errors,
+                "error_rate": round(errors / len(values), 4),
+                "rps": round(len(values) / elapsed, 2) if elapsed else 0,
+                "p50_ms": round(self._percentile(ordered, 50), 1),
+                "p95_ms": round(self._percentile(ordered, 95), 1),
+                "p99_ms": round(self._percentile(ordered, 99), 1),
+                "mean_ms": round(statistics.fmean(ordered), 1),
+                "max_ms": round(ordered[-1], 1),
+            }
+            if name != "TOTAL":
+                result[name]["status_codes"] = dict(self.statuses[name])
+        return result
+
+
+def load_credentials(path: str) -> List[Tuple[str, str]]:
+    """Leer `usuario,contraseña` por línea (ignora encabezado y comentarios)"""
+    credentials = []
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith("#") or row[0].strip().lower() in ("username", "usuario"):
+                continue
+            credentials.append((row[0].strip(), row[1].strip()))
+    if not credentials:
+        raise SystemExit(f"Sin credenciales en {path}")
+    return credentials
+
+
+def build_report(admin_name: str, operation: str, rng: random.Random) -> Dict[str, Any]:
+    """Cuerpo de POST /reportes con la forma del formulario"""
+    today = date.today()
+    return {
+        "administrador": admin_name,
+        "cliente_operacion": operation,
+        "horas_diarias": rng.choice([8, 9, 10]),
+        "personal_staff": rng.randint(1, 30),
+        "personal_base": rng.randint(5, 200),
+        "incidencias": [
+            {
+                "tipo": rng.choice(INCIDENT_TYPES),
+                "nombre_empleado": f"Empleado Carga {rng.randint(1, 9999)}",
+                "fecha_fin": (today + timedelta(days=rng.randint(1, 15))).isoformat(),
+            }
+            for _ in range(rng.choice([0, 1, 1, 2, 3]))
+        ],
+        "ingresos_retiros": [
+            {
+                "nombre_empleado": f"Empleado Carga {rng.randint(1, 9999)}",
+                "cargo": rng.choice(POSITIONS),
+                "estado": rng.choice(["Ingreso", "Retiro"]),
+            }
+            for _ in range(rng.choice([0, 0, 1]))
+        ],
+        "hechos_relevantes": "Prueba de carga",
+    }
+
+
+async def pause(args, rng: random.Random) -> None:
+    """Tiempo de "lectura" del usuario entre requests"""
+    if args.think_time > 0:
+        await asyncio.sleep(rng.uniform(0.5, 1.5) * args.think_time)
+
+
+async def administrator_session(index: int, credentials: Tuple[str, str], args, recorder: LatencyRecorder, deadline: float) -> None:
+    """Un administrador reportando: login, operaciones, estado, envío y polling"""
+    rng = random.Random(args.seed + index)
+    headers = {"X-Forwarded-For": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"}
+    prefix = args.api_prefix
+
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=args.timeout) as client:
+        await asyncio.sleep(rng.uniform(0, args.ramp_up))
+        while time.monotonic() < deadline:
+            username, password = credentials
+            response = await recorder.request(client, "POST /auth/login", "POST", f"{prefix}/auth/login",
+                                              json={"username": username, "password": password})
+            if response is None or response.status_code != 200:
+                await asyncio.sleep(1)
+                continue
+            login = response.json()
+            client.headers["Authorization"] = f"Bearer {login['access_token']}"
+            user = login.get("user", {})
+            admin_name = user.get("administrator_name") or user.get("full_name") or username
+
+            response = await recorder.request(client, "GET /auth/me/operations", "GET", f"{prefix}/auth/me/operations")
+            operations = response.json().get("operations", []) if response is not None and response.status_code == 200 else []
+            operation = (operations[0] if operations else None) or user.get("client_operation") or "Operación de carga"
+            await pause(args, rng)
+
+            today_url = f"{prefix}/reportes/admin/{quote(admin_name)}/today"
+            await recorder.request(client, "GET /reportes/admin/{name}/today", "GET", today_url,
+                                   params={"operacion": operation})
+            await pause(args, rng)
+
+            if not args.skip_writes:
+                await recorder.request(client, "POST /reportes", "POST", f"{prefix}/reportes",
+                                       json=build_report(admin_name, operation, rng))
+
+            for _ in range(args.polls):
+                if time.monotonic() >= deadline:
+                    break
+                await pause(args, rng)
+                await recorder.request(client, "GET /reportes/admin/{name}/today", "GET", today_url,
+                                       params={"operacion": operation})
+
+            client.headers.pop("Authorization", None)
+            if args.once:
+                break
+
+
+async def dashboard_session(index: int, args, recorder: LatencyRecorder, deadline: float) -> None:
+    """Un usuario del área admin refrescando el dashboard"""
+    rng = random.Random(args.seed + 100000 + index)
+    headers = {"X-Forwarded-For": f"10.255.{index // 256 % 256}.{index % 256}"}
+    prefix = args.api_prefix
+
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=args.timeout) as client:
+        response = await recorder.request(client, "POST /auth/login", "POST", f"{prefix}/auth/login",
+                                          json={"username": args.admin_user, "password": args.admin_password})
+        if response is None or response.status_code != 200:
+            return
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        await asyncio.sleep(rng.uniform(0, args.ramp_up))
+
+        while time.monotonic() < deadline:
+            today = date.today().isoformat()
+            await asyncio.gather(
+                recorder.request(client, "GET /admin/analytics", "GET", f"{prefix}/admin/analytics"),
+                recorder.request(client, "GET /admin/reportes", "GET", f"{prefix}/admin/reportes",
+                                 params={"fecha_inicio": today, "fecha_fin": today}),
+                recorder.request(client, "GET /admin/daily-general-operations", "GET",
+                                 f"{prefix}/admin/daily-general-operations", params={"fecha": today}),
+                recorder.request(client, "GET /admin/daily-detailed-operations", "GET",
+                                 f"{prefix}/admin/daily-detailed-operations", params={"fecha": today}),
+            )
+            await asyncio.sleep(rng.uniform(0.8, 1.2) * args.refresh_interval)
+
+
+async def run(args) -> Dict[str, Any]:
+    credentials = load_credentials(args.users)
+    recorder = LatencyRecorder()
+    start = time.monotonic()
+    deadline = start + args.duration
+
+    tasks = [
+        administrator_session(i, credentials[i % len(credentials)], args, recorder, deadline)
+        for i in range(args.concurrency)
+    ]
+    if args.dashboard_users and args.admin_user:
+        tasks += [dashboard_session(i, args, recorder, deadline) for i in range(args.dashboard_users)]
+    await asyncio.gather(*tasks)
+
+    elapsed = time.monotonic() - start
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "dashboard_users": args.dashboard_users if args.admin_user else 0,
+            "duration_s": round(elapsed, 1),
+            "think_time_s": args.think_time,
+            "writes": not args.skip_writes,
+        },
+        "endpoints": recorder.summary(elapsed),
+    }
+
+
+def print_summary(result: Dict[str, Any]) -> None:
+    meta = result["meta"]
+    print(f"{meta['concurrency']} administradores, {meta['dashboard_users']} lectores del dashboard, "
+          f"{meta['duration_s']} s contra {meta['base_url']}")
+    print(f"{'endpoint':<40} {'reqs':>7} {'err %':>7} {'rps':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in result["endpoints"].items():
+        print(f"{name:<40} {row['requests']:>7} {row['error_rate'] * 100:>7.2f} {row['rps']:>7.2f} "
+              f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prueba de carga del pico de reportes de la mañana")
+    parser.add_argument("--base-url", default="http://localhost:8001", help="URL del backend")
+    parser.add_argument("--api-prefix", default="/api/v1", help="Prefijo de la API")
+    parser.add_argument("--users", required=True, help="CSV con usuario,contraseña de los administradores")
+    parser.add_argument("--concurrency", type=int, default=20, help="Administradores simultáneos")
+    parser.add_argument("--duration", type=float, default=60, help="Duración de la prueba en segundos")
+    parser.add_argument("--ramp-up", type=float, default=10, help="Segundos en los que arrancan los usuarios")
+    parser.add_argument("--think-time", type=float, default=2.0, help="Pausa media entre requests de un usuario")
+    parser.add_argument("--polls", type=int, default=3, help="Consultas de estado después de enviar")
+    parser.add_argument("--once", action="store_true", help="Cada administrador envía un solo reporte")
+    parser.add_argument("--skip-writes", action="store_true", help="No enviar POST /reportes")
+    parser.add_argument("--admin-user", help="Usuario admin para los lectores del dashboard")
+    parser.add_argument("--admin-password", default="", help="Contraseña del usuario admin")
+    parser.add_argument("--dashboard-users", type=int, default=3, help="Lectores del dashboard simultáneos")
+    parser.add_argument("--refresh-interval", type=float, default=5.0, help="Segundos entre refrescos del dashboard")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Timeout por request en segundos")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de los datos y las pausas")
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en un archivo JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print_summary(result)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Resultados guardados en {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,200 @@
+"""
+Benchmark de serialización y compresión del listado de reportes
+
+Construye un listado sintético con la misma forma que ReportService.list_reports
+(reportes con incidencias y movimientos) y lo sirve desde dos apps ASGI mínimas:
+
+- antes: response_model=List[Dict[str, Any]] + JSONResponse (jsonable_encoder + json)
+- después: json_response() con orjson, sin revalidar, detrás de GZipMiddleware
+
+Mide latencia (mediana y p95 sobre varias repeticiones) y tamaño del payload
+sin comprimir y comprimido. No necesita base de datos ni Excel.
+
+Uso (desde el directorio backend):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --reports 10000 --repeat 15 --json serialization.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from fastapi import FastAPI, Response
+from fastapi.middleware.gzip import GZipMiddleware
+
+from src.utils.responses import FastJSONResponse, json_response
+
+BOGOTA = timezone(timedelta(hours=-5))
+
+INCIDENT_TYPES = ["Incapacidad", "Vacaciones", "Licencia de maternidad", "Permiso no remunerado"]
+MOVEMENT_TYPES = ["Ingreso", "Retiro"]
+
+
+def build_reports(count: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Reportes con la forma de ReportService.serialize_report (include_client_info=True)"""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 7, 0, tzinfo=BOGOTA)
+    reports = []
+    for i in range(count):
+        created = start + timedelta(minutes=17 * i)
+        incidents = [
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "tipo": rng.choice(INCIDENT_TYPES),
+                "nombre_empleado": f"Empleado {rng.randint(1, 5000)}",
+                "fecha_fin": (created.date() + timedelta(days=rng.randint(1, 30))).isoformat(),
+                "notas": "",
+            }
+            for _ in range(rng.randint(0, 4))
+        ]
+        movements = [
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "nombre_empleado": f"Empleado {rng.randint(1, 5000)}",
+                "cargo": "Operario",
+                "estado": rng.choice(MOVEMENT_TYPES),
+                "fecha_efectiva": created.date().isoformat(),
+                "notas": "",
+            }
+            for _ in range(rng.randint(0, 2))
+        ]
+        reports.append({
+            "ID": str(uuid.UUID(int=rng.getrandbits(128))),
+            "Fecha_Creacion": created,
+            "Administrador": f"Administrador {i % 12}",
+            "Cliente_Operacion": f"Operacion {i % 40}",
+            "Horas_Diarias": rng.choice([8.0, 9.0, 9.5, 10.0, 12.0]),
+            "Personal_Staff": rng.randint(0, 40),
+            "Personal_Base": rng.randint(0, 300),
+            "Cantidad_Incidencias": len(incidents),
+            "Cantidad_Ingresos_Retiros": len(movements),
+            "Hechos_Relevantes": "Sin novedades relevantes en la operación del día." * rng.randint(0, 3),
+            "Estado": "completed",
+            "IP_Origen": f"10.0.{i % 255}.{rng.randint(1, 254)}",
+            "User_Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "incidencias": incidents,
+            "ingresos_retiros": movements,
+        })
+    return reports
+
+
+def build_apps(reports: List[Dict[str, Any]], gzip_level: int, minimum_size: int) -> Tuple[FastAPI, FastAPI]:
+    """App "antes" (comportamiento por defecto de FastAPI) y "después" (orjson + gzip)"""
+    before = FastAPI()
+
+    @before.get("/reportes", response_model=List[Dict[str, Any]])
+    async def list_before():
+        return reports
+
+    after = FastAPI(default_response_class=FastJSONResponse)
+    after.add_middleware(GZipMiddleware, minimum_size=minimum_size, compresslevel=gzip_level)
+
+    @after.get("/reportes", response_model=List[Dict[str, Any]])
+    async def list_after(response: Response):
+        return json_response(reports, response)
+
+    return before, after
+
+
+async def asgi_get(app, path: str, accept_encoding: str) -> Tuple[int, bytes, Dict[str, str]]:
+    """Ejecutar un GET directamente sobre la app ASGI (sin red)"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", accept_encoding.encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    body = bytearray()
+    result: Dict[str, Any] = {}
+    request_sent = False
+    response_done = asyncio.Event()
+
+    async def receive():
+        # Como un servidor real: el cuerpo una vez y la desconexión al terminar la respuesta
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+            result["headers"] = {k.decode(): v.decode() for k, v in message["headers"]}
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_done.set()
+
+    await app(scope, receive, send)
+    return result["status"], bytes(body), result["headers"]
+
+
+def measure(app, accept_encoding: str, repeat: int) -> Dict[str, Any]:
+    """Latencia y tamaño de la respuesta"""
+    timings = []
+    status = size = 0
+    encoding = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        status, body, headers = asyncio.run(asgi_get(app, "/reportes", accept_encoding))
+        timings.append((time.perf_counter() - start) * 1000)
+        size = len(body)
+        encoding = headers.get("content-encoding")
+    timings.sort()
+    return {
+        "status": status,
+        "bytes": size,
+        "content_encoding": encoding,
+        "median_ms": round(statistics.median(timings), 1),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de serialización del listado de reportes")
+    parser.add_argument("--reports", type=int, default=10000, help="Cantidad de reportes del listado")
+    parser.add_argument("--repeat", type=int, default=10, help="Repeticiones por escenario")
+    parser.add_argument("--gzip-level", type=int, default=6, help="Nivel de compresión gzip")
+    parser.add_argument("--minimum-size", type=int, default=1024, help="Tamaño mínimo para comprimir")
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en un archivo JSON")
+    args = parser.parse_args()
+
+    reports = build_reports(args.reports)
+    before, after = build_apps(reports, args.gzip_level, args.minimum_size)
+
+    results = {
+        "reports": args.reports,
+        "before": measure(before, "gzip", args.repeat),
+        "after_identity": measure(after, "identity", args.repeat),
+        "after_gzip": measure(after, "gzip", args.repeat),
+    }
+
+    print(f"Listado de {args.reports} reportes ({args.repeat} repeticiones)")
+    print(f"{'escenario':<16} {'bytes':>12} {'mediana ms':>12} {'p95 ms':>10}")
+    for name in ("before", "after_identity", "after_gzip"):
+        row = results[name]
+        print(f"{name:<16} {row['bytes']:>12,} {row['median_ms']:>12} {row['p95_ms']:>10}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, default=str)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,193 @@
+"""
+Perfil de arranque de la API basado en `python -X importtime`
+
+Importa `src.api` en un proceso nuevo (igual que uvicorn al arrancar el
+contenedor), agrega los tiempos de importacion por modulo y falla si:
+- se cargan modulos pesados que deben diferirse hasta su primer uso
+  (pandas, numpy, openpyxl),
+- un modulo propio se carga dos veces con rutas distintas (`database.x` y
+  `src.database.x`), lo que duplica singletons como el engine de SQLAlchemy,
+- el proceso termina con mas de un engine de SQLAlchemy, o
+- el tiempo total de importacion supera el presupuesto indicado.
+
+Uso (desde el directorio backend):
+    python -m benchmarks.startup_profile
+    python -m benchmarks.startup_profile --budget-ms 1500 --top 25 --json startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Modulos que no deben importarse al cargar la API
+DEFERRED_MODULES = ["pandas", "numpy", "openpyxl"]
+
+# Cuenta los engines de SQLAlchemy vivos despues de importar el modulo
+ENGINE_COUNT_SNIPPET = (
+    "import gc, sys\n"
+    "engine_cls = getattr(sys.modules.get('sqlalchemy.engine'), 'Engine', None)\n"
+    "print(sum(1 for o in gc.get_objects() if engine_cls and isinstance(o, engine_cls)))\n"
+)
+
+
+def run_importtime(module: str) -> Dict:
+    """
+    Importar un modulo en un proceso nuevo con -X importtime
+
+    Returns:
+        Diccionario con tiempo de pared, la salida cruda de importtime y
+        la cantidad de engines de SQLAlchemy creados
+    """
+    env = os.environ.copy()
+    # Igual que el despliegue por tunel: /app y /app/src en el path
+    env["PYTHONPATH"] = os.pathsep.join([str(BACKEND_DIR), str(BACKEND_DIR / "src")])
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}\n{ENGINE_COUNT_SNIPPET}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    try:
+        engine_count = int(result.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        engine_count = None
+
+    return {
+        "returncode": result.returncode,
+        "wall_ms": wall_ms,
+        "stderr": result.stderr,
+        "engine_count": engine_count,
+    }
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Parsear las lineas `import time: self [us] | cumulative | package`"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            _, data = line.split(":", 1)
+            self_us, cumulative_us, name = data.split("|", 2)
+            entries.append({
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+        except ValueError:
+            continue
+    return entries
+
+
+def find_duplicate_modules(imported: Set[str]) -> List[str]:
+    """Modulos propios importados a la vez como `x.y` y `src.x.y`"""
+    return sorted(
+        name for name in imported
+        if not name.startswith("src.") and f"src.{name}" in imported
+    )
+
+
+def build_profile(entries: List[Dict], wall_ms: float, top: int, engine_count: Optional[int] = None) -> Dict:
+    """Construir el resumen del perfil de arranque"""
+    top_level = [e for e in entries if e["depth"] == 0]
+    total_ms = sum(e["cumulative_ms"] for e in top_level)
+    imported = {e["module"] for e in entries}
+
+    deferred_loaded = sorted(
+        name for name in imported
+        if name.split(".")[0] in DEFERRED_MODULES
+    )
+
+    return {
+        "wall_ms": round(wall_ms, 1),
+        "import_total_ms": round(total_ms, 1),
+        "modules_imported": len(imported),
+        "deferred_modules_loaded": deferred_loaded,
+        "duplicate_modules": find_duplicate_modules(imported),
+        "sqlalchemy_engines": engine_count,
+        "slowest_top_level": sorted(top_level, key=lambda e: e["cumulative_ms"], reverse=True)[:top],
+        "slowest_self": sorted(entries, key=lambda e: e["self_ms"], reverse=True)[:top],
+    }
+
+
+def print_profile(profile: Dict) -> None:
+    """Imprimir el perfil en formato legible"""
+    print("\n" + "=" * 60)
+    print("PERFIL DE ARRANQUE (python -X importtime)")
+    print("=" * 60)
+    print(f"Tiempo de pared:        {profile['wall_ms']:.1f} ms")
+    print(f"Tiempo de importacion:  {profile['import_total_ms']:.1f} ms")
+    print(f"Modulos importados:     {profile['modules_imported']}")
+    print(f"Engines de SQLAlchemy:  {profile['sqlalchemy_engines']}")
+
+    print("\nImports de primer nivel mas lentos (acumulado):")
+    for entry in profile["slowest_top_level"]:
+        print(f"  {entry['cumulative_ms']:9.1f} ms  {entry['module']}")
+
+    print("\nModulos con mayor tiempo propio:")
+    for entry in profile["slowest_self"]:
+        print(f"  {entry['self_ms']:9.1f} ms  {entry['module']}")
+    print("=" * 60)
+
+
+def main():
+    """Funcion principal del benchmark"""
+    parser = argparse.ArgumentParser(description="Startup import-time profile for the API")
+    parser.add_argument("--module", default="src.api", help="Module to import")
+    parser.add_argument("--budget-ms", type=float, help="Fail if total import time exceeds this budget")
+    parser.add_argument("--top", type=int, default=15, help="Number of modules to list")
+    parser.add_argument("--json", dest="json_path", help="Write the profile as JSON to this path")
+    args = parser.parse_args()
+
+    result = run_importtime(args.module)
+    if result["returncode"] != 0:
+        print(result["stderr"][-4000:])
+        print(f"\n❌ No se pudo importar {args.module}")
+        sys.exit(1)
+
+    profile = build_profile(
+        parse_importtime(result["stderr"]), result["wall_ms"], args.top, result["engine_count"]
+    )
+    print_profile(profile)
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(profile, indent=2))
+
+    failures = []
+    if profile["deferred_modules_loaded"]:
+        failures.append(
+            f"Modulos pesados cargados al arrancar: {', '.join(profile['deferred_modules_loaded'][:10])}"
+        )
+    if profile["duplicate_modules"]:
+        failures.append(
+            f"Modulos importados con dos rutas distintas: {', '.join(profile['duplicate_modules'])}"
+        )
+    if profile["sqlalchemy_engines"] is not None and profile["sqlalchemy_engines"] > 1:
+        failures.append(f"Se crearon {profile['sqlalchemy_engines']} engines de SQLAlchemy (se espera 1)")
+    if args.budget_ms is not None and profile["import_total_ms"] > args.budget_ms:
+        failures.append(
+            f"Importacion de {profile['import_total_ms']:.1f} ms supera el presupuesto de {args.budget_ms:.1f} ms"
+        )
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+
+    print("✅ Arranque dentro de los limites")
+
+
+if __name__ == "__main__":
+    main()
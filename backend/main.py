@@ -13,6 +13,7 @@ if __name__ == "__main__":
         port=settings.port,
         reload=settings.reload,
         log_level=settings.log_level.lower(),
-        access_log=True,
+        # El log de acceso lo escribe log_requests (JSON, con request id y muestreo)
+        access_log=False,
         loop="asyncio"
     )
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Backfill de reports.incident_count y reports.movement_count
+
+Los triggers de la migración 002 mantienen los contadores desde que se
+instalan; este script calcula el valor de los reportes existentes. Recorre
+los reportes por lotes de ID (una transacción corta por lote) y solo escribe
+las filas cuyo contador difiere, así que se puede interrumpir y repetir.
+
+Uso (desde el directorio backend, después de aplicar la migración 002):
+    python scripts/backfill_report_counts.py
+    python scripts/backfill_report_counts.py --batch-size 5000
+    python scripts/backfill_report_counts.py --check
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+from loguru import logger
+
+# Agregar el directorio src al path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from database.connection import get_database_url  # noqa: E402
+
+# IDs del siguiente lote (orden por PK, sin OFFSET)
+NEXT_BATCH_SQL = text("""
+    SELECT id FROM reports.reports
+    WHERE (CAST(:after AS uuid) IS NULL OR id > CAST(:after AS uuid))
+    ORDER BY id
+    LIMIT :batch_size
+""")
+
+# Conteos reales del lote; solo las filas que no coinciden
+MISMATCHES_SQL = """
+    SELECT r.id, r.incident_count, r.movement_count,
+           COALESCE(i.n, 0) AS incidents, COALESCE(m.n, 0) AS movements
+    FROM reports.reports r
+    LEFT JOIN (
+        SELECT report_id, COUNT(*) AS n FROM reports.incidents
+        WHERE report_id = ANY(CAST(:ids AS uuid[])) GROUP BY report_id
+    ) i ON i.report_id = r.id
+    LEFT JOIN (
+        SELECT report_id, COUNT(*) AS n FROM reports.movements
+        WHERE report_id = ANY(CAST(:ids AS uuid[])) GROUP BY report_id
+    ) m ON m.report_id = r.id
+    WHERE r.id = ANY(CAST(:ids AS uuid[]))
+      AND (r.incident_count <> COALESCE(i.n, 0) OR r.movement_count <> COALESCE(m.n, 0))
+"""
+
+UPDATE_SQL = text(f"""
+    UPDATE reports.reports r
+    SET incident_count = c.incidents, movement_count = c.movements
+    FROM ({MISMATCHES_SQL}) c
+    WHERE r.id = c.id
+""")
+
+
+class ReportCountBackfill:
+    """Recalcula los contadores de hijos por lotes"""
+
+    def __init__(self, db_url: Optional[str] = None, batch_size: int = 2000):
+        self.engine = create_engine(db_url or get_database_url())
+        self.batch_size = batch_size
+        self.stats = {"reports_scanned": 0, "reports_fixed": 0, "batches": 0}
+
+    def run(self, check_only: bool = False):
+        """Recorrer todos los reportes; con check_only solo cuenta las diferencias"""
+        start = time.perf_counter()
+        after = None
+        while True:
+            with self.engine.begin() as conn:
+                ids = [str(row[0]) for row in conn.execute(
+                    NEXT_BATCH_SQL, {"after": after, "batch_size": self.batch_size}
+                )]
+                if not ids:
+                    break
+                if check_only:
+                    rows = conn.execute(text(MISMATCHES_SQL), {"ids": ids}).fetchall()
+                    for row in rows[:10]:
+                        logger.warning(
+                            f"Reporte {row.id}: incidencias {row.incident_count} (real {row.incidents}), "
+                            f"movimientos {row.movement_count} (real {row.movements})"
+                        )
+                    fixed = len(rows)
+                else:
+                    fixed = conn.execute(UPDATE_SQL, {"ids": ids}).rowcount
+
+            after = ids[-1]
+            self.stats["reports_scanned"] += len(ids)
+            self.stats["reports_fixed"] += fixed
+            self.stats["batches"] += 1
+            logger.info(f"Lote {self.stats['batches']}: {len(ids)} reportes, {fixed} con diferencias")
+
+        self.stats["elapsed_seconds"] = round(time.perf_counter() - start, 2)
+
+    def print_stats(self, check_only: bool):
+        print("\n" + "="*50)
+        print("REPORT COUNT BACKFILL")
+        print("="*50)
+        print(f"Reports scanned:    {self.stats['reports_scanned']}")
+        label = "Mismatched:" if check_only else "Reports fixed:"
+        print(f"{label:<20}{self.stats['reports_fixed']}")
+        print(f"Batches:            {self.stats['batches']}")
+        print(f"Elapsed:            {self.stats.get('elapsed_seconds', 0)}s")
+        print("="*50)
+
+
+def main():
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Backfill reports.incident_count / movement_count")
+    parser.add_argument("--db-url", help="Database URL (optional, will use env vars if not provided)")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Reports per committed batch")
+    parser.add_argument("--check", action="store_true", help="Only report mismatched counters")
+    args = parser.parse_args()
+
+    try:
+        backfill = ReportCountBackfill(db_url=args.db_url, batch_size=args.batch_size)
+        backfill.run(check_only=args.check)
+        backfill.print_stats(check_only=args.check)
+
+        if args.check and backfill.stats["reports_fixed"]:
+            print("\n⚠️  Counters out of sync - run without --check to fix them")
+            sys.exit(1)
+        print("\n✅ Counters checked" if args.check else "\n✅ Backfill completed successfully!")
+
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}")
+        print(f"\n❌ Backfill failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
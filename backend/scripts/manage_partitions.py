@@ -0,0 +1,98 @@
+"""
+Administración de las particiones mensuales (migración 004)
+
+La API crea las particiones de los próximos meses al arrancar y luego cada
+PARTITION_MAINTENANCE_INTERVAL_HOURS; este script permite hacerlo a mano,
+listar las particiones y desprender (DETACH) un mes para archivarlo. Una
+partición desprendida queda como tabla independiente (p. ej.
+reports.reports_p202401) que se puede volcar con pg_dump y eliminar.
+
+Uso (desde el directorio backend):
+    python scripts/manage_partitions.py --list
+    python scripts/manage_partitions.py --ensure --months-ahead 6
+    python scripts/manage_partitions.py --detach 2024-01
+    python scripts/manage_partitions.py --detach 2024-01 --tables audit_logs
+"""
+import argparse
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from loguru import logger
+
+# Agregar el directorio src al path
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from database.connection import get_database_url  # noqa: E402
+from database.partitions import (  # noqa: E402
+    PARTITIONED_TABLES, SCHEMA, detach_month, ensure_partitions, is_partitioned, list_partitions
+)
+
+
+def parse_month(value: str) -> date:
+    """Mes en formato YYYY-MM"""
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid month (expected YYYY-MM): {value}")
+
+
+def print_partitions(engine):
+    with engine.connect() as conn:
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(conn, table):
+                print(f"{SCHEMA}.{table}: not partitioned (apply sql/migrations/004_partitioning.sql)")
+                continue
+            partitions = list_partitions(conn, table)
+            print(f"{SCHEMA}.{table}: {len(partitions)} partitions")
+            for name in partitions:
+                print(f"  {name}")
+
+
+def main():
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Manage monthly partitions of reports, incidents, movements and audit_logs")
+    parser.add_argument("--db-url", help="Database URL (optional, will use env vars if not provided)")
+    parser.add_argument("--list", action="store_true", help="List attached partitions")
+    parser.add_argument("--ensure", action="store_true", help="Create the DEFAULT and upcoming monthly partitions")
+    parser.add_argument("--months-ahead", type=int, help="Months to create ahead of the current one (with --ensure)")
+    parser.add_argument("--detach", type=parse_month, metavar="YYYY-MM", help="Detach the partitions of a month")
+    parser.add_argument("--tables", help="Comma-separated tables to detach (default: all)")
+    args = parser.parse_args()
+
+    if not (args.list or args.ensure or args.detach):
+        parser.error("Nothing to do: use --list, --ensure or --detach")
+
+    tables = None
+    if args.tables:
+        tables = [t.strip() for t in args.tables.split(",") if t.strip()]
+        unknown = set(tables) - set(PARTITIONED_TABLES)
+        if unknown:
+            parser.error(f"Unknown tables: {', '.join(sorted(unknown))}")
+
+    try:
+        engine = create_engine(args.db_url or get_database_url())
+
+        if args.ensure:
+            created = ensure_partitions(engine, months_ahead=args.months_ahead)
+            print(f"Created {len(created)} partitions" + (f": {', '.join(created)}" if created else ""))
+
+        if args.detach:
+            detached = detach_month(engine, args.detach, tables)
+            if not detached:
+                print(f"No attached partitions for {args.detach:%Y-%m}")
+            for name in detached:
+                print(f"Detached {SCHEMA}.{name} (archive with: pg_dump -t {SCHEMA}.{name})")
+
+        if args.list:
+            print_partitions(engine)
+
+    except Exception as e:
+        logger.error(f"Partition maintenance failed: {e}")
+        print(f"\n❌ Partition maintenance failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,25 @@
 """
 Script de migración de Excel a PostgreSQL
 Migra todos los datos existentes del sistema Excel al nuevo sistema PostgreSQL
+
+Con --bulk se usa la ruta masiva: lectura con pandas, encriptación en
+paralelo por bloques y carga con COPY FROM STDIN (reportes, incidencias y
+movimientos en una sola transacción).
 """
 import pandas as pd
 import openpyxl
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date
+import csv
+import io
+import time
 import uuid
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from loguru import logger
 import argparse
 
@@ -21,7 +29,26 @@ sys.path.append(str(Path(__file__).parent.parent / "src"))
 from database.connection import get_database_url, init_db
 from database.models import User, Report, Incident, Movement, SystemConfig
 from auth.jwt_handler import jwt_handler
-from security.encryption import field_encryptor
+from security.encryption import field_encryptor, DataEncryption
+from config import EXCEL_SCHEMA
+
+# Marcador de NULL para COPY en formato CSV (distingue NULL de cadena vacía)
+COPY_NULL = "\\N"
+
+# Encriptador de cada proceso worker (se crea en el initializer del pool)
+_worker_encryptor: Optional[DataEncryption] = None
+
+
+def _init_encryption_worker(key: bytes):
+    """Inicializar el encriptador en un proceso worker con la clave del proceso principal"""
+    global _worker_encryptor
+    _worker_encryptor = DataEncryption(key=key)
+
+
+def _encrypt_chunk(values: List[Optional[str]]) -> List[Optional[str]]:
+    """Encriptar un bloque de valores (los vacíos se dejan igual)"""
+    return [_worker_encryptor.encrypt(v) if v else v for v in values]
+
 
 class ExcelToPostgresMigrator:
     """Migrador de datos de Excel a PostgreSQL"""
@@ -196,8 +223,9 @@ class ExcelToPostgresMigrator:
         """
         logger.info("Migrating reports...")
 
-        # Mapeo de IDs legacy
+        # Mapeo de IDs legacy (y fecha del reporte: clave de partición de los hijos)
         self.report_id_map = {}
+        self.report_date_map = {}
 
         for _, row in reports_df.iterrows():
             try:
@@ -241,6 +269,7 @@ class ExcelToPostgresMigrator:
                 # Guardar mapeo de IDs
                 if row.get("ID"):
                     self.report_id_map[str(row["ID"])] = report.id
+                    self.report_date_map[str(row["ID"])] = report.report_date
 
                 self.stats["reports_migrated"] += 1
 
@@ -275,6 +304,7 @@ class ExcelToPostgresMigrator:
                 # Crear incidencia
                 incident = Incident(
                     report_id=report_id,
+                    report_date=self.report_date_map[legacy_report_id],
                     incident_type=str(row.get("TipoIncidencia", "")),
                     employee_name=str(row.get("NombreEmpleado", "")),
                     end_date=self._parse_date(row.get("FechaFin")),
@@ -318,6 +348,7 @@ class ExcelToPostgresMigrator:
                 # Crear movimiento
                 movement = Movement(
                     report_id=report_id,
+                    report_date=self.report_date_map[legacy_report_id],
                     employee_name=str(row.get("NombreEmpleado", "")),
                     position=str(row.get("Cargo", "")),
                     movement_type=str(row.get("Estado", "Ingreso")),
@@ -420,6 +451,311 @@ class ExcelToPostgresMigrator:
         print("="*50)
 
 
+class BulkExcelToPostgresMigrator(ExcelToPostgresMigrator):
+    """
+    Migrador masivo de Excel a PostgreSQL
+
+    Usa los nombres de columna reales del Excel (EXCEL_SCHEMA), encripta las
+    columnas sensibles en paralelo y carga reportes, incidencias y movimientos
+    con COPY FROM STDIN en una sola transacción. Los reportes cuyo legacy_id
+    ya existe se omiten, así que el script se puede volver a ejecutar (si la
+    carga falla no queda ningún reporte confirmado sin sus hijos).
+    """
+
+    def __init__(self, excel_path: str, db_url: Optional[str] = None,
+                 workers: Optional[int] = None, chunk_size: int = 2000):
+        super().__init__(excel_path, db_url)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.stats["incidents_skipped"] = 0
+        self.stats["movements_skipped"] = 0
+        self.stats["timings"] = {}
+
+    def migrate(self, create_tables: bool = True, dry_run: bool = False) -> Dict:
+        """
+        Ejecutar migración masiva
+
+        Args:
+            create_tables: Si crear las tablas antes de migrar
+            dry_run: Cargar todo en una transacción y hacer rollback al final
+
+        Returns:
+            Diccionario con estadísticas de la migración
+        """
+        logger.info(f"Starting bulk migration from {self.excel_path}")
+
+        if create_tables:
+            logger.info("Creating database tables...")
+            init_db()
+
+        start = time.perf_counter()
+        excel_data = self._read_bulk_excel_data()
+        self.stats["timings"]["read_excel"] = time.perf_counter() - start
+
+        # Usuarios: pocos registros, se mantiene el ORM para reutilizar la lógica existente
+        with self.Session() as session:
+            self._migrate_users(session, excel_data["Reportes"])
+            if dry_run:
+                session.flush()
+            else:
+                session.commit()
+            user_ids = {name: user.id for name, user in self.admin_user_map.items()}
+
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_encryption_worker,
+                initargs=(field_encryptor.encryptor.key,)
+            ) as pool:
+                self.pool = pool
+
+                # COPY sobre la misma conexión de la sesión para compartir transacción en dry-run.
+                # Reportes e hijos se confirman juntos: una re-ejecución omite los reportes
+                # ya migrados, así que un reporte no puede quedar confirmado sin sus hijos
+                raw_conn = session.connection().connection.dbapi_connection
+                cursor = raw_conn.cursor()
+                try:
+                    reports_rows = self._build_report_rows(cursor, excel_data["Reportes"], user_ids)
+                    self._copy_table(cursor, "reports.reports", self.REPORT_COLUMNS, reports_rows,
+                                     "reports_migrated")
+
+                    incident_rows = self._build_incident_rows(excel_data.get("Incidencias"))
+                    self._copy_table(cursor, "reports.incidents", self.INCIDENT_COLUMNS, incident_rows,
+                                     "incidents_migrated")
+
+                    movement_rows = self._build_movement_rows(excel_data.get("Ingresos_Retiros"))
+                    self._copy_table(cursor, "reports.movements", self.MOVEMENT_COLUMNS, movement_rows,
+                                     "movements_migrated")
+
+                    if not dry_run:
+                        raw_conn.commit()
+                except Exception as e:
+                    raw_conn.rollback()
+                    logger.error(f"Bulk migration failed: {e}")
+                    self.stats["errors"].append(str(e))
+                    raise
+                finally:
+                    cursor.close()
+
+            if dry_run:
+                session.rollback()
+                logger.info("DRY RUN - rolled back all changes")
+
+        self.stats["timings"]["total"] = time.perf_counter() - start
+        logger.info("Bulk migration completed successfully!")
+        return self.stats
+
+    # Columnas destino de cada COPY (el resto usa los defaults del servidor)
+    REPORT_COLUMNS = [
+        "id", "legacy_id", "user_id", "administrator", "client_operation", "daily_hours",
+        "staff_personnel", "base_personnel", "relevant_facts", "status", "report_date",
+        "created_at", "client_ip", "user_agent"
+    ]
+    INCIDENT_COLUMNS = [
+        "id", "report_id", "report_date", "incident_type", "employee_name", "end_date", "notes", "created_at"
+    ]
+    MOVEMENT_COLUMNS = [
+        "id", "report_id", "report_date", "employee_name", "position", "movement_type", "effective_date",
+        "notes", "created_at"
+    ]
+
+    def _read_bulk_excel_data(self) -> Dict[str, pd.DataFrame]:
+        """Leer las hojas de datos con los nombres de columna de EXCEL_SCHEMA"""
+        sheets = {
+            "Reportes": EXCEL_SCHEMA["reportes"]["columns"],
+            "Incidencias": EXCEL_SCHEMA["incidencias"]["columns"],
+            "Ingresos_Retiros": EXCEL_SCHEMA["ingresos_retiros"]["columns"],
+        }
+        excel_data = {}
+
+        with pd.ExcelFile(self.excel_path) as xls:
+            for sheet_name, columns in sheets.items():
+                if sheet_name not in xls.sheet_names:
+                    logger.warning(f"Sheet not found: {sheet_name}")
+                    continue
+                df = pd.read_excel(xls, sheet_name=sheet_name, dtype={columns[0]: str})
+                df.columns = df.columns.str.strip()
+                excel_data[sheet_name] = df
+                logger.info(f"Read sheet {sheet_name}: {len(df)} rows")
+
+        return excel_data
+
+    def _encrypt_column(self, values: Sequence[Optional[str]]) -> List[Optional[str]]:
+        """Encriptar una columna completa en bloques paralelos manteniendo el orden"""
+        values = list(values)
+        chunks = [values[i:i + self.chunk_size] for i in range(0, len(values), self.chunk_size)]
+        encrypted: List[Optional[str]] = []
+        for chunk in self.pool.map(_encrypt_chunk, chunks):
+            encrypted.extend(chunk)
+        return encrypted
+
+    @staticmethod
+    def _text_column(series: pd.Series, default: str = "") -> List[str]:
+        """Columna de texto limpia (NaN -> default)"""
+        return [default if pd.isna(v) else str(v).strip() for v in series]
+
+    def _build_report_rows(self, cursor, reports_df: pd.DataFrame,
+                           user_ids: Dict[str, uuid.UUID]) -> List[tuple]:
+        """Construir las filas de reports.reports a partir de la hoja Reportes"""
+        df = reports_df.copy()
+        df["Administrador"] = df["Administrador"].astype(str).str.strip()
+        df["Fecha_Creacion"] = pd.to_datetime(df["Fecha_Creacion"], errors="coerce")
+        df = df[df["Fecha_Creacion"].notna() & df["ID"].notna()]
+        df["ID"] = df["ID"].astype(str).str.strip()
+
+        # Omitir reportes ya migrados (permite re-ejecutar el script)
+        cursor.execute("SELECT legacy_id FROM reports.reports WHERE legacy_id IS NOT NULL")
+        existing = {row[0] for row in cursor.fetchall()}
+        self.report_id_map = {}
+        self.report_date_map = {}
+        self.report_created_map = {}
+
+        df = df[~df["ID"].isin(existing) & df["Administrador"].isin(user_ids.keys())]
+        df = df.drop_duplicates(subset="ID", keep="first")
+
+        relevant_facts = self._encrypt_column(self._text_column(df["Hechos_Relevantes"]))
+        report_ids = [uuid.uuid4() for _ in range(len(df))]
+
+        rows = []
+        for i, row in enumerate(df.itertuples(index=False)):
+            self.report_id_map[row.ID] = report_ids[i]
+            created_at = row.Fecha_Creacion.to_pydatetime()
+            self.report_date_map[row.ID] = created_at.date()
+            self.report_created_map[row.ID] = created_at
+            rows.append((
+                report_ids[i],
+                row.ID,
+                user_ids[row.Administrador],
+                row.Administrador,
+                "" if pd.isna(row.Cliente_Operacion) else str(row.Cliente_Operacion).strip(),
+                float(row.Horas_Diarias) if not pd.isna(row.Horas_Diarias) else 0.0,
+                int(row.Personal_Staff) if not pd.isna(row.Personal_Staff) else 0,
+                int(row.Personal_Base) if not pd.isna(row.Personal_Base) else 0,
+                relevant_facts[i] or None,
+                "completed",
+                created_at.date(),
+                created_at,
+                None if pd.isna(row.IP_Origen) else str(row.IP_Origen),
+                None if pd.isna(row.User_Agent) else str(row.User_Agent),
+            ))
+
+        return rows
+
+    def _build_child_frame(self, df: Optional[pd.DataFrame], kind: str) -> Optional[pd.DataFrame]:
+        """Filtrar filas hijas cuyo reporte fue migrado en esta ejecución"""
+        if df is None or df.empty:
+            logger.warning(f"No {kind} to migrate")
+            return None
+
+        df = df.copy()
+        df["ID_Reporte"] = df["ID_Reporte"].astype(str).str.strip()
+        mask = df["ID_Reporte"].isin(self.report_id_map.keys())
+        self.stats[f"{kind}_skipped"] += int((~mask).sum())
+        df = df[mask].copy()
+        df["Fecha_Registro"] = pd.to_datetime(df["Fecha_Registro"], errors="coerce")
+        return df
+
+    def _registered_at(self, row) -> datetime:
+        """created_at de una fila hija: su Fecha_Registro (la del reporte si falta)"""
+        if pd.isna(row.Fecha_Registro):
+            return self.report_created_map[row.ID_Reporte]
+        return row.Fecha_Registro.to_pydatetime()
+
+    def _build_incident_rows(self, incidents_df: Optional[pd.DataFrame]) -> List[tuple]:
+        """Construir las filas de reports.incidents a partir de la hoja Incidencias"""
+        df = self._build_child_frame(incidents_df, "incidents")
+        if df is None:
+            return []
+
+        df["Fecha_Fin_Novedad"] = pd.to_datetime(df["Fecha_Fin_Novedad"], errors="coerce")
+        # end_date es obligatorio en PostgreSQL
+        missing_end = df["Fecha_Fin_Novedad"].isna()
+        self.stats["incidents_skipped"] += int(missing_end.sum())
+        df = df[~missing_end]
+
+        employee_names = self._encrypt_column(self._text_column(df["Nombre_Empleado"]))
+
+        return [
+            (
+                uuid.uuid4(),
+                self.report_id_map[row.ID_Reporte],
+                self.report_date_map[row.ID_Reporte],
+                "" if pd.isna(row.Tipo_Incidencia) else str(row.Tipo_Incidencia),
+                employee_names[i],
+                row.Fecha_Fin_Novedad.date(),
+                "",
+                self._registered_at(row),
+            )
+            for i, row in enumerate(df.itertuples(index=False))
+        ]
+
+    def _build_movement_rows(self, movements_df: Optional[pd.DataFrame]) -> List[tuple]:
+        """Construir las filas de reports.movements a partir de la hoja Ingresos_Retiros"""
+        df = self._build_child_frame(movements_df, "movements")
+        if df is None:
+            return []
+
+        employee_names = self._encrypt_column(self._text_column(df["Nombre_Empleado"]))
+
+        return [
+            (
+                uuid.uuid4(),
+                self.report_id_map[row.ID_Reporte],
+                self.report_date_map[row.ID_Reporte],
+                employee_names[i],
+                "" if pd.isna(row.Cargo) else str(row.Cargo),
+                "Ingreso" if pd.isna(row.Estado) else str(row.Estado),
+                None if pd.isna(row.Fecha_Registro) else row.Fecha_Registro.date(),
+                "",
+                self._registered_at(row),
+            )
+            for i, row in enumerate(df.itertuples(index=False))
+        ]
+
+    def _copy_table(self, cursor, table: str, columns: List[str], rows: List[tuple], stat_key: str):
+        """
+        Cargar filas con COPY FROM STDIN (CSV) e informar filas por segundo
+
+        No confirma: migrate() confirma las tres tablas en una sola transacción.
+
+        Args:
+            cursor: Cursor de psycopg2
+            table: Tabla destino con esquema
+            columns: Columnas destino en el orden de las tuplas
+            rows: Filas a cargar
+            stat_key: Clave de estadísticas a actualizar
+        """
+        if not rows:
+            logger.info(f"{table}: nothing to load")
+            return
+
+        start = time.perf_counter()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(COPY_NULL if value is None else value for value in row)
+        buffer.seek(0)
+
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer
+        )
+
+        elapsed = time.perf_counter() - start
+        self.stats[stat_key] = len(rows)
+        self.stats["timings"][table] = elapsed
+        rate = len(rows) / elapsed if elapsed > 0 else float("inf")
+        print(f"  {table}: {len(rows)} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+
+    def print_stats(self):
+        """Imprimir estadísticas de migración incluyendo tiempos"""
+        super().print_stats()
+        print(f"Incidents skipped: {self.stats['incidents_skipped']}")
+        print(f"Movements skipped: {self.stats['movements_skipped']}")
+        for step, elapsed in self.stats["timings"].items():
+            print(f"  {step}: {elapsed:.2f}s")
+        print("="*50)
+
+
 def main():
     """Función principal del script"""
     parser = argparse.ArgumentParser(description="Migrate Excel data to PostgreSQL")
@@ -443,6 +779,22 @@ def main():
         action="store_true",
         help="Perform a dry run without committing changes"
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Use the bulk path (parallel encryption + COPY FROM STDIN)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Encryption worker processes for --bulk (default: CPU count)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=2000,
+        help="Values per encryption chunk for --bulk"
+    )
 
     args = parser.parse_args()
 
@@ -450,17 +802,24 @@ def main():
     logger.add("migration_{time}.log", rotation="500 MB")
 
     try:
-        # Crear migrador
-        migrator = ExcelToPostgresMigrator(
-            excel_path=args.excel_path,
-            db_url=args.db_url
-        )
-
         # Ejecutar migración
         if args.dry_run:
             logger.info("DRY RUN MODE - No changes will be committed")
 
-        stats = migrator.migrate(create_tables=args.create_tables)
+        if args.bulk:
+            migrator = BulkExcelToPostgresMigrator(
+                excel_path=args.excel_path,
+                db_url=args.db_url,
+                workers=args.workers,
+                chunk_size=args.chunk_size
+            )
+            stats = migrator.migrate(create_tables=args.create_tables, dry_run=args.dry_run)
+        else:
+            migrator = ExcelToPostgresMigrator(
+                excel_path=args.excel_path,
+                db_url=args.db_url
+            )
+            stats = migrator.migrate(create_tables=args.create_tables)
 
         # Mostrar estadísticas
         migrator.print_stats()
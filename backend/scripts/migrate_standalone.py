@@ -127,7 +127,7 @@ def migrate():
 
         # 2. MIGRAR REPORTES
         print("📋 Migrando reportes...")
-        report_id_map = {}
+        report_id_map = {}  # legacy_id -> (id, report_date): los hijos se particionan por la fecha del reporte
 
         for _, row in df_reportes.iterrows():
             try:
@@ -165,7 +165,7 @@ def migrate():
                 ))
 
                 if legacy_id:
-                    report_id_map[legacy_id] = report_id
+                    report_id_map[legacy_id] = (report_id, report_date)
                 stats['reports_migrated'] += 1
 
             except Exception as e:
@@ -178,20 +178,20 @@ def migrate():
         for _, row in df_incidencias.iterrows():
             try:
                 legacy_report_id = str(row.get('ID_Reporte', ''))
-                report_id = report_id_map.get(legacy_report_id)
-
-                if not report_id:
+                if legacy_report_id not in report_id_map:
                     continue
+                report_id, report_date = report_id_map[legacy_report_id]
 
                 end_date = pd.to_datetime(row.get('Fecha_Fin_Novedad')).date() if not pd.isna(row.get('Fecha_Fin_Novedad')) else None
 
                 cur.execute("""
                     INSERT INTO reports.incidents
-                    (id, report_id, incident_type, employee_name, end_date, notes)
-                    VALUES (%s, %s, %s, %s, %s, %s)
+                    (id, report_id, report_date, incident_type, employee_name, end_date, notes)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
                 """, (
                     str(uuid.uuid4()),
                     report_id,
+                    report_date,
                     str(row.get('Tipo_Incidencia', '')),
                     str(row.get('Nombre_Empleado', '')),
                     end_date,
@@ -210,22 +210,22 @@ def migrate():
         for _, row in df_movimientos.iterrows():
             try:
                 legacy_report_id = str(row.get('ID_Reporte', ''))
-                report_id = report_id_map.get(legacy_report_id)
-
-                if not report_id:
+                if legacy_report_id not in report_id_map:
                     continue
+                report_id, report_date = report_id_map[legacy_report_id]
 
                 # Usar Fecha_Registro como effective_date
                 effective_date = pd.to_datetime(row.get('Fecha_Registro')).date() if not pd.isna(row.get('Fecha_Registro')) else None
 
                 cur.execute("""
                     INSERT INTO reports.movements
-                    (id, report_id, employee_name, position, movement_type,
+                    (id, report_id, report_date, employee_name, position, movement_type,
                      effective_date, notes)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                 """, (
                     str(uuid.uuid4()),
                     report_id,
+                    report_date,
                     str(row.get('Nombre_Empleado', '')),
                     str(row.get('Cargo', '')),
                     str(row.get('Estado', 'Ingreso')),
@@ -0,0 +1,521 @@
+"""
+Sincronización incremental de Excel a PostgreSQL
+
+Mientras el sistema hace dual-write, este script pone PostgreSQL al día con el
+libro de Excel procesando solo el delta:
+- Guarda una marca de agua (último Fecha_Creacion / ID sincronizado) en
+  reports.system_config.
+- Lee los reportes posteriores a la marca (menos una ventana de revisión para
+  capturar ediciones del mismo día) y hace upsert por legacy_id.
+- Reemplaza incidencias y movimientos solo de los reportes nuevos o cambiados.
+- Confirma por lotes junto con la marca de agua, así que se puede interrumpir
+  y reanudar sin repetir trabajo.
+
+Las eliminaciones en Excel no se propagan (el endpoint DELETE ya borra en
+ambos sistemas). Las ediciones hechas por la API (PUT /admin/reportes/{id})
+se escriben también en Excel, así que la ventana de revisión no las revierte
+(ver benchmarks/sync_edits.py).
+
+Uso (desde el directorio backend):
+    python scripts/sync_excel_to_postgres.py
+    python scripts/sync_excel_to_postgres.py --lookback-hours 48 --batch-size 500
+    python scripts/sync_excel_to_postgres.py --full --dry-run
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from psycopg2.extras import execute_values
+from loguru import logger
+
+sys.path.append(str(Path(__file__).parent))
+
+from migrate_excel_to_postgres import BulkExcelToPostgresMigrator  # noqa: E402
+from database.models import User  # noqa: E402
+from security.encryption import field_encryptor  # noqa: E402
+
+# Clave en reports.system_config donde se guarda la marca de agua
+SYNC_STATE_KEY = "excel_sync_state"
+
+# Ventana para emparejar reportes creados por la API antes de guardar legacy_id
+ADOPTION_WINDOW = timedelta(minutes=5)
+
+
+class IncrementalExcelSync(BulkExcelToPostgresMigrator):
+    """Sincronizador incremental y reanudable de Excel a PostgreSQL"""
+
+    def __init__(self, excel_path: str, db_url: Optional[str] = None,
+                 batch_size: int = 200, lookback: timedelta = timedelta(hours=24)):
+        super().__init__(excel_path, db_url)
+        self.batch_size = batch_size
+        self.lookback = lookback
+        self.diff = {
+            "inserted": 0,
+            "updated": 0,
+            "adopted": 0,
+            "unchanged": 0,
+            "skipped_no_user": 0,
+            "incidents_written": 0,
+            "movements_written": 0,
+            "batches": 0,
+        }
+
+    # Estado de sincronización
+
+    def _load_state(self, cursor) -> Dict:
+        """Leer la marca de agua guardada (vacía si nunca se ha sincronizado)"""
+        cursor.execute("SELECT value FROM reports.system_config WHERE key = %s", (SYNC_STATE_KEY,))
+        row = cursor.fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def _save_state(self, cursor, high_water_mark: datetime, last_id: str):
+        """Guardar la marca de agua (en la misma transacción que el lote)"""
+        state = json.dumps({
+            "high_water_mark": high_water_mark.isoformat(),
+            "last_id": last_id,
+            "synced_at": datetime.now().isoformat(),
+        })
+        cursor.execute(
+            """
+            INSERT INTO reports.system_config (key, value, description)
+            VALUES (%s, %s, 'Marca de agua de la sincronización Excel -> PostgreSQL')
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+            """,
+            (SYNC_STATE_KEY, state)
+        )
+
+    # Lectura del delta
+
+    def _select_delta(self, reports_df: pd.DataFrame, state: Dict, full: bool) -> pd.DataFrame:
+        """Reportes a revisar: posteriores a la marca de agua menos la ventana de revisión"""
+        df = reports_df.copy()
+        df["Fecha_Creacion"] = pd.to_datetime(df["Fecha_Creacion"], errors="coerce")
+        df = df[df["Fecha_Creacion"].notna() & df["ID"].notna()]
+        df["ID"] = df["ID"].astype(str).str.strip()
+        df["Administrador"] = df["Administrador"].astype(str).str.strip()
+
+        if not full and state.get("high_water_mark"):
+            since = datetime.fromisoformat(state["high_water_mark"]) - self.lookback
+            df = df[df["Fecha_Creacion"] >= since]
+            logger.info(f"Syncing reports created since {since.isoformat()}")
+
+        return df.sort_values(["Fecha_Creacion", "ID"]).drop_duplicates(subset="ID", keep="last")
+
+    @staticmethod
+    def _group_children(df: Optional[pd.DataFrame], report_ids: set) -> Dict[str, pd.DataFrame]:
+        """Agrupar filas hijas por ID_Reporte, solo para los reportes del delta"""
+        if df is None or df.empty:
+            return {}
+        df = df.copy()
+        df["ID_Reporte"] = df["ID_Reporte"].astype(str).str.strip()
+        df = df[df["ID_Reporte"].isin(report_ids)]
+        return {report_id: group for report_id, group in df.groupby("ID_Reporte")}
+
+    # Huellas para detectar cambios
+
+    def _excel_fingerprint(self, row, incidents: Optional[pd.DataFrame],
+                           movements: Optional[pd.DataFrame]) -> Tuple:
+        """Huella comparable de un reporte de Excel con sus hijos"""
+        incident_items = []
+        if incidents is not None:
+            for inc in incidents.itertuples(index=False):
+                end_date = pd.to_datetime(inc.Fecha_Fin_Novedad, errors="coerce")
+                incident_items.append((
+                    "" if pd.isna(inc.Tipo_Incidencia) else str(inc.Tipo_Incidencia),
+                    "" if pd.isna(inc.Nombre_Empleado) else str(inc.Nombre_Empleado).strip(),
+                    None if pd.isna(end_date) else end_date.date().isoformat(),
+                ))
+        movement_items = []
+        if movements is not None:
+            for mov in movements.itertuples(index=False):
+                movement_items.append((
+                    "" if pd.isna(mov.Nombre_Empleado) else str(mov.Nombre_Empleado).strip(),
+                    "" if pd.isna(mov.Cargo) else str(mov.Cargo),
+                    "Ingreso" if pd.isna(mov.Estado) else str(mov.Estado),
+                ))
+
+        return (
+            "" if pd.isna(row.Cliente_Operacion) else str(row.Cliente_Operacion).strip(),
+            float(row.Horas_Diarias) if not pd.isna(row.Horas_Diarias) else 0.0,
+            int(row.Personal_Staff) if not pd.isna(row.Personal_Staff) else 0,
+            int(row.Personal_Base) if not pd.isna(row.Personal_Base) else 0,
+            "" if pd.isna(row.Hechos_Relevantes) else str(row.Hechos_Relevantes).strip(),
+            tuple(sorted(incident_items, key=str)),
+            tuple(sorted(movement_items, key=str)),
+        )
+
+    def _postgres_fingerprints(self, cursor, report_ids: List) -> Dict:
+        """Huellas de los reportes existentes en PostgreSQL (desencriptando)"""
+        if not report_ids:
+            return {}
+
+        decrypt = field_encryptor.encryptor.decrypt
+        is_encrypted = field_encryptor._is_encrypted
+
+        def plain(value):
+            return decrypt(value) if value and is_encrypted(value) else (value or "")
+
+        cursor.execute(
+            """
+            SELECT id, client_operation, daily_hours, staff_personnel, base_personnel, relevant_facts
+            FROM reports.reports WHERE id = ANY(%s::uuid[])
+            """,
+            ([str(r) for r in report_ids],)
+        )
+        base = {row[0]: row[1:] for row in cursor.fetchall()}
+
+        incidents: Dict = {}
+        cursor.execute(
+            "SELECT report_id, incident_type, employee_name, end_date FROM reports.incidents "
+            "WHERE report_id = ANY(%s::uuid[])",
+            ([str(r) for r in report_ids],)
+        )
+        for report_id, incident_type, employee_name, end_date in cursor.fetchall():
+            incidents.setdefault(report_id, []).append((
+                incident_type or "",
+                plain(employee_name).strip(),
+                end_date.isoformat() if end_date else None,
+            ))
+
+        movements: Dict = {}
+        cursor.execute(
+            "SELECT report_id, employee_name, position, movement_type FROM reports.movements "
+            "WHERE report_id = ANY(%s::uuid[])",
+            ([str(r) for r in report_ids],)
+        )
+        for report_id, employee_name, position, movement_type in cursor.fetchall():
+            movements.setdefault(report_id, []).append((
+                plain(employee_name).strip(),
+                position or "",
+                movement_type or "",
+            ))
+
+        return {
+            report_id: (
+                (client_operation or "").strip(),
+                float(daily_hours or 0),
+                int(staff or 0),
+                int(base_personnel or 0),
+                plain(relevant_facts).strip(),
+                tuple(sorted(incidents.get(report_id, []), key=str)),
+                tuple(sorted(movements.get(report_id, []), key=str)),
+            )
+            for report_id, (client_operation, daily_hours, staff, base_personnel, relevant_facts) in base.items()
+        }
+
+    # Emparejamiento con PostgreSQL
+
+    def _existing_by_legacy_id(self, cursor, legacy_ids: List[str]) -> Dict[str, str]:
+        """Mapa legacy_id -> id de los reportes ya presentes en PostgreSQL"""
+        cursor.execute(
+            "SELECT legacy_id, id FROM reports.reports WHERE legacy_id = ANY(%s)",
+            (legacy_ids,)
+        )
+        return {legacy_id: report_id for legacy_id, report_id in cursor.fetchall()}
+
+    def _adopt_api_report(self, cursor, row) -> Optional[str]:
+        """
+        Enlazar un reporte creado por la API sin legacy_id (dual-write anterior)
+
+        Se empareja por administrador, operación y hora de creación cercana.
+        """
+        created_at = row.Fecha_Creacion.to_pydatetime()
+        cursor.execute(
+            """
+            SELECT id FROM reports.reports
+            WHERE legacy_id IS NULL
+              AND administrator = %s
+              AND client_operation = %s
+              AND created_at BETWEEN %s AND %s
+            ORDER BY created_at
+            LIMIT 1
+            """,
+            (
+                row.Administrador,
+                "" if pd.isna(row.Cliente_Operacion) else str(row.Cliente_Operacion).strip(),
+                created_at - ADOPTION_WINDOW,
+                created_at + ADOPTION_WINDOW,
+            )
+        )
+        match = cursor.fetchone()
+        if not match:
+            return None
+
+        cursor.execute("UPDATE reports.reports SET legacy_id = %s WHERE id = %s", (row.ID, match[0]))
+        return match[0]
+
+    # Escritura de un lote
+
+    def _report_values(self, row, user_id) -> Tuple:
+        """Valores de reports.reports para un reporte de Excel"""
+        created_at = row.Fecha_Creacion.to_pydatetime()
+        relevant_facts = "" if pd.isna(row.Hechos_Relevantes) else str(row.Hechos_Relevantes)
+        return (
+            row.ID,
+            str(user_id),
+            row.Administrador,
+            "" if pd.isna(row.Cliente_Operacion) else str(row.Cliente_Operacion).strip(),
+            float(row.Horas_Diarias) if not pd.isna(row.Horas_Diarias) else 0.0,
+            int(row.Personal_Staff) if not pd.isna(row.Personal_Staff) else 0,
+            int(row.Personal_Base) if not pd.isna(row.Personal_Base) else 0,
+            field_encryptor.encryptor.encrypt(relevant_facts) if relevant_facts else None,
+            "completed",
+            created_at.date(),
+            created_at,
+            None if pd.isna(row.IP_Origen) else str(row.IP_Origen),
+            None if pd.isna(row.User_Agent) else str(row.User_Agent),
+        )
+
+    def _replace_children(self, cursor, report_ids: Dict[str, Tuple],
+                          incidents: Dict[str, pd.DataFrame], movements: Dict[str, pd.DataFrame]):
+        """
+        Reemplazar incidencias y movimientos de los reportes escritos en el lote
+
+        report_ids: legacy_id -> (id, report_date, created_at); los hijos llevan
+        la fecha del reporte porque es su clave de partición, y su created_at es
+        la Fecha_Registro de Excel (la creación del reporte si falta).
+        """
+        ids = [str(report_id) for report_id, _, _ in report_ids.values()]
+        cursor.execute("DELETE FROM reports.incidents WHERE report_id = ANY(%s::uuid[])", (ids,))
+        cursor.execute("DELETE FROM reports.movements WHERE report_id = ANY(%s::uuid[])", (ids,))
+
+        encrypt = field_encryptor.encryptor.encrypt
+        incident_rows = []
+        movement_rows = []
+        for legacy_id, (report_id, report_date, created_at) in report_ids.items():
+            if legacy_id in incidents:
+                for inc in incidents[legacy_id].itertuples(index=False):
+                    end_date = pd.to_datetime(inc.Fecha_Fin_Novedad, errors="coerce")
+                    if pd.isna(end_date):
+                        continue  # end_date es obligatorio en PostgreSQL
+                    registered = pd.to_datetime(inc.Fecha_Registro, errors="coerce")
+                    name = "" if pd.isna(inc.Nombre_Empleado) else str(inc.Nombre_Empleado).strip()
+                    incident_rows.append((
+                        str(report_id),
+                        report_date,
+                        "" if pd.isna(inc.Tipo_Incidencia) else str(inc.Tipo_Incidencia),
+                        encrypt(name) if name else name,
+                        end_date.date(),
+                        "",
+                        created_at if pd.isna(registered) else registered.to_pydatetime(),
+                    ))
+            if legacy_id in movements:
+                for mov in movements[legacy_id].itertuples(index=False):
+                    registered = pd.to_datetime(mov.Fecha_Registro, errors="coerce")
+                    name = "" if pd.isna(mov.Nombre_Empleado) else str(mov.Nombre_Empleado).strip()
+                    movement_rows.append((
+                        str(report_id),
+                        report_date,
+                        encrypt(name) if name else name,
+                        "" if pd.isna(mov.Cargo) else str(mov.Cargo),
+                        "Ingreso" if pd.isna(mov.Estado) else str(mov.Estado),
+                        None if pd.isna(registered) else registered.date(),
+                        "",
+                        created_at if pd.isna(registered) else registered.to_pydatetime(),
+                    ))
+
+        if incident_rows:
+            execute_values(
+                cursor,
+                "INSERT INTO reports.incidents "
+                "(report_id, report_date, incident_type, employee_name, end_date, notes, created_at) VALUES %s",
+                incident_rows
+            )
+        if movement_rows:
+            execute_values(
+                cursor,
+                "INSERT INTO reports.movements "
+                "(report_id, report_date, employee_name, position, movement_type, effective_date, notes, created_at) "
+                "VALUES %s",
+                movement_rows
+            )
+        self.diff["incidents_written"] += len(incident_rows)
+        self.diff["movements_written"] += len(movement_rows)
+
+    def _sync_batch(self, cursor, batch: pd.DataFrame, user_ids: Dict,
+                    incidents: Dict[str, pd.DataFrame], movements: Dict[str, pd.DataFrame]):
+        """Sincronizar un lote de reportes de Excel"""
+        existing = self._existing_by_legacy_id(cursor, batch["ID"].tolist())
+        fingerprints = self._postgres_fingerprints(cursor, list(existing.values()))
+
+        to_upsert = []
+        for row in batch.itertuples(index=False):
+            user_id = user_ids.get(row.Administrador)
+            if not user_id:
+                self.diff["skipped_no_user"] += 1
+                continue
+
+            report_id = existing.get(row.ID)
+            if report_id is None:
+                report_id = self._adopt_api_report(cursor, row)
+                if report_id is not None:
+                    self.diff["adopted"] += 1
+                    fingerprints.update(self._postgres_fingerprints(cursor, [report_id]))
+                    existing[row.ID] = report_id
+
+            if report_id is not None:
+                excel_fp = self._excel_fingerprint(row, incidents.get(row.ID), movements.get(row.ID))
+                if fingerprints.get(report_id) == excel_fp:
+                    self.diff["unchanged"] += 1
+                    continue
+                self.diff["updated"] += 1
+            else:
+                self.diff["inserted"] += 1
+
+            to_upsert.append(self._report_values(row, user_id))
+
+        if not to_upsert:
+            return
+
+        written = execute_values(
+            cursor,
+            """
+            INSERT INTO reports.reports
+                (legacy_id, user_id, administrator, client_operation, daily_hours,
+                 staff_personnel, base_personnel, relevant_facts, status,
+                 report_date, created_at, client_ip, user_agent)
+            VALUES %s
+            ON CONFLICT (legacy_id, report_date) DO UPDATE SET
+                client_operation = EXCLUDED.client_operation,
+                daily_hours = EXCLUDED.daily_hours,
+                staff_personnel = EXCLUDED.staff_personnel,
+                base_personnel = EXCLUDED.base_personnel,
+                relevant_facts = EXCLUDED.relevant_facts
+            RETURNING legacy_id, id, report_date, created_at
+            """,
+            to_upsert,
+            fetch=True
+        )
+        self._replace_children(
+            cursor,
+            {legacy_id: (report_id, report_date, created_at)
+             for legacy_id, report_id, report_date, created_at in written},
+            incidents, movements
+        )
+
+    # Ejecución
+
+    def sync(self, full: bool = False, dry_run: bool = False) -> Dict:
+        """
+        Ejecutar la sincronización incremental
+
+        Args:
+            full: Ignorar la marca de agua y revisar todo el libro
+            dry_run: Calcular el diff sin confirmar cambios
+
+        Returns:
+            Resumen del diff aplicado
+        """
+        start = time.perf_counter()
+        excel_data = self._read_bulk_excel_data()
+
+        # Usuarios: se crean los que falten con la lógica del migrador
+        with self.Session() as session:
+            persisted_ids = {user_id for (user_id,) in session.query(User.id)}
+            self._migrate_users(session, excel_data["Reportes"])
+            if not dry_run:
+                session.commit()
+            # En dry-run los usuarios nuevos no se confirman: sus reportes cuentan como omitidos
+            user_ids = {
+                name: user.id for name, user in self.admin_user_map.items()
+                if not dry_run or user.id in persisted_ids
+            }
+
+        conn = self.engine.raw_connection()
+        cursor = conn.cursor()
+        try:
+            state = self._load_state(cursor)
+            delta = self._select_delta(excel_data["Reportes"], state, full)
+            delta_ids = set(delta["ID"])
+            incidents = self._group_children(excel_data.get("Incidencias"), delta_ids)
+            movements = self._group_children(excel_data.get("Ingresos_Retiros"), delta_ids)
+            logger.info(f"Reports to check: {len(delta)}")
+
+            for offset in range(0, len(delta), self.batch_size):
+                batch = delta.iloc[offset:offset + self.batch_size]
+                self._sync_batch(cursor, batch, user_ids, incidents, movements)
+
+                last = batch.iloc[-1]
+                if dry_run:
+                    conn.rollback()
+                else:
+                    # La marca de agua se confirma junto con el lote: reanudable
+                    self._save_state(cursor, last["Fecha_Creacion"].to_pydatetime(), last["ID"])
+                    conn.commit()
+                self.diff["batches"] += 1
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Incremental sync failed: {e}")
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        self.diff["elapsed_seconds"] = round(time.perf_counter() - start, 2)
+        return self.diff
+
+    def print_diff(self):
+        """Imprimir el resumen del diff"""
+        print("\n" + "="*50)
+        print("INCREMENTAL SYNC SUMMARY")
+        print("="*50)
+        print(f"Users created:      {self.stats['users_created']}")
+        print(f"Reports inserted:   {self.diff['inserted']}")
+        print(f"Reports updated:    {self.diff['updated']}")
+        print(f"Reports adopted:    {self.diff['adopted']}")
+        print(f"Reports unchanged:  {self.diff['unchanged']}")
+        print(f"Skipped (no user):  {self.diff['skipped_no_user']}")
+        print(f"Incidents written:  {self.diff['incidents_written']}")
+        print(f"Movements written:  {self.diff['movements_written']}")
+        print(f"Batches committed:  {self.diff['batches']}")
+        print(f"Elapsed:            {self.diff.get('elapsed_seconds', 0)}s")
+        print("="*50)
+
+
+def main():
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Incremental Excel -> PostgreSQL sync")
+    parser.add_argument("--excel-path", default="data/reportes_diarios.xlsx", help="Path to Excel file")
+    parser.add_argument("--db-url", help="Database URL (optional, will use env vars if not provided)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Reports per committed batch")
+    parser.add_argument(
+        "--lookback-hours",
+        type=float,
+        default=24,
+        help="Re-check reports this many hours before the high-water mark (same-day edits)"
+    )
+    parser.add_argument("--full", action="store_true", help="Ignore the high-water mark and check every report")
+    parser.add_argument("--dry-run", action="store_true", help="Compute the diff without committing")
+    args = parser.parse_args()
+
+    logger.add("sync_{time}.log", rotation="100 MB")
+
+    try:
+        syncer = IncrementalExcelSync(
+            excel_path=args.excel_path,
+            db_url=args.db_url,
+            batch_size=args.batch_size,
+            lookback=timedelta(hours=args.lookback_hours)
+        )
+        syncer.sync(full=args.full, dry_run=args.dry_run)
+        syncer.print_diff()
+
+        if args.dry_run:
+            print("\n📋 Dry run completed - no changes were made")
+        else:
+            print("\n✅ Sync completed successfully!")
+
+    except Exception as e:
+        logger.error(f"Sync failed: {e}")
+        print(f"\n❌ Sync failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
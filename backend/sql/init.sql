@@ -67,10 +67,13 @@ CREATE INDEX idx_users_active ON users(is_active) WHERE is_active = true;
 CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON users
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
--- Tabla de reportes
+-- Tabla de reportes, particionada por mes de report_date (ver
+-- sql/migrations/004_partitioning.sql). Las claves primaria y únicas incluyen
+-- la columna de partición; las particiones mensuales las crea la API al
+-- arrancar (src/database/partitions.py) y la DEFAULT recibe el resto.
 CREATE TABLE IF NOT EXISTS reports (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    legacy_id VARCHAR(100) UNIQUE,
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    legacy_id VARCHAR(100),
     user_id UUID REFERENCES users(id) ON DELETE CASCADE,
     administrator VARCHAR(255) NOT NULL,
     client_operation VARCHAR(255) NOT NULL,
@@ -85,33 +88,53 @@ CREATE TABLE IF NOT EXISTS reports (
     reviewed_at TIMESTAMPTZ,
     reviewed_by UUID REFERENCES users(id) ON DELETE SET NULL,
     client_ip VARCHAR(45),
-    user_agent VARCHAR(500)
-);
+    user_agent VARCHAR(500),
+    -- Contadores de hijos, mantenidos por triggers en incidents/movements
+    incident_count INTEGER NOT NULL DEFAULT 0,
+    movement_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (id, report_date),
+    CONSTRAINT uq_reports_legacy_id_date UNIQUE (legacy_id, report_date)
+) PARTITION BY RANGE (report_date);
+
+CREATE TABLE IF NOT EXISTS reports_default PARTITION OF reports DEFAULT;
 
 -- Índices para reportes
 CREATE INDEX idx_reports_date ON reports(report_date DESC);
-CREATE INDEX idx_reports_admin ON reports(administrator);
-CREATE INDEX idx_reports_client ON reports(client_operation);
 CREATE INDEX idx_reports_status ON reports(status);
 CREATE INDEX idx_reports_user ON reports(user_id);
-CREATE INDEX idx_reports_date_admin ON reports(report_date, administrator);
 CREATE INDEX idx_reports_date_client ON reports(report_date, client_operation);
+CREATE INDEX idx_report_updated_at_id ON reports(updated_at, id);
+CREATE INDEX idx_reports_legacy_id ON reports(legacy_id);
+-- Los filtros por administrador y operación comparan lower(columna)
+CREATE INDEX idx_reports_admin_lower ON reports(lower(administrator));
+CREATE INDEX idx_reports_client_lower ON reports(lower(client_operation));
+CREATE INDEX idx_reports_date_admin_lower ON reports(report_date, lower(administrator));
+-- Orden del listado y listado de reportes con incidencias
+CREATE INDEX idx_reports_created_at_desc ON reports(created_at DESC);
+CREATE INDEX idx_reports_with_incidents ON reports(created_at DESC) WHERE incident_count > 0;
 
 -- Trigger para updated_at
 CREATE TRIGGER update_reports_updated_at BEFORE UPDATE ON reports
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
 -- Tabla de incidencias
+-- (particionada como reports; report_date es la fecha del reporte padre)
 CREATE TABLE IF NOT EXISTS incidents (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    report_id UUID NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    report_id UUID NOT NULL,
+    report_date DATE NOT NULL,
     incident_type incident_type NOT NULL,
     employee_name VARCHAR(255) NOT NULL,
     end_date DATE NOT NULL,
     notes TEXT,
     created_at TIMESTAMPTZ DEFAULT NOW(),
-    updated_at TIMESTAMPTZ DEFAULT NOW()
-);
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id, report_date),
+    FOREIGN KEY (report_id, report_date) REFERENCES reports(id, report_date)
+        ON DELETE CASCADE ON UPDATE CASCADE
+) PARTITION BY RANGE (report_date);
+
+CREATE TABLE IF NOT EXISTS incidents_default PARTITION OF incidents DEFAULT;
 
 -- Índices para incidencias
 CREATE INDEX idx_incidents_report ON incidents(report_id);
@@ -123,18 +146,67 @@ CREATE INDEX idx_incidents_end_date ON incidents(end_date);
 CREATE TRIGGER update_incidents_updated_at BEFORE UPDATE ON incidents
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Contador reports.incident_count
+CREATE OR REPLACE FUNCTION update_report_incident_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Triggers por sentencia con tablas de transición: un UPDATE por
+    -- sentencia (no por fila), también en COPY y en inserts multi-fila
+    IF TG_OP = 'INSERT' THEN
+        UPDATE reports.reports r SET incident_count = r.incident_count + d.n
+        FROM (SELECT report_id, report_date, COUNT(*) AS n FROM new_rows GROUP BY report_id, report_date) d
+        WHERE r.id = d.report_id AND r.report_date = d.report_date;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE reports.reports r SET incident_count = r.incident_count - d.n
+        FROM (SELECT report_id, report_date, COUNT(*) AS n FROM old_rows GROUP BY report_id, report_date) d
+        WHERE r.id = d.report_id AND r.report_date = d.report_date;
+    ELSE
+        -- UPDATE: solo cuentan los hijos que cambiaron de reporte. Se agrupa
+        -- solo por report_id: el ON UPDATE CASCADE de report_date mueve los
+        -- hijos con su reporte y no debe alterar el conteo
+        UPDATE reports.reports r SET incident_count = r.incident_count + d.n
+        FROM (
+            SELECT report_id, SUM(n) AS n FROM (
+                SELECT report_id, 1 AS n FROM new_rows
+                UNION ALL
+                SELECT report_id, -1 AS n FROM old_rows
+            ) c GROUP BY report_id HAVING SUM(n) <> 0
+        ) d
+        WHERE r.id = d.report_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER incidents_incident_count_insert AFTER INSERT ON incidents
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_incident_count();
+CREATE TRIGGER incidents_incident_count_update AFTER UPDATE ON incidents
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_incident_count();
+CREATE TRIGGER incidents_incident_count_delete AFTER DELETE ON incidents
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_incident_count();
+
 -- Tabla de movimientos
+-- (particionada como reports; report_date es la fecha del reporte padre)
 CREATE TABLE IF NOT EXISTS movements (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    report_id UUID NOT NULL REFERENCES reports(id) ON DELETE CASCADE,
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    report_id UUID NOT NULL,
+    report_date DATE NOT NULL,
     employee_name VARCHAR(255) NOT NULL,
     position VARCHAR(255) NOT NULL,
     movement_type movement_type NOT NULL,
     effective_date DATE,
     notes TEXT,
     created_at TIMESTAMPTZ DEFAULT NOW(),
-    updated_at TIMESTAMPTZ DEFAULT NOW()
-);
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id, report_date),
+    FOREIGN KEY (report_id, report_date) REFERENCES reports(id, report_date)
+        ON DELETE CASCADE ON UPDATE CASCADE
+) PARTITION BY RANGE (report_date);
+
+CREATE TABLE IF NOT EXISTS movements_default PARTITION OF movements DEFAULT;
 
 -- Índices para movimientos
 CREATE INDEX idx_movements_report ON movements(report_id);
@@ -146,9 +218,63 @@ CREATE INDEX idx_movements_date ON movements(effective_date);
 CREATE TRIGGER update_movements_updated_at BEFORE UPDATE ON movements
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
--- Tabla de auditoría
+-- Contador reports.movement_count
+CREATE OR REPLACE FUNCTION update_report_movement_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Triggers por sentencia con tablas de transición: un UPDATE por
+    -- sentencia (no por fila), también en COPY y en inserts multi-fila
+    IF TG_OP = 'INSERT' THEN
+        UPDATE reports.reports r SET movement_count = r.movement_count + d.n
+        FROM (SELECT report_id, report_date, COUNT(*) AS n FROM new_rows GROUP BY report_id, report_date) d
+        WHERE r.id = d.report_id AND r.report_date = d.report_date;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE reports.reports r SET movement_count = r.movement_count - d.n
+        FROM (SELECT report_id, report_date, COUNT(*) AS n FROM old_rows GROUP BY report_id, report_date) d
+        WHERE r.id = d.report_id AND r.report_date = d.report_date;
+    ELSE
+        -- UPDATE: solo cuentan los hijos que cambiaron de reporte. Se agrupa
+        -- solo por report_id: el ON UPDATE CASCADE de report_date mueve los
+        -- hijos con su reporte y no debe alterar el conteo
+        UPDATE reports.reports r SET movement_count = r.movement_count + d.n
+        FROM (
+            SELECT report_id, SUM(n) AS n FROM (
+                SELECT report_id, 1 AS n FROM new_rows
+                UNION ALL
+                SELECT report_id, -1 AS n FROM old_rows
+            ) c GROUP BY report_id HAVING SUM(n) <> 0
+        ) d
+        WHERE r.id = d.report_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER movements_movement_count_insert AFTER INSERT ON movements
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_movement_count();
+CREATE TRIGGER movements_movement_count_update AFTER UPDATE ON movements
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_movement_count();
+CREATE TRIGGER movements_movement_count_delete AFTER DELETE ON movements
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_movement_count();
+
+-- Reportes eliminados (tombstones para GET /admin/reportes/changes)
+CREATE TABLE IF NOT EXISTS report_deletions (
+    report_id UUID PRIMARY KEY,
+    legacy_id VARCHAR(100),
+    administrator VARCHAR(255),
+    client_operation VARCHAR(255),
+    report_date DATE,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+CREATE INDEX idx_report_deletions_deleted_at ON report_deletions(deleted_at);
+
+-- Tabla de auditoría (particionada por mes de created_at)
 CREATE TABLE IF NOT EXISTS audit_logs (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     user_id UUID REFERENCES users(id) ON DELETE SET NULL,
     action VARCHAR(100) NOT NULL,
     resource_type VARCHAR(100),
@@ -156,14 +282,18 @@ CREATE TABLE IF NOT EXISTS audit_logs (
     details TEXT,
     client_ip VARCHAR(45),
     user_agent VARCHAR(500),
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT;
 
 -- Índices para auditoría
 CREATE INDEX idx_audit_user ON audit_logs(user_id);
 CREATE INDEX idx_audit_action ON audit_logs(action);
 CREATE INDEX idx_audit_resource ON audit_logs(resource_type, resource_id);
-CREATE INDEX idx_audit_date ON audit_logs(created_at DESC);
+-- BRIN: tabla de solo inserción, created_at sigue el orden físico
+CREATE INDEX idx_audit_created_brin ON audit_logs USING brin(created_at);
 
 -- Tabla de configuración del sistema
 CREATE TABLE IF NOT EXISTS system_config (
@@ -208,8 +338,8 @@ SELECT
     r.status,
     r.created_at
 FROM reports r
-LEFT JOIN incidents i ON r.id = i.report_id
-LEFT JOIN movements m ON r.id = m.report_id
+LEFT JOIN incidents i ON r.id = i.report_id AND r.report_date = i.report_date
+LEFT JOIN movements m ON r.id = m.report_id AND r.report_date = m.report_date
 GROUP BY r.id, r.report_date, r.administrator, r.client_operation,
          r.daily_hours, r.staff_personnel, r.base_personnel,
          r.status, r.created_at;
@@ -0,0 +1,24 @@
+-- Migración 001: sincronización incremental del listado de reportes
+-- (GET /api/v1/admin/reportes/changes)
+--
+-- Base.metadata.create_all crea las tablas nuevas pero no agrega índices a
+-- tablas existentes. Aplicar sobre una base ya desplegada con:
+--   psql "$DATABASE_URL" -f sql/migrations/001_report_changes.sql
+-- Es idempotente.
+
+SET search_path TO reports, public;
+
+-- Cursor (updated_at, id) de los cambios
+CREATE INDEX IF NOT EXISTS idx_report_updated_at_id ON reports(updated_at, id);
+
+-- Reportes eliminados (tombstones)
+CREATE TABLE IF NOT EXISTS report_deletions (
+    report_id UUID PRIMARY KEY,
+    legacy_id VARCHAR(100),
+    administrator VARCHAR(255),
+    client_operation VARCHAR(255),
+    report_date DATE,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_report_deletions_deleted_at ON report_deletions(deleted_at);
@@ -0,0 +1,97 @@
+-- Migración 002: contadores de incidencias y movimientos en reports.reports
+--
+-- Agrega incident_count y movement_count, mantenidos por triggers por
+-- sentencia en incidents y movements. Aplicar con:
+--   psql "$DATABASE_URL" -f sql/migrations/002_report_child_counts.sql
+--   python scripts/backfill_report_counts.py
+-- El backfill calcula los valores de los reportes existentes (por lotes) y se
+-- puede repetir; con --check solo informa diferencias. Es idempotente.
+
+SET search_path TO reports, public;
+
+ALTER TABLE reports ADD COLUMN IF NOT EXISTS incident_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE reports ADD COLUMN IF NOT EXISTS movement_count INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION update_report_incident_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Triggers por sentencia con tablas de transición: un UPDATE por
+    -- sentencia (no por fila), también en COPY y en inserts multi-fila
+    IF TG_OP = 'INSERT' THEN
+        UPDATE reports.reports r SET incident_count = r.incident_count + d.n
+        FROM (SELECT report_id, COUNT(*) AS n FROM new_rows GROUP BY report_id) d
+        WHERE r.id = d.report_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE reports.reports r SET incident_count = r.incident_count - d.n
+        FROM (SELECT report_id, COUNT(*) AS n FROM old_rows GROUP BY report_id) d
+        WHERE r.id = d.report_id;
+    ELSE
+        -- UPDATE: solo cuentan los hijos que cambiaron de reporte
+        UPDATE reports.reports r SET incident_count = r.incident_count + d.n
+        FROM (
+            SELECT report_id, SUM(n) AS n FROM (
+                SELECT report_id, 1 AS n FROM new_rows
+                UNION ALL
+                SELECT report_id, -1 AS n FROM old_rows
+            ) c GROUP BY report_id HAVING SUM(n) <> 0
+        ) d
+        WHERE r.id = d.report_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION update_report_movement_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Triggers por sentencia con tablas de transición: un UPDATE por
+    -- sentencia (no por fila), también en COPY y en inserts multi-fila
+    IF TG_OP = 'INSERT' THEN
+        UPDATE reports.reports r SET movement_count = r.movement_count + d.n
+        FROM (SELECT report_id, COUNT(*) AS n FROM new_rows GROUP BY report_id) d
+        WHERE r.id = d.report_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE reports.reports r SET movement_count = r.movement_count - d.n
+        FROM (SELECT report_id, COUNT(*) AS n FROM old_rows GROUP BY report_id) d
+        WHERE r.id = d.report_id;
+    ELSE
+        -- UPDATE: solo cuentan los hijos que cambiaron de reporte
+        UPDATE reports.reports r SET movement_count = r.movement_count + d.n
+        FROM (
+            SELECT report_id, SUM(n) AS n FROM (
+                SELECT report_id, 1 AS n FROM new_rows
+                UNION ALL
+                SELECT report_id, -1 AS n FROM old_rows
+            ) c GROUP BY report_id HAVING SUM(n) <> 0
+        ) d
+        WHERE r.id = d.report_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS incidents_incident_count_insert ON incidents;
+DROP TRIGGER IF EXISTS incidents_incident_count_update ON incidents;
+DROP TRIGGER IF EXISTS incidents_incident_count_delete ON incidents;
+CREATE TRIGGER incidents_incident_count_insert AFTER INSERT ON incidents
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_incident_count();
+CREATE TRIGGER incidents_incident_count_update AFTER UPDATE ON incidents
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_incident_count();
+CREATE TRIGGER incidents_incident_count_delete AFTER DELETE ON incidents
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_incident_count();
+
+DROP TRIGGER IF EXISTS movements_movement_count_insert ON movements;
+DROP TRIGGER IF EXISTS movements_movement_count_update ON movements;
+DROP TRIGGER IF EXISTS movements_movement_count_delete ON movements;
+CREATE TRIGGER movements_movement_count_insert AFTER INSERT ON movements
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_movement_count();
+CREATE TRIGGER movements_movement_count_update AFTER UPDATE ON movements
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_movement_count();
+CREATE TRIGGER movements_movement_count_delete AFTER DELETE ON movements
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_movement_count();
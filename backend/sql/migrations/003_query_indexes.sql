@@ -0,0 +1,42 @@
+-- Migración 003: índices según la forma de las consultas
+--
+-- El listado, /reportes/admin/{admin}/today y las vistas filtran con
+-- lower(administrator) / lower(client_operation), que no pueden usar los
+-- índices b-tree simples sobre la columna. Esos índices se reemplazan por
+-- índices de expresión; se agregan el orden del listado (created_at DESC), un
+-- índice parcial para el listado de reportes con incidencias y BRIN en
+-- audit_logs.created_at (tabla de solo inserción).
+--
+-- Usa CREATE/DROP INDEX CONCURRENTLY (sin bloquear escrituras), por eso no
+-- puede correr dentro de una transacción. Aplicar con:
+--   psql "$DATABASE_URL" -f sql/migrations/003_query_indexes.sql
+-- Es idempotente. Verificar los planes con:
+--   python -m benchmarks.query_plans --database-url postgresql://...
+
+SET search_path TO reports, public;
+
+-- Reportes
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_admin_lower ON reports(lower(administrator));
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_client_lower ON reports(lower(client_operation));
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_date_admin_lower ON reports(report_date, lower(administrator));
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_created_at_desc ON reports(created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reports_with_incidents ON reports(created_at DESC) WHERE incident_count > 0;
+
+-- Hijos por reporte (bases creadas con create_all no los tenían)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_incidents_report ON incidents(report_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_movements_report ON movements(report_id);
+
+-- Auditoría
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_created_brin ON audit_logs USING brin(created_at);
+
+-- Índices reemplazados (nombres de init.sql y de create_all)
+DROP INDEX CONCURRENTLY IF EXISTS idx_reports_admin;
+DROP INDEX CONCURRENTLY IF EXISTS idx_reports_client;
+DROP INDEX CONCURRENTLY IF EXISTS idx_reports_date_admin;
+DROP INDEX CONCURRENTLY IF EXISTS idx_report_date_admin;
+DROP INDEX CONCURRENTLY IF EXISTS ix_reports_reports_administrator;
+DROP INDEX CONCURRENTLY IF EXISTS ix_reports_reports_client_operation;
+DROP INDEX CONCURRENTLY IF EXISTS idx_audit_date;
+DROP INDEX CONCURRENTLY IF EXISTS ix_reports_audit_logs_created_at;
+
+ANALYZE reports;
@@ -0,0 +1,328 @@
+-- Migración 004: particionado mensual de reports, incidents, movements y audit_logs
+--
+-- Convierte las cuatro tablas en tablas particionadas por rango (un mes por
+-- partición) sobre report_date (created_at en audit_logs). Las consultas por
+-- período leen solo los meses pedidos y la retención pasa a ser un DETACH de
+-- la partición del mes (scripts/manage_partitions.py --detach) en lugar de
+-- DELETE masivos.
+--
+-- Cambios de esquema que implica el particionado:
+-- - Las claves primarias y únicas incluyen la columna de partición:
+--   reports (id, report_date), incidents/movements (id, report_date),
+--   audit_logs (id, created_at); legacy_id es único por (legacy_id, report_date).
+-- - incidents y movements guardan report_date (la fecha del reporte padre) y
+--   lo referencian con (report_id, report_date).
+-- - Cada tabla tiene una partición DEFAULT para filas fuera de los meses
+--   creados; la API crea los meses siguientes al arrancar
+--   (src/database/partitions.py).
+--
+-- Reescribe las tablas completas dentro de una transacción (bloquea lecturas
+-- y escrituras mientras dura): aplicar en una ventana de mantenimiento, con
+-- la API detenida y un respaldo previo:
+--   pg_dump "$DATABASE_URL" -n reports -Fc -f antes_004.dump
+--   psql "$DATABASE_URL" -f sql/migrations/004_partitioning.sql
+-- No es re-ejecutable: si reports ya está particionada se detiene sin cambios.
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+SET search_path TO reports, public;
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_partitioned_table p
+        JOIN pg_class c ON c.oid = p.partrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'reports' AND c.relname = 'reports'
+    ) THEN
+        RAISE EXCEPTION 'reports.reports ya está particionada (migración 004 aplicada)';
+    END IF;
+END $$;
+
+LOCK TABLE reports, incidents, movements, audit_logs IN ACCESS EXCLUSIVE MODE;
+
+DROP VIEW IF EXISTS daily_report_summary;
+DROP VIEW IF EXISTS admin_statistics;
+
+-- Las tablas actuales quedan como *_unpartitioned hasta copiar los datos; sus
+-- índices (incluidas claves primarias) se renombran para liberar los nombres
+DO $$
+DECLARE
+    idx RECORD;
+BEGIN
+    FOR idx IN
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = 'reports' AND tablename IN ('reports', 'incidents', 'movements', 'audit_logs')
+    LOOP
+        EXECUTE format('ALTER INDEX reports.%I RENAME TO %I', idx.indexname, left(idx.indexname, 59) || '_old');
+    END LOOP;
+END $$;
+
+ALTER TABLE reports RENAME TO reports_unpartitioned;
+ALTER TABLE incidents RENAME TO incidents_unpartitioned;
+ALTER TABLE movements RENAME TO movements_unpartitioned;
+ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned;
+
+-- Tablas particionadas (LIKE conserva tipos, defaults y CHECK de la base actual,
+-- creada con init.sql o con create_all)
+CREATE TABLE reports (
+    LIKE reports_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    PRIMARY KEY (id, report_date),
+    CONSTRAINT uq_reports_legacy_id_date UNIQUE (legacy_id, report_date),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (reviewed_by) REFERENCES users(id) ON DELETE SET NULL
+) PARTITION BY RANGE (report_date);
+
+CREATE TABLE incidents (
+    LIKE incidents_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    report_date DATE NOT NULL,
+    PRIMARY KEY (id, report_date),
+    FOREIGN KEY (report_id, report_date) REFERENCES reports(id, report_date)
+        ON DELETE CASCADE ON UPDATE CASCADE
+) PARTITION BY RANGE (report_date);
+
+CREATE TABLE movements (
+    LIKE movements_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    report_date DATE NOT NULL,
+    PRIMARY KEY (id, report_date),
+    FOREIGN KEY (report_id, report_date) REFERENCES reports(id, report_date)
+        ON DELETE CASCADE ON UPDATE CASCADE
+) PARTITION BY RANGE (report_date);
+
+CREATE TABLE audit_logs (
+    LIKE audit_logs_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    PRIMARY KEY (id, created_at),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
+) PARTITION BY RANGE (created_at);
+
+-- Particiones: DEFAULT y un mes por partición desde el dato más antiguo hasta
+-- tres meses adelante (mismos nombres que src/database/partitions.py)
+DO $$
+DECLARE
+    t TEXT;
+    first_month DATE;
+    m DATE;
+    last_month DATE := date_trunc('month', CURRENT_DATE)::date + INTERVAL '3 months';
+BEGIN
+    FOREACH t IN ARRAY ARRAY['reports', 'incidents', 'movements', 'audit_logs'] LOOP
+        EXECUTE format('CREATE TABLE reports.%I PARTITION OF reports.%I DEFAULT', t || '_default', t);
+    END LOOP;
+
+    SELECT date_trunc('month', COALESCE(MIN(report_date), CURRENT_DATE))::date
+    INTO first_month FROM reports_unpartitioned;
+    m := first_month;
+    WHILE m <= last_month LOOP
+        FOREACH t IN ARRAY ARRAY['reports', 'incidents', 'movements'] LOOP
+            EXECUTE format(
+                'CREATE TABLE reports.%I PARTITION OF reports.%I FOR VALUES FROM (%L) TO (%L)',
+                t || '_p' || to_char(m, 'YYYYMM'), t, m, (m + INTERVAL '1 month')::date
+            );
+        END LOOP;
+        m := (m + INTERVAL '1 month')::date;
+    END LOOP;
+
+    SELECT date_trunc('month', COALESCE(MIN(created_at), NOW()) AT TIME ZONE 'America/Bogota')::date
+    INTO first_month FROM audit_logs_unpartitioned;
+    m := first_month;
+    WHILE m <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE reports.%I PARTITION OF reports.audit_logs FOR VALUES FROM (%L) TO (%L)',
+            'audit_logs_p' || to_char(m, 'YYYYMM'),
+            to_char(m, 'YYYY-MM-DD') || ' 00:00:00 America/Bogota',
+            to_char((m + INTERVAL '1 month')::date, 'YYYY-MM-DD') || ' 00:00:00 America/Bogota'
+        );
+        m := (m + INTERVAL '1 month')::date;
+    END LOOP;
+END $$;
+
+-- Datos (antes de crear los triggers: los contadores ya vienen calculados)
+INSERT INTO reports SELECT * FROM reports_unpartitioned;
+
+INSERT INTO incidents
+SELECT i.*, r.report_date
+FROM incidents_unpartitioned i
+JOIN reports_unpartitioned r ON r.id = i.report_id;
+
+INSERT INTO movements
+SELECT m.*, r.report_date
+FROM movements_unpartitioned m
+JOIN reports_unpartitioned r ON r.id = m.report_id;
+
+-- created_at pasa a ser parte de la clave primaria
+UPDATE audit_logs_unpartitioned SET created_at = NOW() WHERE created_at IS NULL;
+INSERT INTO audit_logs SELECT * FROM audit_logs_unpartitioned;
+
+DROP TABLE incidents_unpartitioned, movements_unpartitioned, reports_unpartitioned, audit_logs_unpartitioned CASCADE;
+
+-- Índices (se crean en cada partición)
+CREATE INDEX idx_reports_date ON reports(report_date DESC);
+CREATE INDEX idx_reports_status ON reports(status);
+CREATE INDEX idx_reports_user ON reports(user_id);
+CREATE INDEX idx_reports_date_client ON reports(report_date, client_operation);
+CREATE INDEX idx_report_updated_at_id ON reports(updated_at, id);
+CREATE INDEX idx_reports_legacy_id ON reports(legacy_id);
+CREATE INDEX idx_reports_admin_lower ON reports(lower(administrator));
+CREATE INDEX idx_reports_client_lower ON reports(lower(client_operation));
+CREATE INDEX idx_reports_date_admin_lower ON reports(report_date, lower(administrator));
+CREATE INDEX idx_reports_created_at_desc ON reports(created_at DESC);
+CREATE INDEX idx_reports_with_incidents ON reports(created_at DESC) WHERE incident_count > 0;
+
+CREATE INDEX idx_incidents_report ON incidents(report_id);
+CREATE INDEX idx_incidents_type ON incidents(incident_type);
+CREATE INDEX idx_incidents_employee ON incidents(employee_name);
+CREATE INDEX idx_incidents_end_date ON incidents(end_date);
+
+CREATE INDEX idx_movements_report ON movements(report_id);
+CREATE INDEX idx_movements_type ON movements(movement_type);
+CREATE INDEX idx_movements_employee ON movements(employee_name);
+CREATE INDEX idx_movements_date ON movements(effective_date);
+
+CREATE INDEX idx_audit_user ON audit_logs(user_id);
+CREATE INDEX idx_audit_action ON audit_logs(action);
+CREATE INDEX idx_audit_resource ON audit_logs(resource_type, resource_id);
+CREATE INDEX idx_audit_created_brin ON audit_logs USING brin(created_at);
+
+-- Triggers
+CREATE TRIGGER update_reports_updated_at BEFORE UPDATE ON reports
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE TRIGGER update_incidents_updated_at BEFORE UPDATE ON incidents
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE TRIGGER update_movements_updated_at BEFORE UPDATE ON movements
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Contadores: se agrupa también por report_date para que el UPDATE del
+-- padre lea solo la partición del mes
+CREATE OR REPLACE FUNCTION update_report_incident_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Triggers por sentencia con tablas de transición: un UPDATE por
+    -- sentencia (no por fila), también en COPY y en inserts multi-fila
+    IF TG_OP = 'INSERT' THEN
+        UPDATE reports.reports r SET incident_count = r.incident_count + d.n
+        FROM (SELECT report_id, report_date, COUNT(*) AS n FROM new_rows GROUP BY report_id, report_date) d
+        WHERE r.id = d.report_id AND r.report_date = d.report_date;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE reports.reports r SET incident_count = r.incident_count - d.n
+        FROM (SELECT report_id, report_date, COUNT(*) AS n FROM old_rows GROUP BY report_id, report_date) d
+        WHERE r.id = d.report_id AND r.report_date = d.report_date;
+    ELSE
+        -- UPDATE: solo cuentan los hijos que cambiaron de reporte. Se agrupa
+        -- solo por report_id: el ON UPDATE CASCADE de report_date mueve los
+        -- hijos con su reporte y no debe alterar el conteo
+        UPDATE reports.reports r SET incident_count = r.incident_count + d.n
+        FROM (
+            SELECT report_id, SUM(n) AS n FROM (
+                SELECT report_id, 1 AS n FROM new_rows
+                UNION ALL
+                SELECT report_id, -1 AS n FROM old_rows
+            ) c GROUP BY report_id HAVING SUM(n) <> 0
+        ) d
+        WHERE r.id = d.report_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION update_report_movement_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- Triggers por sentencia con tablas de transición: un UPDATE por
+    -- sentencia (no por fila), también en COPY y en inserts multi-fila
+    IF TG_OP = 'INSERT' THEN
+        UPDATE reports.reports r SET movement_count = r.movement_count + d.n
+        FROM (SELECT report_id, report_date, COUNT(*) AS n FROM new_rows GROUP BY report_id, report_date) d
+        WHERE r.id = d.report_id AND r.report_date = d.report_date;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE reports.reports r SET movement_count = r.movement_count - d.n
+        FROM (SELECT report_id, report_date, COUNT(*) AS n FROM old_rows GROUP BY report_id, report_date) d
+        WHERE r.id = d.report_id AND r.report_date = d.report_date;
+    ELSE
+        -- UPDATE: solo cuentan los hijos que cambiaron de reporte. Se agrupa
+        -- solo por report_id: el ON UPDATE CASCADE de report_date mueve los
+        -- hijos con su reporte y no debe alterar el conteo
+        UPDATE reports.reports r SET movement_count = r.movement_count + d.n
+        FROM (
+            SELECT report_id, SUM(n) AS n FROM (
+                SELECT report_id, 1 AS n FROM new_rows
+                UNION ALL
+                SELECT report_id, -1 AS n FROM old_rows
+            ) c GROUP BY report_id HAVING SUM(n) <> 0
+        ) d
+        WHERE r.id = d.report_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER incidents_incident_count_insert AFTER INSERT ON incidents
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_incident_count();
+CREATE TRIGGER incidents_incident_count_update AFTER UPDATE ON incidents
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_incident_count();
+CREATE TRIGGER incidents_incident_count_delete AFTER DELETE ON incidents
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_incident_count();
+
+CREATE TRIGGER movements_movement_count_insert AFTER INSERT ON movements
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_movement_count();
+CREATE TRIGGER movements_movement_count_update AFTER UPDATE ON movements
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_movement_count();
+CREATE TRIGGER movements_movement_count_delete AFTER DELETE ON movements
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION update_report_movement_count();
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_proc WHERE proname = 'check_duplicate_report') THEN
+        CREATE TRIGGER check_duplicate_report_trigger
+        BEFORE INSERT OR UPDATE ON reports.reports
+        FOR EACH ROW EXECUTE FUNCTION check_duplicate_report();
+    END IF;
+END $$;
+
+-- Vistas de init.sql
+CREATE OR REPLACE VIEW daily_report_summary AS
+SELECT
+    r.report_date,
+    r.administrator,
+    r.client_operation,
+    r.daily_hours,
+    r.staff_personnel,
+    r.base_personnel,
+    COUNT(DISTINCT i.id) as incident_count,
+    COUNT(DISTINCT m.id) as movement_count,
+    r.status,
+    r.created_at
+FROM reports r
+LEFT JOIN incidents i ON r.id = i.report_id AND r.report_date = i.report_date
+LEFT JOIN movements m ON r.id = m.report_id AND r.report_date = m.report_date
+GROUP BY r.id, r.report_date, r.administrator, r.client_operation,
+         r.daily_hours, r.staff_personnel, r.base_personnel,
+         r.status, r.created_at;
+
+CREATE OR REPLACE VIEW admin_statistics AS
+SELECT
+    r.administrator,
+    COUNT(DISTINCT r.id) as total_reports,
+    AVG(r.daily_hours) as avg_daily_hours,
+    SUM(r.staff_personnel) as total_staff,
+    SUM(r.base_personnel) as total_base,
+    COUNT(DISTINCT r.report_date) as days_reported,
+    MAX(r.created_at) as last_report_date
+FROM reports r
+WHERE r.status = 'completed'
+GROUP BY r.administrator;
+
+GRANT ALL PRIVILEGES ON ALL TABLES IN SCHEMA reports TO postgres;
+
+COMMIT;
+
+ANALYZE reports;
+ANALYZE incidents;
+ANALYZE movements;
+ANALYZE audit_logs;
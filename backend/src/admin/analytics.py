@@ -0,0 +1,155 @@
+"""
+Analytics del dashboard administrativo sobre PostgreSQL
+Métricas y series para gráficos calculadas con consultas agrupadas
+"""
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..database.models import Report, Incident
+
+logger = logging.getLogger(__name__)
+
+# Las métricas se recalculan como máximo una vez por minuto (TTL en el cache
+# de respuestas; las escrituras de reportes lo invalidan antes)
+CACHE_TTL_SECONDS = 60
+
+
+class AnalyticsService:
+    """Cálculo de métricas del dashboard con SQL agrupado"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_dashboard(self, today: date, days: int = 30) -> Dict[str, Any]:
+        """
+        Obtener métricas y gráficos del dashboard
+
+        Args:
+            today: Fecha actual en la timezone configurada
+            days: Días hacia atrás que cubren las series de los gráficos
+
+        Returns:
+            Diccionario compatible con AnalyticsResponse
+        """
+        window_start = today - timedelta(days=days - 1)
+
+        (total_reportes, promedio_horas, administradores_activos, reportes_hoy,
+         total_incidencias_mes) = self.totals_query(today).one()
+
+        return {
+            "total_reportes": total_reportes or 0,
+            "reportes_hoy": reportes_hoy or 0,
+            "promedio_horas_diarias": round(float(promedio_horas or 0), 2),
+            "total_incidencias_mes": total_incidencias_mes or 0,
+            "administradores_activos": administradores_activos or 0,
+            "graficos": {
+                "reportes_por_dia": self._reports_per_day(window_start, today),
+                "incidencias_por_tipo": self._incidents_by_type(window_start, today),
+                "personal_por_operacion": self._staff_by_operation(window_start, today),
+            }
+        }
+
+    # Consultas (sin ejecutar): benchmarks/query_plans.py verifica sus planes
+
+    def totals_query(self, today: date):
+        """
+        Totales generales en una sola pasada
+
+        Las incidencias del mes salen del contador del reporte (sin join con incidents).
+        """
+        month_start = today.replace(day=1)
+        return self.db.query(
+            func.count(Report.id),
+            func.avg(Report.daily_hours),
+            func.count(func.distinct(Report.administrator)),
+            func.count(Report.id).filter(Report.report_date == today),
+            func.sum(Report.incident_count).filter(
+                Report.report_date >= month_start,
+                Report.report_date <= today
+            ),
+        )
+
+    def reports_per_day_query(self, start: date, end: date):
+        """Reportes, administradores e incidencias por día de la ventana"""
+        return self.db.query(
+            Report.report_date,
+            func.count(Report.id),
+            func.count(func.distinct(Report.administrator)),
+            func.sum(Report.incident_count),
+        ).filter(
+            Report.report_date >= start,
+            Report.report_date <= end
+        ).group_by(Report.report_date)
+
+    def incidents_by_type_query(self, start: date, end: date):
+        """Incidencias por tipo de los reportes de la ventana"""
+        return self.db.query(
+            Incident.incident_type,
+            func.count(Incident.id).label("cantidad"),
+        ).join(
+            Report, (Incident.report_id == Report.id) & (Incident.report_date == Report.report_date)
+        ).filter(
+            Report.report_date >= start,
+            Report.report_date <= end
+        ).group_by(Incident.incident_type).order_by(func.count(Incident.id).desc())
+
+    def staff_by_operation_query(self, start: date, end: date):
+        """Último reporte de cada operación en la ventana (DISTINCT ON)"""
+        return self.db.query(
+            Report.client_operation,
+            Report.staff_personnel,
+            Report.base_personnel,
+            Report.report_date,
+        ).filter(
+            Report.report_date >= start,
+            Report.report_date <= end
+        ).distinct(Report.client_operation).order_by(
+            Report.client_operation,
+            Report.report_date.desc(),
+            Report.created_at.desc()
+        )
+
+    def _reports_per_day(self, start: date, end: date) -> List[Dict[str, Any]]:
+        """Serie diaria de reportes e incidencias (días sin reportes en cero)"""
+        report_rows = self.reports_per_day_query(start, end).all()
+
+        reports_by_day = {row[0]: (row[1], row[2], row[3] or 0) for row in report_rows}
+
+        series = []
+        current = start
+        while current <= end:
+            reportes, administradores, incidencias = reports_by_day.get(current, (0, 0, 0))
+            series.append({
+                "fecha": current.isoformat(),
+                "reportes": reportes,
+                "administradores": administradores,
+                "incidencias": incidencias,
+            })
+            current += timedelta(days=1)
+        return series
+
+    def _incidents_by_type(self, start: date, end: date) -> List[Dict[str, Any]]:
+        """Cantidad de incidencias por tipo en la ventana"""
+        rows = self.incidents_by_type_query(start, end).all()
+
+        return [{"tipo": tipo, "cantidad": cantidad} for tipo, cantidad in rows]
+
+    def _staff_by_operation(self, start: date, end: date) -> List[Dict[str, Any]]:
+        """Personal staff y base del último reporte de cada operación en la ventana"""
+        latest = self.staff_by_operation_query(start, end).all()
+
+        return [
+            {
+                "operacion": operacion,
+                "personal_staff": staff or 0,
+                "personal_base": base or 0,
+                "total": (staff or 0) + (base or 0),
+                "fecha": report_date.isoformat(),
+            }
+            for operacion, staff, base, report_date in latest
+        ]
+
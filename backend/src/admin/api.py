@@ -0,0 +1,811 @@
+"""
+Endpoints del area admin
+Reportes (PostgreSQL), analytics, vistas 1-4 y exportacion (Excel)
+"""
+from datetime import date, datetime
+from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from sqlalchemy.orm import Session
+import logging
+
+from ..config import settings
+from ..database.connection import get_db
+from ..dependencies import get_excel_handler, get_operations_views
+from ..models import (
+    DailyReportUpdate, ReportBatchRequest, APIResponse, AnalyticsResponse, DailyGeneralOperationsResponse,
+    DailyDetailedOperationsResponse, AccumulatedGeneralOperationsResponse, AccumulatedDetailedOperationsResponse
+)
+from ..services.cache_service import (
+    response_cache, conditional_get, date_range_tags, report_tag, REPORTS_TAG, ANALYTICS_TAG
+)
+from ..services.event_service import event_broadcaster, REPORT_UPDATED
+from ..services.outbox_service import outbox
+from ..services.report_service import ReportService, get_report_service, parse_report_projection
+from ..utils.date_utils import get_local_today
+from ..utils.responses import json_response
+from .analytics import AnalyticsService, CACHE_TTL_SECONDS as ANALYTICS_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix=f"{settings.api_v1_prefix}/admin", tags=["Admin"])
+
+
+def _update_excel_report(excel, legacy_id: str, report_update: DailyReportUpdate) -> bool:
+    """
+    Aplicar en Excel la edición ya confirmada en PostgreSQL
+
+    Sin esto la sincronización incremental (Excel -> PostgreSQL) revertiría la
+    edición al comparar el reporte con la fila del libro.
+    """
+    fields = {
+        "Horas_Diarias": report_update.horas_diarias,
+        "Personal_Staff": report_update.personal_staff,
+        "Personal_Base": report_update.personal_base,
+        "Hechos_Relevantes": report_update.hechos_relevantes,
+    }
+    if report_update.incidencias is not None:
+        fields["Cantidad_Incidencias"] = len(report_update.incidencias)
+    if report_update.ingresos_retiros is not None:
+        fields["Cantidad_Ingresos_Retiros"] = len(report_update.ingresos_retiros)
+    fields = {name: value for name, value in fields.items() if value is not None}
+
+    success = True
+    if fields:
+        success = excel.update_report(legacy_id, fields) and success
+    if report_update.incidencias is not None:
+        success = excel.update_report_incidents(legacy_id, report_update.incidencias) and success
+    if report_update.ingresos_retiros is not None:
+        success = excel.update_report_movements(legacy_id, report_update.ingresos_retiros) and success
+    return success
+
+
+def _resolve_period(fecha_inicio: Optional[date], fecha_fin: Optional[date]):
+    """Período efectivo de las vistas acumuladas (mismos defaults que excel_handler)"""
+    if fecha_inicio is None:
+        today = get_local_today()
+        return today, today
+    return fecha_inicio, fecha_fin or fecha_inicio
+
+
+@router.get(
+    "/reportes",
+    response_model=List[Dict[str, Any]],
+    summary="Obtener lista de reportes (Admin)",
+    description="Obtener lista filtrable de todos los reportes para el area admin"
+)
+async def get_reports(
+    request: Request,
+    response: Response,
+    administrador: Optional[str] = None,
+    cliente: Optional[str] = None,
+    fecha_inicio: Optional[str] = None,
+    fecha_fin: Optional[str] = None,
+    page: Optional[int] = None,
+    limit: Optional[int] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    min_incidencias: Optional[int] = Query(None, ge=0),
+    min_ingresos_retiros: Optional[int] = Query(None, ge=0),
+    ordenar_por: Optional[str] = None,
+    service: ReportService = Depends(get_report_service)
+) -> List[Dict[str, Any]]:
+    """
+    Obtener lista de reportes con filtros opcionales
+
+    - **administrador**: Filtrar por administrador especifico
+    - **cliente**: Filtrar por cliente/operacion
+    - **fecha_inicio**: Fecha inicial del rango (YYYY-MM-DD)
+    - **fecha_fin**: Fecha final del rango (YYYY-MM-DD)
+    - **page**: Numero de pagina para paginacion (opcional)
+    - **limit**: Registros por pagina (opcional, max. 100)
+    - **fields**: Campos a devolver separados por coma (p. ej. `ID,Administrador,Cantidad_Incidencias`)
+    - **include**: Hijos a expandir: `incidencias`, `ingresos_retiros`
+    - **min_incidencias**, **min_ingresos_retiros**: Cantidad minima de incidencias / movimientos
+    - **ordenar_por**: `fecha` (por defecto), `incidencias` o `ingresos_retiros` (descendente)
+
+    Nota: Si no se especifica limit, se devuelven todos los reportes sin paginacion.
+    Sin fields ni include se devuelve el reporte completo con incidencias y movimientos.
+    """
+    try:
+        field_list, include_list = parse_report_projection(fields, include)
+
+        # Validar parametros de paginacion si se proporcionan
+        if limit is not None:
+            if limit > 100:
+                limit = 100
+            if limit < 1:
+                limit = 20
+
+        if page is not None and page < 1:
+            page = 1
+
+        filters = dict(
+            administrador=administrador,
+            cliente=cliente,
+            fecha_inicio=fecha_inicio,
+            fecha_fin=fecha_fin,
+            page=page,
+            limit=limit,
+            fields=field_list,
+            include=include_list,
+            min_incidencias=min_incidencias,
+            min_ingresos_retiros=min_ingresos_retiros,
+            ordenar_por=ordenar_por
+        )
+        cache_key = response_cache.make_key("reportes", **filters)
+        not_modified = conditional_get(request, response, cache_key, [REPORTS_TAG])
+        if not_modified:
+            return not_modified
+
+        reports = response_cache.get_or_set(
+            cache_key,
+            lambda: service.list_reports(**filters),
+            tags=[REPORTS_TAG]
+        )
+        return json_response(reports, response)
+
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error obteniendo reportes: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor al obtener reportes"
+        )
+
+
+@router.get(
+    "/reportes/changes",
+    response_model=Dict[str, Any],
+    summary="Cambios del listado de reportes",
+    description="Reportes creados/modificados y eliminados desde un token de sincronizacion"
+)
+async def get_report_changes(
+    response: Response,
+    since: Optional[str] = None,
+    administrador: Optional[str] = None,
+    cliente: Optional[str] = None,
+    fecha_inicio: Optional[str] = None,
+    fecha_fin: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    service: ReportService = Depends(get_report_service)
+) -> Dict[str, Any]:
+    """
+    Sincronizacion incremental del listado de reportes
+
+    - **since**: Token devuelto por la llamada anterior (sin token: listado completo)
+    - **administrador**, **cliente**, **fecha_inicio**, **fecha_fin**: Mismos filtros que /reportes
+    - **limit**: Maximo de reportes por respuesta; con `has_more` se pide de nuevo con `next_token`
+
+    El cliente aplica `changes` por ID (insertar o reemplazar), luego quita los
+    IDs de `deleted` y guarda `next_token` para la siguiente llamada.
+    """
+    try:
+        changes = service.list_changes(
+            since=since,
+            limit=limit,
+            administrador=administrador,
+            cliente=cliente,
+            fecha_inicio=fecha_inicio,
+            fecha_fin=fecha_fin
+        )
+        logger.info(
+            f"Cambios de reportes: {len(changes['changes'])} modificados, "
+            f"{len(changes['deleted'])} eliminados"
+        )
+        return json_response(changes, response)
+
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Token de sincronizacion invalido"
+        )
+    except Exception as e:
+        logger.error(f"Error obteniendo cambios de reportes: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor al obtener cambios de reportes"
+        )
+
+
+@router.post(
+    "/reportes/batch",
+    response_model=Dict[str, Any],
+    summary="Obtener detalles de varios reportes",
+    description="Detalles completos de hasta 100 reportes en una sola consulta"
+)
+async def get_reports_batch(
+    batch: ReportBatchRequest,
+    response: Response,
+    service: ReportService = Depends(get_report_service)
+) -> Dict[str, Any]:
+    """
+    Obtener detalles de varios reportes en una sola llamada
+
+    - **ids**: IDs de los reportes (UUID, maximo 100)
+    - **fechas**: Fechas de los reportes si se conocen (acotan las particiones leídas)
+
+    Devuelve `reportes` en el orden pedido y `no_encontrados` con los IDs inexistentes.
+    """
+    try:
+        report_ids = list(dict.fromkeys(batch.ids))
+        cache_key = response_cache.make_key("reportes_batch", ids=",".join(sorted(str(i) for i in report_ids)))
+        reports = response_cache.get_or_set(
+            cache_key,
+            lambda: service.get_reports_details(report_ids, batch.fechas),
+            tags=[REPORTS_TAG]
+        )
+
+        found = {report["ID"] for report in reports}
+        missing = [str(report_id) for report_id in report_ids if str(report_id) not in found]
+        logger.info(f"Detalles en lote: {len(reports)} reportes, {len(missing)} no encontrados")
+        return json_response({"reportes": reports, "no_encontrados": missing}, response)
+
+    except Exception as e:
+        logger.error(f"Error obteniendo detalles en lote: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor al obtener detalles de reportes"
+        )
+
+
+@router.get(
+    "/reportes/{report_id}",
+    response_model=Dict[str, Any],
+    summary="Obtener detalles de un reporte especifico",
+    description="Obtener detalles completos de un reporte por su ID"
+)
+async def get_report_details(
+    report_id: str,
+    request: Request,
+    response: Response,
+    fecha: Optional[date] = Query(None, description="Fecha del reporte si se conoce (acota la partición leída)"),
+    service: ReportService = Depends(get_report_service)
+) -> Dict[str, Any]:
+    """
+    Obtener detalles completos de un reporte especifico
+
+    - **report_id**: ID unico del reporte (UUID)
+    - **fecha**: Fecha del reporte (opcional)
+    """
+    try:
+        cache_key = response_cache.make_key("reporte", id=report_id)
+        tags = [report_tag(report_id)]
+        not_modified = conditional_get(request, response, cache_key, tags)
+        if not_modified:
+            return not_modified
+
+        report_data = response_cache.get_or_set(
+            cache_key,
+            lambda: service.get_report_details(report_id, fecha),
+            tags=tags
+        )
+
+        if report_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Reporte {report_id} no encontrado"
+            )
+
+        logger.info(
+            f"Detalles de reporte obtenidos: {report_id} con "
+            f"{len(report_data['incidencias'])} incidencias y {len(report_data['ingresos_retiros'])} movimientos"
+        )
+        return json_response(report_data, response)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error obteniendo detalles del reporte {report_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error interno del servidor al obtener detalles del reporte: {str(e)}"
+        )
+
+
+@router.put(
+    "/reportes/{report_id}",
+    response_model=Dict[str, Any],
+    summary="Actualizar un reporte especifico",
+    description="Actualizar campos editables de un reporte existente"
+)
+async def update_report(
+    report_id: str,
+    report_update: DailyReportUpdate,
+    excel=Depends(get_excel_handler),
+    service: ReportService = Depends(get_report_service)
+) -> Dict[str, Any]:
+    """
+    Actualizar un reporte especifico (dual-write: PostgreSQL + Excel)
+
+    - **report_id**: ID unico del reporte (UUID)
+    - **report_update**: Datos a actualizar (solo campos permitidos)
+    """
+    try:
+        today = get_local_today()
+        updated_report = service.update_report(report_id, report_update, today=today)
+        logger.info(f"Reporte actualizado exitosamente: {report_id}")
+
+        # Si tiene legacy_id, reflejar la edición en Excel
+        legacy_id = service.get_legacy_id(report_id, today)
+        if legacy_id:
+            try:
+                if _update_excel_report(excel, legacy_id, report_update):
+                    logger.info(f"Reporte actualizado en Excel: {legacy_id}")
+                else:
+                    logger.warning(f"No se pudo actualizar en Excel (legacy_id: {legacy_id})")
+            except Exception as excel_err:
+                logger.warning(f"No se pudo actualizar en Excel (legacy_id: {legacy_id}): {excel_err}")
+
+        fecha_creacion = updated_report.get("Fecha_Creacion")
+        event_broadcaster.publish(
+            REPORT_UPDATED,
+            id=report_id,
+            administrador=updated_report.get("Administrador"),
+            cliente_operacion=updated_report.get("Cliente_Operacion"),
+            fecha=fecha_creacion.date() if isinstance(fecha_creacion, datetime) else fecha_creacion
+        )
+        return updated_report
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error actualizando reporte {report_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error interno del servidor al actualizar el reporte: {str(e)}"
+        )
+
+
+@router.get(
+    "/analytics",
+    response_model=AnalyticsResponse,
+    summary="Obtener metricas para dashboard",
+    description="Obtener metricas y estadisticas para el dashboard administrativo"
+)
+async def get_analytics(
+    request: Request,
+    response: Response,
+    dias: int = Query(30, ge=1, le=365, description="Días que cubren las series de los gráficos"),
+    db: Session = Depends(get_db)
+) -> AnalyticsResponse:
+    """
+    Obtener metricas para el dashboard administrativo
+
+    Retorna estadisticas como:
+    - Total de reportes
+    - Reportes del dia
+    - Promedio de horas diarias
+    - Total de incidencias del mes
+    - Administradores activos
+    - Datos para graficos (reportes por dia, incidencias por tipo, personal por operacion)
+
+    Se calcula con consultas agrupadas en PostgreSQL y se cachea por minuto.
+    """
+    try:
+        today = get_local_today()
+        cache_key = response_cache.make_key("analytics", fecha=today, dias=dias)
+        not_modified = conditional_get(
+            request, response, cache_key, [ANALYTICS_TAG], ttl=ANALYTICS_CACHE_TTL
+        )
+        if not_modified:
+            return not_modified
+
+        analytics_data = response_cache.get_or_set(
+            cache_key,
+            lambda: AnalyticsService(db).get_dashboard(today, days=dias),
+            tags=[ANALYTICS_TAG],
+            ttl=ANALYTICS_CACHE_TTL
+        )
+
+        result = AnalyticsResponse(
+            total_reportes=analytics_data["total_reportes"],
+            reportes_hoy=analytics_data["reportes_hoy"],
+            promedio_horas_diarias=analytics_data["promedio_horas_diarias"],
+            total_incidencias_mes=analytics_data["total_incidencias_mes"],
+            administradores_activos=analytics_data["administradores_activos"],
+            graficos=analytics_data["graficos"]
+        )
+
+        logger.info("Analytics obtenidos exitosamente")
+        return result
+
+    except Exception as e:
+        logger.error(f"Error obteniendo analytics: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor al obtener analytics"
+        )
+
+
+@router.get(
+    "/daily-general-operations",
+    response_model=DailyGeneralOperationsResponse,
+    summary="Vista 1: Operación General Diaria",
+    description="Obtener datos consolidados de todas las operaciones para un día específico"
+)
+async def get_daily_general_operations(
+    request: Request,
+    response: Response,
+    fecha: Optional[date] = None,
+    views=Depends(get_operations_views)
+) -> DailyGeneralOperationsResponse:
+    """
+    Vista 1: Operación General Diaria
+
+    Obtiene datos consolidados de TODAS las operaciones para un día específico:
+    - Promedio de horas diarias entre todas las operaciones
+    - Suma total de personal staff y base
+    - Lista consolidada de incidencias con origen (admin/operación)
+    - Lista consolidada de movimientos con origen (admin/operación)
+    - Lista consolidada de hechos relevantes con origen (admin/operación)
+
+    Args:
+        fecha: Fecha específica (por defecto: hoy)
+
+    Returns:
+        DailyGeneralOperationsResponse: Datos consolidados del día
+    """
+    try:
+        # Si no se especifica fecha, usar hoy
+        target_date = fecha or date.today()
+
+        # Obtener datos consolidados del día
+        cache_key = response_cache.make_key("vista1", fecha=target_date)
+        tags = date_range_tags(target_date, target_date)
+        not_modified = conditional_get(request, response, cache_key, tags)
+        if not_modified:
+            return not_modified
+
+        data = response_cache.get_or_set(
+            cache_key,
+            lambda: views.get_daily_general_operations(target_date),
+            tags=tags
+        )
+
+        # Convertir a modelo Pydantic
+        result = DailyGeneralOperationsResponse(**data)
+
+        logger.info(f"Vista 1 obtenida exitosamente para {target_date}")
+        return json_response(result.model_dump(mode="json", by_alias=True), response)
+
+    except Exception as e:
+        logger.error(f"Error obteniendo Vista 1 para {fecha}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error interno del servidor al obtener datos del día {fecha}"
+        )
+
+
+def _log_vista2_structure(target_date: date, data: Dict[str, Any]) -> None:
+    """Registrar claves y primeras filas de la Vista 2 (diagnóstico)"""
+    operations = data.get('operaciones') or []
+    logger.debug("Vista 2 %s: claves %s, %d operaciones", target_date, list(data.keys()), len(operations))
+    for i, op in enumerate(operations[:2]):
+        logger.debug("  Operación %d: %s (claves %s)", i, op.get('cliente_operacion'), list(op.keys()))
+        if op.get('incidencias'):
+            logger.debug("    Primera incidencia: %s", op['incidencias'][0])
+        if op.get('movimientos'):
+            logger.debug("    Primer movimiento: %s", op['movimientos'][0])
+
+
+@router.get(
+    "/daily-detailed-operations",
+    response_model=DailyDetailedOperationsResponse,
+    summary="Vista 2: Detalle Diario por Operaciones",
+    description="Obtener datos desglosados por cada operación para un día específico"
+)
+async def get_daily_detailed_operations(
+    request: Request,
+    response: Response,
+    fecha: Optional[date] = None,
+    views=Depends(get_operations_views)
+) -> DailyDetailedOperationsResponse:
+    """
+    Vista 2: Detalle Diario por Operaciones
+
+    Obtiene datos desglosados POR CADA operación para un día específico:
+    - Horas diarias de cada operación individual
+    - Personal staff y base de cada operación
+    - Incidencias específicas de cada operación
+    - Movimientos específicos de cada operación
+    - Hechos relevantes específicos de cada operación
+
+    Args:
+        fecha: Fecha específica (por defecto: hoy)
+
+    Returns:
+        DailyDetailedOperationsResponse: Datos desglosados por operación
+    """
+    try:
+        # Si no se especifica fecha, usar hoy
+        target_date = fecha or date.today()
+
+        # Obtener datos desglosados por operación
+        cache_key = response_cache.make_key("vista2", fecha=target_date)
+        tags = date_range_tags(target_date, target_date)
+        not_modified = conditional_get(request, response, cache_key, tags)
+        if not_modified:
+            return not_modified
+
+        data = response_cache.get_or_set(
+            cache_key,
+            lambda: views.get_daily_detailed_operations(target_date),
+            tags=tags
+        )
+
+        # Estructura de los datos (incluye nombres de empleados): solo en DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            _log_vista2_structure(target_date, data)
+
+        # Try to create the Pydantic model and catch specific errors
+        try:
+            result = DailyDetailedOperationsResponse(**data)
+            logger.debug("Vista 2 obtenida para %s", target_date)
+            return json_response(result.model_dump(mode="json", by_alias=True), response)
+        except Exception as pydantic_error:
+            logger.error(f"PYDANTIC VALIDATION ERROR: {pydantic_error}")
+            # Return raw data temporarily to bypass validation
+            return data
+
+    except Exception as e:
+        logger.error(f"Error obteniendo Vista 2 para {fecha}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error interno del servidor al obtener detalle por operaciones del día {fecha}"
+        )
+
+
+@router.get(
+    "/accumulated-general-operations",
+    response_model=AccumulatedGeneralOperationsResponse,
+    summary="Vista 3: Operación General Acumulado",
+    description="Obtener datos consolidados de todas las operaciones para un período específico"
+)
+async def get_accumulated_general_operations(
+    request: Request,
+    response: Response,
+    fecha_inicio: Optional[date] = None,
+    fecha_fin: Optional[date] = None,
+    views=Depends(get_operations_views)
+) -> AccumulatedGeneralOperationsResponse:
+    """
+    Vista 3: Operación General Acumulado
+
+    Obtiene datos CONSOLIDADOS de todas las operaciones para un período:
+    - Promedio de horas diarias del período
+    - Suma total de personal staff y base
+    - Lista consolidada de incidencias de todas las operaciones
+    - Lista consolidada de movimientos de todas las operaciones
+    - Lista consolidada de hechos relevantes de todas las operaciones
+    - Por defecto muestra "última semana" (lunes a día actual)
+
+    Args:
+        fecha_inicio: Fecha de inicio del período (por defecto: lunes de esta semana)
+        fecha_fin: Fecha de fin del período (por defecto: día actual)
+
+    Returns:
+        AccumulatedGeneralOperationsResponse: Datos consolidados del período
+    """
+    try:
+        # Obtener datos acumulados del período
+        inicio, fin = _resolve_period(fecha_inicio, fecha_fin)
+        cache_key = response_cache.make_key("vista3", fecha_inicio=inicio, fecha_fin=fin)
+        tags = date_range_tags(inicio, fin)
+        not_modified = conditional_get(request, response, cache_key, tags)
+        if not_modified:
+            return not_modified
+
+        data = response_cache.get_or_set(
+            cache_key,
+            lambda: views.get_accumulated_general_operations(inicio, fin),
+            tags=tags
+        )
+
+        # Convertir a modelo Pydantic
+        result = AccumulatedGeneralOperationsResponse(**data)
+
+        logger.info(f"Vista 3 obtenida exitosamente para período {result.fecha_inicio} - {result.fecha_fin}")
+        return json_response(result.model_dump(mode="json", by_alias=True), response)
+
+    except Exception as e:
+        logger.error(f"Error obteniendo Vista 3 para período {fecha_inicio} - {fecha_fin}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error interno del servidor al obtener operación general acumulada para período {fecha_inicio} - {fecha_fin}"
+        )
+
+
+@router.get(
+    "/accumulated-detailed-operations",
+    response_model=AccumulatedDetailedOperationsResponse,
+    summary="Vista 4: Detalle Acumulado por Operaciones",
+    description="Obtener datos desglosados por cada operación para un período específico con promedios"
+)
+async def get_accumulated_detailed_operations(
+    request: Request,
+    response: Response,
+    fecha_inicio: Optional[date] = None,
+    fecha_fin: Optional[date] = None,
+    views=Depends(get_operations_views)
+) -> AccumulatedDetailedOperationsResponse:
+    """
+    Vista 4: Detalle Acumulado por Operaciones
+
+    Obtiene datos DESGLOSADOS por cada operación individual para un período:
+    - Promedio de horas diarias del período para cada operación
+    - Promedio de personal staff y base para cada operación
+    - Lista completa de incidencias por operación del período
+    - Lista completa de movimientos por operación del período
+    - Lista completa de hechos relevantes por operación del período
+    - Por defecto muestra "última semana" (lunes a día actual)
+
+    Args:
+        fecha_inicio: Fecha de inicio del período (por defecto: lunes de esta semana)
+        fecha_fin: Fecha de fin del período (por defecto: día actual)
+
+    Returns:
+        AccumulatedDetailedOperationsResponse: Datos desglosados por operación para el período
+    """
+    try:
+        # Obtener datos acumulados desglosados por operación
+        inicio, fin = _resolve_period(fecha_inicio, fecha_fin)
+        cache_key = response_cache.make_key("vista4", fecha_inicio=inicio, fecha_fin=fin)
+        tags = date_range_tags(inicio, fin)
+        not_modified = conditional_get(request, response, cache_key, tags)
+        if not_modified:
+            return not_modified
+
+        data = response_cache.get_or_set(
+            cache_key,
+            lambda: views.get_accumulated_detailed_operations(inicio, fin),
+            tags=tags
+        )
+
+        # Convertir a modelo Pydantic
+        result = AccumulatedDetailedOperationsResponse(**data)
+
+        logger.info(f"Vista 4 obtenida exitosamente para período {result.fecha_inicio} - {result.fecha_fin}")
+        return json_response(result.model_dump(mode="json", by_alias=True), response)
+
+    except Exception as e:
+        logger.error(f"Error obteniendo Vista 4 para período {fecha_inicio} - {fecha_fin}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error interno del servidor al obtener detalle acumulado por operaciones para período {fecha_inicio} - {fecha_fin}"
+        )
+
+
+@router.get(
+    "/export",
+    summary="Exportar datos filtrados",
+    description="Exportar datos filtrados en Excel/CSV (placeholder)"
+)
+async def export_data(
+    administrador: Optional[str] = None,
+    cliente: Optional[str] = None,
+    fecha_inicio: Optional[date] = None,
+    fecha_fin: Optional[date] = None,
+    formato: str = "excel",
+    excel=Depends(get_excel_handler)
+):
+    """
+    Exportar datos filtrados
+
+    TODO: Implementar exportacion real de archivos
+    Por ahora retorna informacion sobre que se exportaria
+    """
+    try:
+        # Por ahora, solo retornamos un placeholder
+        filters = {
+            "administrador": administrador,
+            "cliente": cliente,
+            "fecha_inicio": fecha_inicio,
+            "fecha_fin": fecha_fin,
+            "formato": formato
+        }
+
+        # Obtener datos que se exportarian
+        reports = excel.get_all_reports(filters)
+
+        return APIResponse(
+            success=True,
+            message=f"Se exportarian {len(reports)} reportes en formato {formato}",
+            data={
+                "cantidad_reportes": len(reports),
+                "filtros_aplicados": filters,
+                "nota": "Funcionalidad de exportacion en desarrollo"
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Error en exportacion: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor en exportacion"
+        )
+
+
+@router.get(
+    "/outbox",
+    summary="Estado del outbox Excel -> PostgreSQL",
+    description="Entradas pendientes, aplicadas y descartadas del dual-write asíncrono"
+)
+async def get_outbox_status():
+    """Obtener el estado del outbox de escrituras hacia PostgreSQL"""
+    try:
+        return APIResponse(
+            success=True,
+            message="Estado del outbox obtenido exitosamente",
+            data=outbox.get_stats()
+        )
+    except Exception as e:
+        logger.error(f"Error obteniendo estado del outbox: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor al obtener estado del outbox"
+        )
+
+
+@router.post(
+    "/outbox/retry",
+    summary="Reintentar entradas descartadas del outbox",
+    description="Vuelve a encolar las entradas que agotaron sus reintentos"
+)
+async def retry_outbox_dead_entries():
+    """Reintentar entradas del outbox marcadas como descartadas"""
+    try:
+        retried = outbox.retry_dead()
+        logger.info(f"Outbox: {retried} entradas descartadas reencoladas")
+        return APIResponse(
+            success=True,
+            message=f"{retried} entradas reencoladas",
+            data={"reencoladas": retried}
+        )
+    except Exception as e:
+        logger.error(f"Error reintentando entradas del outbox: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor al reintentar el outbox"
+        )
+
+
+@router.get(
+    "/cache",
+    summary="Estadísticas del cache de respuestas",
+    description="Tasa de acierto, entradas y memoria del cache de endpoints de lectura"
+)
+async def get_cache_stats():
+    """Obtener estadísticas del cache de respuestas"""
+    try:
+        return APIResponse(
+            success=True,
+            message="Estadísticas del cache obtenidas exitosamente",
+            data=response_cache.get_stats()
+        )
+    except Exception as e:
+        logger.error(f"Error obteniendo estadísticas del cache: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor al obtener estadísticas del cache"
+        )
+
+
+# DEBUG ENDPOINT - TEMPORAL
+@router.get(
+    "/debug-daily-detailed-operations",
+    summary="DEBUG: Vista 2 sin validación Pydantic",
+    description="Endpoint de debug temporal"
+)
+async def debug_daily_detailed_operations(
+    fecha: Optional[date] = None,
+    excel=Depends(get_excel_handler)
+):
+    """DEBUG: Obtener datos crudos sin validación Pydantic"""
+    try:
+        target_date = fecha or date.today()
+        data = excel.get_daily_detailed_operations(target_date)
+        return data
+    except Exception as e:
+        logger.error(f"DEBUG Error: {e}")
+        return {"error": str(e)}
@@ -10,11 +10,11 @@ from typing import Optional
 from datetime import datetime
 from loguru import logger
 
-from database.connection import get_db
-from database.models import User, AuditLog
+from ..database.connection import get_db
+from ..database.models import User, AuditLog
 from .jwt_handler import jwt_handler, get_current_user_dependency
-from security.encryption import field_encryptor
-from middleware.rate_limiter import RateLimits, apply_rate_limit
+from ..security.encryption import field_encryptor
+from ..middleware.rate_limiter import RateLimits, apply_rate_limit
 import json
 
 # Router para autenticación
@@ -51,6 +51,14 @@ class ChangePasswordRequest(BaseModel):
     current_password: str
     new_password: str
 
+
+def login_user_query(db: Session, identifier: str):
+    """Consulta del usuario por username o email (login; ver benchmarks/query_plans.py)"""
+    return db.query(User).filter(
+        (User.username == identifier) |
+        (User.email == identifier)
+    )
+
 @router.post("/login", response_model=LoginResponse)
 @apply_rate_limit(RateLimits.LOGIN)
 async def login(
@@ -73,10 +81,7 @@ async def login(
     """
     try:
         # Buscar usuario por username o email
-        user = db.query(User).filter(
-            (User.username == form_data.username) |
-            (User.email == form_data.username)
-        ).first()
+        user = login_user_query(db, form_data.username).first()
 
         if not user:
             # Log intento fallido
@@ -401,7 +406,6 @@ async def get_user_operations(
         operations = []
         if user.client_operations:
             # Si client_operations es un array JSON
-            import json
             if isinstance(user.client_operations, str):
                 operations = json.loads(user.client_operations)
             elif isinstance(user.client_operations, list):
@@ -68,11 +68,49 @@ class Settings(BaseSettings):
     rate_limit_per_minute: int = 60
     rate_limit_per_hour: int = 1000
     
+    # Compresion de respuestas (bytes minimos y nivel gzip 1-9)
+    gzip_minimum_size: int = 1024
+    gzip_compress_level: int = 6
+    
+    # Metricas Prometheus en /metrics (token opcional: Authorization: Bearer)
+    metrics_enabled: bool = True
+    metrics_token: str = ""
+    
+    # Sondas de /health/ready (resultado cacheado, refrescado en segundo plano)
+    health_probe_interval_seconds: int = 15
+    health_probe_timeout_seconds: int = 3
+
+    # Perfilado por request (X-Profile / ?profile=1, solo administradores)
+    profiling_enabled: bool = True
+    
+    # Cache de respuestas del area admin (Redis si REDIS_URL esta definido)
+    cache_enabled: bool = True
+    cache_ttl_seconds: int = 300
+    cache_max_entries: int = 512
+    cache_max_memory_mb: int = 64
+
+    # Fuente de las vistas 1-4: "excel", "postgres" o "shadow" (responde con
+    # Excel y compara con PostgreSQL en una muestra de requests)
+    operations_views_source: str = "excel"
+    operations_shadow_sample_rate: float = 0.1
+
+    # Particiones mensuales (ver src/database/partitions.py): meses futuros
+    # que se crean por adelantado y cada cuánto se revisan
+    partition_months_ahead: int = 3
+    partition_maintenance_interval_hours: float = 24
+    
     # Logging
     log_level: str = "INFO"
     log_format: str = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}"
     log_file: str = "admin_daily_report.log"
-    
+    # Logs en JSON por una cola (el request no espera la escritura)
+    log_json: bool = True
+    # Rutas de alto volumen (prefijos) cuyo log de acceso se muestrea;
+    # los errores y los requests lentos se registran siempre
+    log_sampled_paths: List[str] = ["/health", "/metrics", "/api/v1/reportes/admin/"]
+    log_sample_rate: float = 0.1
+    log_slow_request_ms: int = 1000
+
     # Timezone
     timezone: str = "America/Bogota"
     
@@ -6,9 +6,17 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import NullPool
 import os
+import time
 from typing import Generator
 from loguru import logger
 
+try:
+    from ..utils.request_context import get_current_route
+except ImportError:
+    # Importado como `database.connection` desde los scripts
+    def get_current_route():
+        return None
+
 # Construir URL de base de datos desde variables de entorno
 def get_database_url() -> str:
     """Construir URL de conexión a PostgreSQL desde variables de entorno"""
@@ -65,6 +73,35 @@ def receive_close(dbapi_conn, connection_record):
     """Log cuando se cierra una conexión"""
     logger.debug("Database connection closed")
 
+# Log de consultas lentas (SLOW_QUERY_THRESHOLD_MS <= 0 lo desactiva)
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_MAX_CHARS = 1000
+
+if SLOW_QUERY_THRESHOLD_MS > 0:
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """Marcar el inicio de la consulta"""
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        """Registrar la consulta si supera el umbral"""
+        start_times = conn.info.get("query_start_time")
+        if not start_times:
+            return
+        elapsed_ms = (time.perf_counter() - start_times.pop()) * 1000
+        if elapsed_ms < SLOW_QUERY_THRESHOLD_MS:
+            return
+
+        params = repr(parameters)
+        if len(params) > SLOW_QUERY_MAX_CHARS:
+            params = params[:SLOW_QUERY_MAX_CHARS] + "..."
+        logger.warning(
+            f"Slow query ({elapsed_ms:.1f} ms) route={get_current_route() or '-'}"
+            f"{' executemany' if executemany else ''}: "
+            f"{' '.join(statement.split())[:SLOW_QUERY_MAX_CHARS]} | params={params}"
+        )
+
 # Crear SessionLocal class
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -104,6 +141,10 @@ def init_db():
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
 
+        # Particiones DEFAULT y de los próximos meses (no hace nada fuera de PostgreSQL)
+        from .partitions import ensure_partitions
+        ensure_partitions(engine)
+
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}")
         raise
@@ -1,7 +1,10 @@
 """
 SQLAlchemy models for PostgreSQL database
 """
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Boolean, Date, Enum, Index
+from sqlalchemy import (
+    Column, String, Integer, Float, DateTime, ForeignKey, ForeignKeyConstraint, Text, Boolean, Date, Enum,
+    Index, UniqueConstraint
+)
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -80,19 +83,21 @@ class Report(Base):
     """Modelo de reporte diario"""
     __tablename__ = "reports"
     __table_args__ = (
-        Index('idx_report_date_admin', 'report_date', 'administrator'),
         Index('idx_report_date_client', 'report_date', 'client_operation'),
         Index('idx_report_status_date', 'status', 'report_date'),
-        {'schema': 'reports'}
+        Index('idx_report_updated_at_id', 'updated_at', 'id'),  # Sincronización incremental
+        # En una tabla particionada las claves únicas incluyen la columna de partición
+        UniqueConstraint('legacy_id', 'report_date', name='uq_reports_legacy_id_date'),
+        {'schema': 'reports', 'postgresql_partition_by': 'RANGE (report_date)'}
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    legacy_id = Column(String(100), unique=True, index=True)  # Para mantener IDs del sistema anterior
+    legacy_id = Column(String(100), index=True)  # Para mantener IDs del sistema anterior
     user_id = Column(UUID(as_uuid=True), ForeignKey("reports.users.id", ondelete="CASCADE"))
 
     # Información del reporte
-    administrator = Column(String(255), nullable=False, index=True)
-    client_operation = Column(String(255), nullable=False, index=True)
+    administrator = Column(String(255), nullable=False)
+    client_operation = Column(String(255), nullable=False)
     daily_hours = Column(Float, nullable=False)
     staff_personnel = Column(Integer, nullable=False)
     base_personnel = Column(Integer, nullable=False)
@@ -100,7 +105,7 @@ class Report(Base):
     status = Column(Enum(ReportStatus), default=ReportStatus.completed)
 
     # Metadatos
-    report_date = Column(Date, nullable=False, index=True)
+    report_date = Column(Date, primary_key=True)  # Clave de partición (mensual)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     reviewed_at = Column(DateTime(timezone=True))
@@ -110,6 +115,10 @@ class Report(Base):
     client_ip = Column(String(45))  # IPv6 max length
     user_agent = Column(String(500))
 
+    # Contadores de hijos (triggers en incidents/movements, ver sql/init.sql)
+    incident_count = Column(Integer, nullable=False, server_default="0")
+    movement_count = Column(Integer, nullable=False, server_default="0")
+
     # Relaciones
     user = relationship("User", back_populates="reports", foreign_keys=[user_id])
     reviewer = relationship("User", foreign_keys=[reviewed_by])
@@ -119,17 +128,53 @@ class Report(Base):
     def __repr__(self):
         return f"<Report(id='{self.id}', admin='{self.administrator}', date='{self.report_date}')>"
 
+
+# Índice por fecha de sql/init.sql, con el mismo nombre: create_all y los planes coinciden con producción
+Index('idx_reports_date', Report.report_date.desc())
+# Índices según la forma de las consultas (ver sql/migrations/003_query_indexes.sql):
+# los filtros por administrador y operación comparan lower(columna)
+Index('idx_reports_admin_lower', func.lower(Report.administrator))
+Index('idx_reports_client_lower', func.lower(Report.client_operation))
+Index('idx_reports_date_admin_lower', Report.report_date, func.lower(Report.administrator))
+# Orden del listado y listado filtrado por reportes con incidencias
+Index('idx_reports_created_at_desc', Report.created_at.desc())
+Index('idx_reports_with_incidents', Report.created_at.desc(), postgresql_where=Report.incident_count > 0)
+
+class ReportDeletion(Base):
+    """Reportes eliminados (tombstones para la sincronización incremental del listado)"""
+    __tablename__ = "report_deletions"
+    __table_args__ = (
+        Index('idx_report_deletions_deleted_at', 'deleted_at'),
+        {'schema': 'reports'}
+    )
+
+    report_id = Column(UUID(as_uuid=True), primary_key=True)
+    legacy_id = Column(String(100))
+    administrator = Column(String(255))
+    client_operation = Column(String(255))
+    report_date = Column(Date)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ReportDeletion(report_id='{self.report_id}', deleted_at='{self.deleted_at}')>"
+
 class Incident(Base):
     """Modelo de incidencia de personal"""
     __tablename__ = "incidents"
     __table_args__ = (
         Index('idx_incident_type_date', 'incident_type', 'end_date'),
         Index('idx_incident_employee', 'employee_name'),
-        {'schema': 'reports'}
+        Index('idx_incidents_report', 'report_id'),
+        ForeignKeyConstraint(
+            ['report_id', 'report_date'], ['reports.reports.id', 'reports.reports.report_date'],
+            ondelete='CASCADE', onupdate='CASCADE'
+        ),
+        {'schema': 'reports', 'postgresql_partition_by': 'RANGE (report_date)'}
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    report_id = Column(UUID(as_uuid=True), ForeignKey("reports.reports.id", ondelete="CASCADE"), nullable=False)
+    report_id = Column(UUID(as_uuid=True), nullable=False)
+    report_date = Column(Date, primary_key=True)  # Fecha del reporte: clave de partición
 
     # Información de la incidencia
     incident_type = Column(String(100), nullable=False)  # PostgreSQL valida con su enum
@@ -153,11 +198,17 @@ class Movement(Base):
     __table_args__ = (
         Index('idx_movement_type_date', 'movement_type', 'effective_date'),
         Index('idx_movement_employee', 'employee_name'),
-        {'schema': 'reports'}
+        Index('idx_movements_report', 'report_id'),
+        ForeignKeyConstraint(
+            ['report_id', 'report_date'], ['reports.reports.id', 'reports.reports.report_date'],
+            ondelete='CASCADE', onupdate='CASCADE'
+        ),
+        {'schema': 'reports', 'postgresql_partition_by': 'RANGE (report_date)'}
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    report_id = Column(UUID(as_uuid=True), ForeignKey("reports.reports.id", ondelete="CASCADE"), nullable=False)
+    report_id = Column(UUID(as_uuid=True), nullable=False)
+    report_date = Column(Date, primary_key=True)  # Fecha del reporte: clave de partición
 
     # Información del movimiento
     employee_name = Column(String(255), nullable=False, index=True)
@@ -182,7 +233,8 @@ class AuditLog(Base):
     __table_args__ = (
         Index('idx_audit_action_date', 'action', 'created_at'),
         Index('idx_audit_resource', 'resource_type', 'resource_id'),
-        {'schema': 'reports'}
+        Index('idx_audit_created_brin', 'created_at', postgresql_using='brin'),  # Tabla de solo inserción
+        {'schema': 'reports', 'postgresql_partition_by': 'RANGE (created_at)'}
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -198,8 +250,8 @@ class AuditLog(Base):
     client_ip = Column(String(45))
     user_agent = Column(String(500))
 
-    # Timestamp
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Timestamp (clave de partición)
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
 
     # Relaciones
     user = relationship("User", back_populates="audit_logs")
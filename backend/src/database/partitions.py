@@ -0,0 +1,187 @@
+"""
+Particiones mensuales de reports, incidents, movements y audit_logs
+
+Las tablas están particionadas por rango (mes) sobre report_date
+(created_at en audit_logs), ver sql/migrations/004_partitioning.sql. Cada
+tabla tiene una partición DEFAULT que recibe las filas sin partición
+mensual, y este módulo:
+- crea las particiones de los próximos meses (al arrancar la API y luego
+  periódicamente, o con scripts/manage_partitions.py)
+- desprende (DETACH) las particiones de un mes para archivarlas: quedan como
+  tablas independientes que se pueden volcar con pg_dump y eliminar
+
+Sobre una base no particionada (migración 004 sin aplicar, SQLite) no hace nada.
+"""
+import asyncio
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from loguru import logger
+
+try:
+    from ..config import settings
+except ImportError:
+    # Importado como `database.partitions` desde los scripts
+    from config import settings
+
+SCHEMA = "reports"
+
+# Tabla particionada -> columna de partición
+PARTITIONED_TABLES: Dict[str, str] = {
+    "reports": "report_date",
+    "incidents": "report_date",
+    "movements": "report_date",
+    "audit_logs": "created_at",
+}
+
+# Orden para desprender un mes: primero las tablas que referencian a reports
+DETACH_ORDER = ["incidents", "movements", "reports", "audit_logs"]
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Primer día del mes `months` meses después (o antes) del de `value`"""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def _bound(table: str, month: date) -> str:
+    """Límite del rango: fecha, o medianoche local para columnas timestamptz"""
+    if PARTITIONED_TABLES[table] == "created_at":
+        return f"'{month.isoformat()} 00:00:00 {settings.timezone}'"
+    return f"'{month.isoformat()}'"
+
+
+def is_partitioned(conn, table: str) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(
+        text("""
+            SELECT 1 FROM pg_partitioned_table p
+            JOIN pg_class c ON c.oid = p.partrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = :schema AND c.relname = :table
+        """),
+        {"schema": SCHEMA, "table": table}
+    ).scalar())
+
+
+def list_partitions(conn, table: str) -> List[str]:
+    """Particiones adjuntas de una tabla"""
+    rows = conn.execute(
+        text("""
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:parent AS regclass)
+            ORDER BY c.relname
+        """),
+        {"parent": f"{SCHEMA}.{table}"}
+    )
+    return [row[0] for row in rows]
+
+
+def ensure_partitions(engine, months_ahead: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+    """
+    Crear la partición DEFAULT y las mensuales del mes actual y los próximos
+
+    Cada partición se crea en su propia transacción: si la DEFAULT ya tiene
+    filas de ese mes PostgreSQL rechaza la creación, se registra y se sigue
+    (hay que mover esas filas a mano, ver scripts/manage_partitions.py).
+
+    Returns:
+        Nombres de las particiones creadas
+    """
+    months_ahead = settings.partition_months_ahead if months_ahead is None else months_ahead
+    current = month_start(today or date.today())
+    created = []
+
+    for table in PARTITIONED_TABLES:
+        with engine.connect() as conn:
+            if not is_partitioned(conn, table):
+                continue
+            existing = set(list_partitions(conn, table))
+
+        pending = []
+        if f"{table}_default" not in existing:
+            pending.append((
+                f"{table}_default",
+                f"CREATE TABLE IF NOT EXISTS {SCHEMA}.{table}_default PARTITION OF {SCHEMA}.{table} DEFAULT"
+            ))
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(table, month)
+            if name not in existing:
+                pending.append((
+                    name,
+                    f"CREATE TABLE IF NOT EXISTS {SCHEMA}.{name} PARTITION OF {SCHEMA}.{table} "
+                    f"FOR VALUES FROM ({_bound(table, month)}) TO ({_bound(table, add_months(month, 1))})"
+                ))
+
+        for name, ddl in pending:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(ddl))
+                created.append(name)
+            except Exception as e:
+                logger.warning(f"No se pudo crear la partición {SCHEMA}.{name}: {e}")
+
+    if created:
+        logger.info(f"Particiones creadas: {', '.join(created)}")
+    return created
+
+
+def detach_month(engine, month: date, tables: Optional[List[str]] = None) -> List[str]:
+    """
+    Desprender las particiones de un mes (archivo o retención)
+
+    Las tablas hijas se desprenden antes que reports y pierden su clave
+    foránea (el archivo de un mes queda autocontenido).
+    No se usa DETACH ... CONCURRENTLY: PostgreSQL no lo permite en tablas
+    con partición DEFAULT. El bloqueo es breve (no se mueven filas).
+
+    Returns:
+        Nombres de las particiones desprendidas (tablas independientes)
+    """
+    month = month_start(month)
+    detached = []
+    for table in [t for t in DETACH_ORDER if tables is None or t in tables]:
+        name = partition_name(table, month)
+        with engine.connect() as conn:
+            if not is_partitioned(conn, table) or name not in list_partitions(conn, table):
+                continue
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {SCHEMA}.{table} DETACH PARTITION {SCHEMA}.{name}"))
+            # La tabla desprendida conserva la FK hacia reports, que impediría
+            # desprender después la partición de reports del mismo mes
+            foreign_keys = conn.execute(
+                text("""
+                    SELECT conname FROM pg_constraint
+                    WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'
+                      AND confrelid = CAST(:parent AS regclass)
+                """),
+                {"table": f"{SCHEMA}.{name}", "parent": f"{SCHEMA}.reports"}
+            ).scalars().all()
+            for constraint in foreign_keys:
+                conn.execute(text(f'ALTER TABLE {SCHEMA}.{name} DROP CONSTRAINT "{constraint}"'))
+        detached.append(name)
+        logger.info(f"Partición desprendida: {SCHEMA}.{name}")
+    return detached
+
+
+async def run_partition_maintenance(engine, interval_hours: Optional[float] = None):
+    """Crear particiones al arrancar y luego cada `interval_hours` (tarea de la API)"""
+    interval = (interval_hours or settings.partition_maintenance_interval_hours) * 3600
+    while True:
+        try:
+            await asyncio.to_thread(ensure_partitions, engine)
+        except Exception as e:
+            logger.error(f"Error en el mantenimiento de particiones: {e}")
+        await asyncio.sleep(interval)
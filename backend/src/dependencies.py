@@ -0,0 +1,35 @@
+"""
+Dependencias compartidas de FastAPI
+
+Se resuelven una vez por request a partir de singletons creados al arrancar
+(engine de SQLAlchemy, manejador de Excel), en lugar de importar modulos y
+construir objetos dentro de cada handler.
+"""
+from typing import Dict
+
+from fastapi import Request
+
+
+def get_excel_handler():
+    """
+    Obtener el manejador de Excel
+
+    El modulo excel_handler (openpyxl, pandas, numpy) se importa en el primer
+    uso y no al cargar la API, para que el arranque del proceso sea rapido.
+    """
+    from .excel_handler import get_excel_handler as _get_excel_handler
+    return _get_excel_handler()
+
+
+def get_operations_views():
+    """Obtener la fuente de las vistas 1-4 (Excel, PostgreSQL o shadow)"""
+    from .services.operations_service import get_operations_views as _get_operations_views
+    return _get_operations_views()
+
+
+def get_client_info(request: Request) -> Dict[str, str]:
+    """Obtener informacion del cliente para auditoria"""
+    return {
+        "ip": request.client.host if request.client else "Unknown",
+        "user_agent": request.headers.get("user-agent", "Unknown")
+    }
@@ -12,6 +12,7 @@ from typing import Dict, Any, Tuple, List
 from datetime import datetime, date, time
 import asyncio
 from .config import settings
+from .middleware.metrics import observe_smtp
 
 class EmailService:
     def __init__(self):
@@ -86,7 +87,7 @@ class EmailService:
             msg.attach(MIMEText(html_content, 'html'))
             
             # Enviar correo
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            with observe_smtp(), smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
                 server.starttls()
                 server.login(self.sender_email, self.sender_password)
                 server.send_message(msg)
@@ -343,7 +344,7 @@ class EmailService:
                 msg.attach(MIMEText(html_content, 'html'))
                 
                 # Enviar
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+                with observe_smtp(), smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
                     server.starttls()
                     server.login(self.sender_email, self.sender_password)
                     server.send_message(msg)
@@ -2,29 +2,97 @@
 Manejador de archivos Excel para el sistema de reportes diarios
 Implementa la estructura de BD especificada en el README
 """
+import logging
 import os
 import uuid
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
+import threading
 import pytz
 
 import openpyxl
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill
-from openpyxl.utils.dataframe import dataframe_to_rows
-import pandas as pd
 
 from .config import settings, EXCEL_SCHEMA
 from .models import DailyReportCreate, DailyReportResponse, IncidentResponse, MovementResponse
+from .utils.date_utils import BOGOTA_TZ, get_bogota_now
+from .middleware.metrics import track_excel
 
-# Timezone de Bogotá (GMT-5)
-BOGOTA_TZ = pytz.timezone('America/Bogota')
+logger = logging.getLogger(__name__)
 
-def get_bogota_now() -> datetime:
-    """Obtiene la fecha y hora actual en timezone de Bogotá (sin timezone para Excel)"""
-    # Excel no soporta timezones, convertir a naive datetime
-    return datetime.now(BOGOTA_TZ).replace(tzinfo=None)
+# NOTA: pandas se importa dentro de los metodos que lo usan para no cargarlo
+# (junto con numpy) en cada arranque del proceso
+
+# Campos de las listas "con origen" de las vistas acumuladas:
+# clave de salida -> (columna de la hoja, valor si la columna no existe)
+INCIDENT_ORIGIN_FIELDS = {
+    "tipo": ("Tipo_Incidencia", "No especificado"),
+    "nombre_empleado": ("Nombre_Empleado", "No especificado"),
+    "fecha_fin": ("Fecha_Fin_Novedad", "No especificada"),
+}
+MOVEMENT_ORIGIN_FIELDS = {
+    "nombre_empleado": ("Nombre_Empleado", "No especificado"),
+    "cargo": ("Cargo", "No especificado"),
+    "estado": ("Estado", "No especificado"),
+}
+
+
+def _attach_report_origin(children, reports):
+    """
+    Agregar Administrador y Cliente_Operacion del reporte padre con un solo join
+
+    Conserva el orden de `children` y, si un ID de reporte está repetido, usa
+    la primera fila (como el antiguo `.iloc[0]`).
+    """
+    parents = (
+        reports[['ID', 'Administrador', 'Cliente_Operacion']]
+        .drop_duplicates('ID')
+        .rename(columns={'ID': 'ID_Reporte'})
+    )
+    return children.merge(parents, on='ID_Reporte', how='inner', validate='many_to_one')
+
+
+def _isoformat_column(values, fallback: str) -> List[str]:
+    """Fechas de una columna en ISO 8601; `fallback` para las vacías"""
+    import pandas as pd
+
+    return pd.to_datetime(values).dt.strftime('%Y-%m-%dT%H:%M:%S').fillna(fallback).tolist()
+
+
+def _records_with_origin(frame, fields: Dict[str, Tuple[str, Any]], now_iso: str) -> List[Dict[str, Any]]:
+    """Construir la lista de dicts desde columnas completas (sin iterrows)"""
+    if frame.empty:
+        return []
+    size = len(frame)
+    columns = {
+        key: frame[column].tolist() if column in frame.columns else [default] * size
+        for key, (column, default) in fields.items()
+    }
+    columns["administrador"] = frame['Administrador'].tolist()
+    columns["cliente_operacion"] = frame['Cliente_Operacion'].tolist()
+    columns["fecha_registro"] = _isoformat_column(frame['Fecha_Registro'], now_iso)
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
+def _relevant_facts_with_origin(reports, now_iso: str) -> List[Dict[str, Any]]:
+    """Hechos relevantes no vacíos de los reportes, con su origen"""
+    facts = reports['Hechos_Relevantes']
+    stripped = facts.astype(str).str.strip()
+    selected = reports[facts.notna() & (stripped != '')]
+    if selected.empty:
+        return []
+    return [
+        {"hecho": hecho, "administrador": admin, "cliente_operacion": operacion, "fecha_registro": fecha}
+        for hecho, admin, operacion, fecha in zip(
+            stripped[selected.index].tolist(),
+            selected['Administrador'].tolist(),
+            selected['Cliente_Operacion'].tolist(),
+            _isoformat_column(selected['Fecha_Creacion'], now_iso),
+        )
+    ]
 
 
 class ExcelHandler:
@@ -33,14 +101,25 @@ class ExcelHandler:
     def __init__(self, file_path: Optional[Path] = None):
         self.file_path = file_path or settings.excel_file_path
         self.sheets = settings.excel_sheets
-        self._ensure_file_exists()
-        
+        # La validacion del libro se hace fuera del import (ver ensure_ready)
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    def ensure_ready(self) -> None:
+        """Validar (una sola vez) que el archivo Excel exista con la estructura correcta"""
+        if self._ready:
+            return
+        with self._ready_lock:
+            if not self._ready:
+                self._ensure_file_exists()
+
     def _ensure_file_exists(self) -> None:
         """Crear el archivo Excel y sus hojas si no existe"""
         if not self.file_path.exists():
             self._create_initial_file()
         else:
             self._validate_structure()
+        self._ready = True
     
     def _create_initial_file(self) -> None:
         """Crear archivo Excel inicial con la estructura correcta"""
@@ -61,7 +140,7 @@ class ExcelHandler:
         
         # Guardar archivo
         workbook.save(self.file_path)
-        print(f"Archivo Excel creado: {self.file_path}")
+        logger.info(f"Archivo Excel creado: {self.file_path}")
     
     def _setup_sheet_headers(self, worksheet, sheet_key: str) -> None:
         """Configurar encabezados y estilos de una hoja"""
@@ -116,14 +195,17 @@ class ExcelHandler:
     def _validate_structure(self) -> None:
         """Validar que el archivo Excel tenga la estructura correcta"""
         try:
-            workbook = openpyxl.load_workbook(self.file_path)
-            required_sheets = set(self.sheets.values())
+            # Modo read_only: solo lee el indice de hojas, no el contenido
+            workbook = openpyxl.load_workbook(self.file_path, read_only=True)
             existing_sheets = set(workbook.sheetnames)
+            workbook.close()
+            required_sheets = set(self.sheets.values())
             
             # Verificar que todas las hojas requeridas existan
             missing_sheets = required_sheets - existing_sheets
             if missing_sheets:
-                print(f"Advertencia: Faltan hojas en Excel: {missing_sheets}")
+                logger.warning(f"Advertencia: Faltan hojas en Excel: {missing_sheets}")
+                workbook = openpyxl.load_workbook(self.file_path)
                 # Agregar hojas faltantes
                 for sheet_name in missing_sheets:
                     sheet_key = next(k for k, v in self.sheets.items() if v == sheet_name)
@@ -133,7 +215,7 @@ class ExcelHandler:
                 workbook.save(self.file_path)
                 
         except Exception as e:
-            print(f"Error validando estructura Excel: {e}")
+            logger.error(f"Error validando estructura Excel: {e}")
             # Si hay problemas, recrear el archivo
             self._create_initial_file()
     
@@ -157,7 +239,7 @@ class ExcelHandler:
         try:
             # Crear backup antes de modificar
             if not self.backup_file():
-                print("Advertencia: No se pudo crear backup antes de arreglar duplicados")
+                logger.warning("Advertencia: No se pudo crear backup antes de arreglar duplicados")
             
             workbook = openpyxl.load_workbook(self.file_path)
             reportes_sheet = workbook[self.sheets["reportes"]]
@@ -172,13 +254,13 @@ class ExcelHandler:
                     if current_id in ids_found:
                         # ID duplicado encontrado
                         rows_to_update.append(row_num)
-                        print(f"ID duplicado encontrado: {current_id} en fila {row_num}")
+                        logger.debug("ID duplicado encontrado: %s en fila %s", current_id, row_num)
                     else:
                         ids_found[current_id] = row_num
             
             # Generar nuevos IDs para duplicados
             if rows_to_update:
-                print(f"Actualizando {len(rows_to_update)} IDs duplicados...")
+                logger.info(f"Actualizando {len(rows_to_update)} IDs duplicados...")
                 
                 for row_num in rows_to_update:
                     old_id = reportes_sheet.cell(row=row_num, column=1).value
@@ -186,7 +268,7 @@ class ExcelHandler:
                     
                     # Actualizar ID en hoja principal
                     reportes_sheet.cell(row=row_num, column=1).value = new_id
-                    print(f"Fila {row_num}: {old_id} -> {new_id}")
+                    logger.debug("Fila %s: %s -> %s", row_num, old_id, new_id)
                     
                     # Actualizar referencias en hojas relacionadas
                     self._update_id_references(workbook, old_id, new_id)
@@ -197,15 +279,15 @@ class ExcelHandler:
                 
                 # Guardar cambios
                 workbook.save(self.file_path)
-                print(f"✅ IDs duplicados corregidos. {len(rows_to_update)} registros actualizados.")
+                logger.info(f"IDs duplicados corregidos. {len(rows_to_update)} registros actualizados.")
             else:
-                print("✅ No se encontraron IDs duplicados.")
+                logger.info("No se encontraron IDs duplicados.")
             
             workbook.close()
             return True
             
         except Exception as e:
-            print(f"Error arreglando IDs duplicados: {e}")
+            logger.error(f"Error arreglando IDs duplicados: {e}")
             try:
                 workbook.close()
             except:
@@ -228,9 +310,11 @@ class ExcelHandler:
                 if row[0].value == old_id:
                     row[0].value = new_id
     
+    @track_excel("write")
     def save_report(self, report: DailyReportCreate, client_info: Dict[str, str]) -> DailyReportResponse:
         """Guardar reporte completo en Excel"""
         try:
+            self.ensure_ready()
             report_id = self.generate_report_id()
             timestamp = get_bogota_now()
             
@@ -267,7 +351,7 @@ class ExcelHandler:
             return response
             
         except Exception as e:
-            print(f"Error guardando reporte: {e}")
+            logger.error(f"Error guardando reporte: {e}")
             raise Exception(f"Error al guardar el reporte: {str(e)}")
     
     def _save_main_report(self, report_id: str, report: DailyReportCreate, 
@@ -376,6 +460,7 @@ class ExcelHandler:
         workbook.save(self.file_path)
         return responses
     
+    @track_excel("read")
     def get_reports_by_date(self, target_date: date) -> List[Dict[str, Any]]:
         """Obtener reportes por fecha"""
         try:
@@ -411,9 +496,10 @@ class ExcelHandler:
             return reports
             
         except Exception as e:
-            print(f"Error obteniendo reportes por fecha: {e}")
+            logger.error(f"Error obteniendo reportes por fecha: {e}")
             return []
     
+    @track_excel("read")
     def get_all_reports(self, filters: Optional[Dict] = None) -> List[Dict[str, Any]]:
         """Obtener todos los reportes con filtros opcionales"""
         try:
@@ -439,7 +525,7 @@ class ExcelHandler:
             return reports
             
         except Exception as e:
-            print(f"Error obteniendo reportes: {e}")
+            logger.error(f"Error obteniendo reportes: {e}")
             return []
     
     def _apply_filters(self, report: Dict, filters: Dict) -> bool:
@@ -486,6 +572,7 @@ class ExcelHandler:
             
         return True
     
+    @track_excel("read")
     def get_report_incidents(self, report_id: str) -> List[Dict[str, Any]]:
         """Obtener incidencias de un reporte específico"""
         try:
@@ -513,9 +600,10 @@ class ExcelHandler:
             return incidents
             
         except Exception as e:
-            print(f"Error obteniendo incidencias del reporte {report_id}: {e}")
+            logger.error(f"Error obteniendo incidencias del reporte {report_id}: {e}")
             return []
     
+    @track_excel("read")
     def get_report_movements(self, report_id: str) -> List[Dict[str, Any]]:
         """Obtener movimientos de personal de un reporte específico"""
         try:
@@ -543,9 +631,10 @@ class ExcelHandler:
             return movements
             
         except Exception as e:
-            print(f"Error obteniendo movimientos del reporte {report_id}: {e}")
+            logger.error(f"Error obteniendo movimientos del reporte {report_id}: {e}")
             return []
     
+    @track_excel("read")
     def get_analytics_data(self) -> Dict[str, Any]:
         """Obtener datos para analytics del dashboard"""
         try:
@@ -594,7 +683,7 @@ class ExcelHandler:
             }
             
         except Exception as e:
-            print(f"Error obteniendo analytics: {e}")
+            logger.error(f"Error obteniendo analytics: {e}")
             return {
                 "total_reportes": 0,
                 "reportes_hoy": 0,
@@ -613,13 +702,14 @@ class ExcelHandler:
             
             import shutil
             shutil.copy2(self.file_path, backup_path)
-            print(f"Backup creado: {backup_path}")
+            logger.info(f"Backup creado: {backup_path}")
             return True
             
         except Exception as e:
-            print(f"Error creando backup: {e}")
+            logger.error(f"Error creando backup: {e}")
             return False
     
+    @track_excel("write")
     def delete_report(self, report_id: str) -> bool:
         """
         Eliminar un reporte y sus registros relacionados
@@ -633,7 +723,7 @@ class ExcelHandler:
         try:
             # Crear backup antes de eliminar
             if not self.backup_file():
-                print("Advertencia: No se pudo crear backup antes de eliminar")
+                logger.warning("Advertencia: No se pudo crear backup antes de eliminar")
             
             workbook = openpyxl.load_workbook(self.file_path)
             
@@ -647,13 +737,13 @@ class ExcelHandler:
                     break
             
             if report_row_to_delete is None:
-                print(f"Reporte {report_id} no encontrado en la hoja de reportes")
+                logger.info(f"Reporte {report_id} no encontrado en la hoja de reportes")
                 workbook.close()
                 return False
             
             # Eliminar la fila del reporte
             reportes_sheet.delete_rows(report_row_to_delete, 1)
-            print(f"Reporte {report_id} eliminado de la hoja de reportes")
+            logger.info(f"Reporte {report_id} eliminado de la hoja de reportes")
             
             # Eliminar incidencias relacionadas
             if "incidencias" in self.sheets and self.sheets["incidencias"] in workbook.sheetnames:
@@ -668,7 +758,7 @@ class ExcelHandler:
                 for row_idx in sorted(rows_to_delete, reverse=True):
                     incidencias_sheet.delete_rows(row_idx, 1)
                 
-                print(f"Eliminadas {len(rows_to_delete)} incidencias del reporte {report_id}")
+                logger.info(f"Eliminadas {len(rows_to_delete)} incidencias del reporte {report_id}")
             
             # Eliminar movimientos de personal relacionados
             if "ingresos_retiros" in self.sheets and self.sheets["ingresos_retiros"] in workbook.sheetnames:
@@ -683,23 +773,24 @@ class ExcelHandler:
                 for row_idx in sorted(rows_to_delete, reverse=True):
                     movimientos_sheet.delete_rows(row_idx, 1)
                 
-                print(f"Eliminados {len(rows_to_delete)} movimientos del reporte {report_id}")
+                logger.info(f"Eliminados {len(rows_to_delete)} movimientos del reporte {report_id}")
             
             # Guardar cambios
             workbook.save(self.file_path)
             workbook.close()
             
-            print(f"Reporte {report_id} y todos sus registros relacionados eliminados exitosamente")
+            logger.info(f"Reporte {report_id} y todos sus registros relacionados eliminados exitosamente")
             return True
             
         except Exception as e:
-            print(f"Error eliminando reporte {report_id}: {e}")
+            logger.error(f"Error eliminando reporte {report_id}: {e}")
             try:
                 workbook.close()
             except:
                 pass
             return False
 
+    @track_excel("write")
     def update_report(self, report_id: str, update_data: Dict[str, Any]) -> bool:
         """
         Actualizar un reporte existente
@@ -714,7 +805,7 @@ class ExcelHandler:
         try:
             # Crear backup antes de actualizar
             if not self.backup_file():
-                print("Advertencia: No se pudo crear backup antes de actualizar")
+                logger.warning("Advertencia: No se pudo crear backup antes de actualizar")
             
             workbook = openpyxl.load_workbook(self.file_path)
             
@@ -733,7 +824,7 @@ class ExcelHandler:
                     break
             
             if report_row_to_update is None:
-                print(f"Reporte {report_id} no encontrado en la hoja de reportes")
+                logger.info(f"Reporte {report_id} no encontrado en la hoja de reportes")
                 workbook.close()
                 return False
             
@@ -748,25 +839,26 @@ class ExcelHandler:
                 
                 if column_index is not None:
                     reportes_sheet.cell(row=report_row_to_update, column=column_index).value = new_value
-                    print(f"Actualizado {field_name} = {new_value} en reporte {report_id}")
+                    logger.debug("Actualizado %s = %s en reporte %s", field_name, new_value, report_id)
                 else:
-                    print(f"Campo {field_name} no encontrado en los encabezados")
+                    logger.info(f"Campo {field_name} no encontrado en los encabezados")
             
             # Guardar cambios
             workbook.save(self.file_path)
             workbook.close()
             
-            print(f"Reporte {report_id} actualizado exitosamente")
+            logger.info(f"Reporte {report_id} actualizado exitosamente")
             return True
             
         except Exception as e:
-            print(f"Error actualizando reporte {report_id}: {e}")
+            logger.error(f"Error actualizando reporte {report_id}: {e}")
             try:
                 workbook.close()
             except:
                 pass
             return False
 
+    @track_excel("write")
     def update_report_incidents(self, report_id: str, incidents: List[Any]) -> bool:
         """
         Actualizar las incidencias de un reporte específico
@@ -781,7 +873,7 @@ class ExcelHandler:
         try:
             # Crear backup antes de actualizar
             if not self.backup_file():
-                print("Advertencia: No se pudo crear backup antes de actualizar incidencias")
+                logger.warning("Advertencia: No se pudo crear backup antes de actualizar incidencias")
             
             workbook = openpyxl.load_workbook(self.file_path)
             
@@ -834,7 +926,7 @@ class ExcelHandler:
                     ]
                     incidencias_sheet.append(new_row)
                 
-                print(f"Actualizadas {len(incidents)} incidencias para reporte {report_id}")
+                logger.info(f"Actualizadas {len(incidents)} incidencias para reporte {report_id}")
             
             # Guardar cambios
             workbook.save(self.file_path)
@@ -843,13 +935,14 @@ class ExcelHandler:
             return True
             
         except Exception as e:
-            print(f"Error actualizando incidencias del reporte {report_id}: {e}")
+            logger.error(f"Error actualizando incidencias del reporte {report_id}: {e}")
             try:
                 workbook.close()
             except:
                 pass
             return False
 
+    @track_excel("write")
     def update_report_movements(self, report_id: str, movements: List[Any]) -> bool:
         """
         Actualizar los movimientos de personal de un reporte específico
@@ -864,7 +957,7 @@ class ExcelHandler:
         try:
             # Crear backup antes de actualizar
             if not self.backup_file():
-                print("Advertencia: No se pudo crear backup antes de actualizar movimientos")
+                logger.warning("Advertencia: No se pudo crear backup antes de actualizar movimientos")
             
             workbook = openpyxl.load_workbook(self.file_path)
             
@@ -911,7 +1004,7 @@ class ExcelHandler:
                     ]
                     movimientos_sheet.append(new_row)
                 
-                print(f"Actualizados {len(movements)} movimientos para reporte {report_id}")
+                logger.info(f"Actualizados {len(movements)} movimientos para reporte {report_id}")
             
             # Guardar cambios
             workbook.save(self.file_path)
@@ -920,18 +1013,21 @@ class ExcelHandler:
             return True
             
         except Exception as e:
-            print(f"Error actualizando movimientos del reporte {report_id}: {e}")
+            logger.error(f"Error actualizando movimientos del reporte {report_id}: {e}")
             try:
                 workbook.close()
             except:
                 pass
             return False
 
+    @track_excel("read")
     def get_daily_general_operations(self, target_date: date) -> Dict[str, Any]:
         """
         Obtener datos consolidados de todas las operaciones para un día específico
         Para Vista 1: Operación General Diaria
         """
+        import pandas as pd
+
         try:
             # Obtener todos los reportes del día
             all_reports = self.get_all_reports()
@@ -1050,7 +1146,7 @@ class ExcelHandler:
             }
             
         except Exception as e:
-            print(f"Error obteniendo datos consolidados del día {target_date}: {e}")
+            logger.error(f"Error obteniendo datos consolidados del día {target_date}: {e}")
             return {
                 "fecha": target_date,
                 "periodo_descripcion": f"Error obteniendo datos para {target_date}",
@@ -1066,23 +1162,26 @@ class ExcelHandler:
                 "total_movimientos": 0
             }
 
+    @track_excel("read")
     def get_daily_detailed_operations(self, target_date: date) -> Dict[str, Any]:
         """
         Obtener datos desglosados por cada operación para un día específico
         Para Vista 2: Detalle Diario por Operaciones
         """
-        print(f"FUNCTION START: get_daily_detailed_operations for {target_date}")
+        import pandas as pd
+
+        # Diagnóstico de formatos de fecha: solo con el nivel DEBUG activo
+        debug = logger.isEnabledFor(logging.DEBUG)
         try:
             # Obtener todos los reportes del día
             all_reports = self.get_all_reports()
-            print(f"DEBUG: Total reports in system: {len(all_reports)}")
 
-            # DEBUG: Print sample dates to understand format
-            if all_reports:
-                sample_report = all_reports[0]
-                fecha_creacion = sample_report.get('Fecha_Creacion')
-                print(f"DEBUG: Sample date from Excel: {fecha_creacion} (type: {type(fecha_creacion)})")
-                print(f"DEBUG: Target date: {target_date} (type: {type(target_date)})")
+            if debug and all_reports:
+                fecha_creacion = all_reports[0].get('Fecha_Creacion')
+                logger.debug(
+                    "Vista 2 %s: %d reportes en total, fecha de ejemplo %r (%s)",
+                    target_date, len(all_reports), fecha_creacion, type(fecha_creacion).__name__
+                )
 
             # Filtrar reportes por fecha
             daily_reports = []
@@ -1099,12 +1198,13 @@ class ExcelHandler:
                 if report_date == target_date:
                     daily_reports.append(report)
                     date_matches += 1
-                    if i < 3:  # Only log first 3 matches
-                        print(f"DEBUG: MATCH {date_matches} - Original: {original_date}, Parsed: {report_date}, Target: {target_date}")
-                elif i < 10:  # Log first 10 non-matches to see patterns
-                    print(f"DEBUG: NO MATCH {i+1} - Original: {original_date}, Parsed: {report_date}, Target: {target_date}")
+                    if debug and i < 3:  # Solo las primeras coincidencias
+                        logger.debug("Coincidencia %d: %r -> %s", date_matches, original_date, report_date)
+                elif debug and i < 10:  # Y las primeras diferencias, para ver el patrón
+                    logger.debug("Sin coincidencia %d: %r -> %s", i + 1, original_date, report_date)
 
-            print(f"DEBUG: Found {len(daily_reports)} reports for target date {target_date}")
+            if debug:
+                logger.debug("Vista 2 %s: %d reportes del día", target_date, len(daily_reports))
 
             if not daily_reports:
                 return {
@@ -1215,10 +1315,7 @@ class ExcelHandler:
             }
             
         except Exception as e:
-            import traceback
-            print(f"CRITICAL ERROR in get_daily_detailed_operations for {target_date}: {e}")
-            print("Full traceback:")
-            traceback.print_exc()
+            logger.exception(f"Error obteniendo detalle por operaciones del día {target_date}: {e}")
             return {
                 "fecha": target_date,
                 "periodo_descripcion": f"Error obteniendo datos para {target_date}",
@@ -1228,11 +1325,14 @@ class ExcelHandler:
             }
 
 
+    @track_excel("read")
     def get_accumulated_general_operations(self, fecha_inicio=None, fecha_fin=None):
         """
         Vista 3: Operación General Acumulado - Datos consolidados para un período
         Similar a Vista 1 pero con rango de fechas
         """
+        import pandas as pd
+
         try:
             if fecha_inicio is None:
                 # Por defecto usar solo el día actual hasta que se solucione el bug del rango
@@ -1242,14 +1342,11 @@ class ExcelHandler:
             elif fecha_fin is None:
                 fecha_fin = fecha_inicio
 
-            workbook = openpyxl.load_workbook(self.file_path)
-            
-            # Leer todos los reportes del período
-            reportes_df = pd.read_excel(self.file_path, sheet_name='Reportes')
-            incidencias_df = pd.read_excel(self.file_path, sheet_name='Incidencias')
-            movimientos_df = pd.read_excel(self.file_path, sheet_name='Ingresos_Retiros')
-            
-            workbook.close()
+            # Leer las tres hojas abriendo el libro una sola vez
+            sheets = pd.read_excel(self.file_path, sheet_name=['Reportes', 'Incidencias', 'Ingresos_Retiros'])
+            reportes_df = sheets['Reportes']
+            incidencias_df = sheets['Incidencias']
+            movimientos_df = sheets['Ingresos_Retiros']
             
             # Convertir columnas de fecha
             reportes_df['Fecha_Creacion'] = pd.to_datetime(reportes_df['Fecha_Creacion']).dt.date
@@ -1292,55 +1389,20 @@ class ExcelHandler:
             # Obtener IDs de reportes del período
             report_ids = period_reports['ID'].tolist()
             
-            # Filtrar incidencias del período
-            period_incidencias = incidencias_df[
-                incidencias_df['ID_Reporte'].isin(report_ids)
-            ]
-            
-            # Crear lista de incidencias con origen
-            incidencias_with_origin = []
-            for _, incidencia in period_incidencias.iterrows():
-                # Buscar el reporte padre para obtener administrador y operación
-                parent_report = period_reports[period_reports['ID'] == incidencia['ID_Reporte']].iloc[0]
-                
-                incidencias_with_origin.append({
-                    "tipo": incidencia.get('Tipo_Incidencia', 'No especificado'),
-                    "nombre_empleado": incidencia.get('Nombre_Empleado', 'No especificado'),
-                    "fecha_fin": incidencia.get('Fecha_Fin_Novedad', 'No especificada'),
-                    "administrador": parent_report['Administrador'],
-                    "cliente_operacion": parent_report['Cliente_Operacion'],
-                    "fecha_registro": pd.to_datetime(incidencia['Fecha_Registro']).isoformat() if pd.notna(incidencia.get('Fecha_Registro')) else datetime.now().isoformat()
-                })
-            
-            # Filtrar movimientos del período
-            period_movimientos = movimientos_df[
-                movimientos_df['ID_Reporte'].isin(report_ids)
-            ]
-            
-            # Crear lista de movimientos con origen
-            movimientos_with_origin = []
-            for _, movimiento in period_movimientos.iterrows():
-                parent_report = period_reports[period_reports['ID'] == movimiento['ID_Reporte']].iloc[0]
-                
-                movimientos_with_origin.append({
-                    "nombre_empleado": movimiento.get('Nombre_Empleado', 'No especificado'),
-                    "cargo": movimiento.get('Cargo', 'No especificado'),
-                    "estado": movimiento.get('Estado', 'No especificado'),
-                    "administrador": parent_report['Administrador'],
-                    "cliente_operacion": parent_report['Cliente_Operacion'],
-                    "fecha_registro": pd.to_datetime(movimiento['Fecha_Registro']).isoformat() if pd.notna(movimiento.get('Fecha_Registro')) else datetime.now().isoformat()
-                })
-            
+            now_iso = datetime.now().isoformat()
+
+            # Incidencias y movimientos del período con el origen del reporte padre
+            period_incidencias = _attach_report_origin(
+                incidencias_df[incidencias_df['ID_Reporte'].isin(report_ids)], period_reports
+            )
+            period_movimientos = _attach_report_origin(
+                movimientos_df[movimientos_df['ID_Reporte'].isin(report_ids)], period_reports
+            )
+            incidencias_with_origin = _records_with_origin(period_incidencias, INCIDENT_ORIGIN_FIELDS, now_iso)
+            movimientos_with_origin = _records_with_origin(period_movimientos, MOVEMENT_ORIGIN_FIELDS, now_iso)
+
             # Hechos relevantes con origen
-            hechos_relevantes_with_origin = []
-            for _, reporte in period_reports.iterrows():
-                if pd.notna(reporte.get('Hechos_Relevantes')) and str(reporte['Hechos_Relevantes']).strip():
-                    hechos_relevantes_with_origin.append({
-                        "hecho": str(reporte['Hechos_Relevantes']).strip(),
-                        "administrador": reporte['Administrador'],
-                        "cliente_operacion": reporte['Cliente_Operacion'],
-                        "fecha_registro": pd.to_datetime(reporte['Fecha_Creacion']).isoformat() if pd.notna(reporte.get('Fecha_Creacion')) else datetime.now().isoformat()
-                    })
+            hechos_relevantes_with_origin = _relevant_facts_with_origin(period_reports, now_iso)
             
             # Descripción del período
             if fecha_inicio == fecha_fin:
@@ -1366,7 +1428,7 @@ class ExcelHandler:
             }
             
         except Exception as e:
-            print(f"Error obteniendo operación general acumulada para período {fecha_inicio} - {fecha_fin}: {e}")
+            logger.error(f"Error obteniendo operación general acumulada para período {fecha_inicio} - {fecha_fin}: {e}")
             return {
                 "fecha_inicio": fecha_inicio or datetime.now().date(),
                 "fecha_fin": fecha_fin or datetime.now().date(),
@@ -1384,11 +1446,14 @@ class ExcelHandler:
                 "hechos_relevantes": []
             }
 
+    @track_excel("read")
     def get_accumulated_detailed_operations(self, fecha_inicio=None, fecha_fin=None):
         """
         Vista 4: Detalle Acumulado por Operaciones - Datos por operación para un período
         Similar a Vista 2 pero con promedios para períodos de tiempo
         """
+        import pandas as pd
+
         try:
             if fecha_inicio is None:
                 # Por defecto usar solo el día actual hasta que se solucione el bug del rango
@@ -1398,14 +1463,11 @@ class ExcelHandler:
             elif fecha_fin is None:
                 fecha_fin = fecha_inicio
 
-            workbook = openpyxl.load_workbook(self.file_path)
-            
-            # Leer todos los reportes del período
-            reportes_df = pd.read_excel(self.file_path, sheet_name='Reportes')
-            incidencias_df = pd.read_excel(self.file_path, sheet_name='Incidencias')
-            movimientos_df = pd.read_excel(self.file_path, sheet_name='Ingresos_Retiros')
-            
-            workbook.close()
+            # Leer las tres hojas abriendo el libro una sola vez
+            sheets = pd.read_excel(self.file_path, sheet_name=['Reportes', 'Incidencias', 'Ingresos_Retiros'])
+            reportes_df = sheets['Reportes']
+            incidencias_df = sheets['Incidencias']
+            movimientos_df = sheets['Ingresos_Retiros']
             
             # Convertir columnas de fecha
             reportes_df['Fecha_Creacion'] = pd.to_datetime(reportes_df['Fecha_Creacion']).dt.date
@@ -1428,74 +1490,41 @@ class ExcelHandler:
                     "total_reportes": 0
                 }
             
+            now_iso = datetime.now().isoformat()
+
+            # Incidencias y movimientos del período con su origen (un join para
+            # todo el período) agrupados por la operación del reporte padre
+            report_ids = period_reports['ID'].tolist()
+            period_incidencias = _attach_report_origin(
+                incidencias_df[incidencias_df['ID_Reporte'].isin(report_ids)], period_reports
+            )
+            period_movimientos = _attach_report_origin(
+                movimientos_df[movimientos_df['ID_Reporte'].isin(report_ids)], period_reports
+            )
+            incidencias_por_operacion = dict(tuple(period_incidencias.groupby('Cliente_Operacion', sort=False)))
+            movimientos_por_operacion = dict(tuple(period_movimientos.groupby('Cliente_Operacion', sort=False)))
+            empty_incidencias = period_incidencias.iloc[0:0]
+            empty_movimientos = period_movimientos.iloc[0:0]
+
             # Agrupar reportes por operación y calcular promedios
             operaciones_list = []
-            operaciones_unicas = period_reports['Cliente_Operacion'].unique()
-            
-            for operacion in operaciones_unicas:
-                # Filtrar reportes de esta operación
-                operacion_reports = period_reports[period_reports['Cliente_Operacion'] == operacion]
-                
+            for operacion, operacion_reports in period_reports.groupby('Cliente_Operacion', sort=False):
                 # Calcular promedios para esta operación
-                promedio_horas = round(operacion_reports['Horas_Diarias'].mean(), 1) if not operacion_reports.empty and not pd.isna(operacion_reports['Horas_Diarias'].mean()) else 0.0
-                promedio_staff = round(operacion_reports['Personal_Staff'].mean(), 1) if not operacion_reports.empty and not pd.isna(operacion_reports['Personal_Staff'].mean()) else 0.0
-                promedio_base = round(operacion_reports['Personal_Base'].mean(), 1) if not operacion_reports.empty and not pd.isna(operacion_reports['Personal_Base'].mean()) else 0.0
+                promedio_horas = round(operacion_reports['Horas_Diarias'].mean(), 1) if not pd.isna(operacion_reports['Horas_Diarias'].mean()) else 0.0
+                promedio_staff = round(operacion_reports['Personal_Staff'].mean(), 1) if not pd.isna(operacion_reports['Personal_Staff'].mean()) else 0.0
+                promedio_base = round(operacion_reports['Personal_Base'].mean(), 1) if not pd.isna(operacion_reports['Personal_Base'].mean()) else 0.0
                 num_reportes = len(operacion_reports)
                 
                 # Lista de administradores únicos
                 administradores = sorted(operacion_reports['Administrador'].unique().tolist())
                 
-                # Obtener IDs de reportes de esta operación
-                report_ids = operacion_reports['ID'].tolist()
-                
-                # Filtrar incidencias de esta operación en el período
-                operacion_incidencias = incidencias_df[
-                    incidencias_df['ID_Reporte'].isin(report_ids)
-                ]
-                
-                # Crear lista de incidencias con origen para esta operación
-                incidencias_with_origin = []
-                for _, incidencia in operacion_incidencias.iterrows():
-                    parent_report = operacion_reports[operacion_reports['ID'] == incidencia['ID_Reporte']].iloc[0]
-                    
-                    incidencias_with_origin.append({
-                        "tipo": incidencia.get('Tipo_Incidencia', 'No especificado'),
-                        "nombre_empleado": incidencia.get('Nombre_Empleado', 'No especificado'),
-                        "fecha_fin": incidencia.get('Fecha_Fin_Novedad', 'No especificada'),
-                        "administrador": parent_report['Administrador'],
-                        "cliente_operacion": parent_report['Cliente_Operacion'],
-                        "fecha_registro": pd.to_datetime(incidencia['Fecha_Registro']).isoformat() if pd.notna(incidencia.get('Fecha_Registro')) else datetime.now().isoformat()
-                    })
-                
-                # Filtrar movimientos de esta operación en el período
-                operacion_movimientos = movimientos_df[
-                    movimientos_df['ID_Reporte'].isin(report_ids)
-                ]
-                
-                # Crear lista de movimientos con origen para esta operación
-                movimientos_with_origin = []
-                for _, movimiento in operacion_movimientos.iterrows():
-                    parent_report = operacion_reports[operacion_reports['ID'] == movimiento['ID_Reporte']].iloc[0]
-                    
-                    movimientos_with_origin.append({
-                        "nombre_empleado": movimiento.get('Nombre_Empleado', 'No especificado'),
-                        "cargo": movimiento.get('Cargo', 'No especificado'),
-                        "estado": movimiento.get('Estado', 'No especificado'),
-                        "administrador": parent_report['Administrador'],
-                        "cliente_operacion": parent_report['Cliente_Operacion'],
-                        "fecha_registro": pd.to_datetime(movimiento['Fecha_Registro']).isoformat() if pd.notna(movimiento.get('Fecha_Registro')) else datetime.now().isoformat()
-                    })
-                
-                # Hechos relevantes de esta operación en el período
-                hechos_relevantes_with_origin = []
-                for _, reporte in operacion_reports.iterrows():
-                    if pd.notna(reporte.get('Hechos_Relevantes')) and str(reporte['Hechos_Relevantes']).strip():
-                        hechos_relevantes_with_origin.append({
-                            "hecho": str(reporte['Hechos_Relevantes']).strip(),
-                            "administrador": reporte['Administrador'],
-                            "cliente_operacion": reporte['Cliente_Operacion'],
-                            "fecha_registro": pd.to_datetime(reporte['Fecha_Creacion']).isoformat() if pd.notna(reporte.get('Fecha_Creacion')) else datetime.now().isoformat()
-                        })
+                incidencias_with_origin = _records_with_origin(
+                    incidencias_por_operacion.get(operacion, empty_incidencias), INCIDENT_ORIGIN_FIELDS, now_iso
+                )
+                movimientos_with_origin = _records_with_origin(
+                    movimientos_por_operacion.get(operacion, empty_movimientos), MOVEMENT_ORIGIN_FIELDS, now_iso
+                )
+                hechos_relevantes_with_origin = _relevant_facts_with_origin(operacion_reports, now_iso)
                 
                 # Crear objeto de operación
                 operacion_obj = {
@@ -1534,7 +1563,7 @@ class ExcelHandler:
             }
             
         except Exception as e:
-            print(f"Error obteniendo detalle acumulado por operaciones para período {fecha_inicio} - {fecha_fin}: {e}")
+            logger.error(f"Error obteniendo detalle acumulado por operaciones para período {fecha_inicio} - {fecha_fin}: {e}")
             return {
                 "fecha_inicio": fecha_inicio or datetime.now().date(),
                 "fecha_fin": fecha_fin or datetime.now().date(),
@@ -1545,5 +1574,23 @@ class ExcelHandler:
             }
 
 
-# Instancia global del manejador
-excel_handler = ExcelHandler()
\ No newline at end of file
+# Instancia global del manejador (se crea en el primer uso)
+_excel_handler: Optional[ExcelHandler] = None
+_excel_handler_lock = threading.Lock()
+
+
+def get_excel_handler() -> ExcelHandler:
+    """Obtener la instancia global del manejador de Excel"""
+    global _excel_handler
+    if _excel_handler is None:
+        with _excel_handler_lock:
+            if _excel_handler is None:
+                _excel_handler = ExcelHandler()
+    return _excel_handler
+
+
+def __getattr__(name: str):
+    # Compatibilidad con `from .excel_handler import excel_handler`
+    if name == "excel_handler":
+        return get_excel_handler()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
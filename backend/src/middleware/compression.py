@@ -0,0 +1,26 @@
+"""
+Compresión gzip con rutas excluidas
+
+GZipMiddleware de Starlette 0.27 comprime también las respuestas en streaming
+sin hacer flush: los eventos pequeños quedan retenidos en el compresor y un
+stream de Server-Sent Events no llega a tiempo. Las rutas excluidas (p. ej.
+/api/v1/events) pasan sin comprimir.
+"""
+from typing import Iterable
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware que no toca las rutas con los prefijos indicados"""
+
+    def __init__(self, app: ASGIApp, excluded_paths: Iterable[str] = (), **kwargs) -> None:
+        super().__init__(app, **kwargs)
+        self.excluded_paths = tuple(excluded_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self.excluded_paths and scope["path"].startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -0,0 +1,263 @@
+"""
+Métricas Prometheus de la API
+
+Expone /metrics con:
+- latencia por ruta (histograma por método, plantilla de ruta y status)
+- requests en curso
+- pool de conexiones de SQLAlchemy (get_db_stats)
+- duración de lecturas/escrituras del Excel
+- cantidad y duración de encriptaciones/desencriptaciones
+- latencia de envío SMTP
+- aciertos del cache de respuestas y estado del outbox
+
+prometheus_client es opcional: sin él los helpers de instrumentación no hacen
+nada y setup_metrics() no registra el endpoint.
+"""
+import functools
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Gauge, Histogram, generate_latest
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+
+class _NoopMetric:
+    """Sustituto de métricas cuando prometheus_client no está instalado"""
+
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+    def dec(self, amount: float = 1) -> None:
+        pass
+
+
+# Buckets pensados para una API interna: de 5 ms a 30 s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Fernet sobre campos cortos: decenas de microsegundos
+CRYPTO_BUCKETS = (0.00002, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005, 0.01)
+
+if PROMETHEUS_AVAILABLE:
+    HTTP_REQUEST_SECONDS = Histogram(
+        "http_request_duration_seconds",
+        "Latencia de los requests HTTP",
+        ["method", "route", "status"],
+        buckets=LATENCY_BUCKETS
+    )
+    HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests HTTP en curso", ["method"])
+    EXCEL_OPERATION_SECONDS = Histogram(
+        "excel_operation_duration_seconds",
+        "Duración de las operaciones sobre el Excel",
+        ["kind", "operation", "outcome"],
+        buckets=LATENCY_BUCKETS
+    )
+    CRYPTO_OPERATION_SECONDS = Histogram(
+        "encryption_operation_duration_seconds",
+        "Duración de encriptaciones y desencriptaciones (el _count es la cantidad)",
+        ["operation", "outcome"],
+        buckets=CRYPTO_BUCKETS
+    )
+    SMTP_SEND_SECONDS = Histogram(
+        "smtp_send_duration_seconds",
+        "Latencia de envío de correos por SMTP",
+        ["outcome"],
+        buckets=LATENCY_BUCKETS
+    )
+else:
+    HTTP_REQUEST_SECONDS = HTTP_IN_FLIGHT = _NoopMetric()
+    EXCEL_OPERATION_SECONDS = CRYPTO_OPERATION_SECONDS = SMTP_SEND_SECONDS = _NoopMetric()
+
+
+@contextmanager
+def observe_duration(metric, **labels: str):
+    """Medir la duración de un bloque; agrega el label outcome (success/error)"""
+    start = time.perf_counter()
+    outcome = "success"
+    try:
+        yield
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        metric.labels(outcome=outcome, **labels).observe(time.perf_counter() - start)
+
+
+def track_excel(kind: str) -> Callable:
+    """Decorador para métodos de ExcelHandler (kind: read/write)"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with observe_duration(EXCEL_OPERATION_SECONDS, kind=kind, operation=func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def track_crypto(operation: str) -> Callable:
+    """Decorador para encrypt/decrypt (sin context manager: se llama por campo)"""
+    def decorator(func: Callable) -> Callable:
+        if not PROMETHEUS_AVAILABLE:
+            return func
+        success = CRYPTO_OPERATION_SECONDS.labels(operation=operation, outcome="success")
+        error = CRYPTO_OPERATION_SECONDS.labels(operation=operation, outcome="error")
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                error.observe(time.perf_counter() - start)
+                raise
+            success.observe(time.perf_counter() - start)
+            return result
+        return wrapper
+    return decorator
+
+
+def observe_smtp():
+    """Context manager para medir un envío SMTP"""
+    return observe_duration(SMTP_SEND_SECONDS)
+
+
+class StateCollector:
+    """Métricas leídas en cada scrape: pool de la BD, cache y outbox"""
+
+    def describe(self):
+        # Sin esto REGISTRY.register() llama a collect() al registrar
+        return []
+
+    def collect(self):
+        yield from self._collect_db_pool()
+        yield from self._collect_cache()
+        yield from self._collect_outbox()
+
+    @staticmethod
+    def _collect_db_pool():
+        try:
+            from ..database.connection import get_db_stats
+            stats = get_db_stats()
+        except Exception:
+            return
+        pool = GaugeMetricFamily("db_pool_connections", "Conexiones del pool de SQLAlchemy", labels=["state"])
+        pool.add_metric(["size"], stats["size"])
+        pool.add_metric(["checked_in"], stats["checked_in"])
+        pool.add_metric(["checked_out"], max(stats["total"] - stats["checked_in"], 0))
+        pool.add_metric(["overflow"], stats["overflow"])
+        yield pool
+
+    @staticmethod
+    def _collect_cache():
+        from ..services.cache_service import response_cache
+        yield CounterMetricFamily("response_cache_hits", "Aciertos del cache de respuestas", value=response_cache.hits)
+        yield CounterMetricFamily("response_cache_misses", "Fallos del cache de respuestas", value=response_cache.misses)
+        lookups = response_cache.hits + response_cache.misses
+        yield GaugeMetricFamily(
+            "response_cache_hit_ratio",
+            "Tasa de acierto del cache de respuestas desde el arranque",
+            value=response_cache.hits / lookups if lookups else 0
+        )
+        backend = response_cache._backend
+        if backend is not None and backend.name == "memory":
+            stats = backend.stats()
+            yield GaugeMetricFamily("response_cache_entries", "Entradas en el cache", value=stats["entries"])
+            yield GaugeMetricFamily("response_cache_memory_bytes", "Bytes en el cache", value=stats["memory_bytes"])
+
+    @staticmethod
+    def _collect_outbox():
+        from ..services.outbox_service import outbox
+        try:
+            stats = outbox.get_stats()
+        except Exception:
+            return
+        entries = GaugeMetricFamily("outbox_entries", "Entradas del outbox por estado", labels=["status"])
+        for state in ("pending", "processing", "done", "dead"):
+            entries.add_metric([state], stats[state])
+        yield entries
+        yield GaugeMetricFamily(
+            "outbox_oldest_pending_seconds",
+            "Antigüedad de la entrada pendiente más vieja",
+            value=stats["oldest_pending_seconds"] or 0
+        )
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Latencia por plantilla de ruta y requests en curso"""
+
+    def __init__(self, app, fastapi_app: FastAPI):
+        super().__init__(app)
+        self.fastapi_app = fastapi_app
+        self._routes: Optional[Dict[Any, str]] = None
+
+    def _route_label(self, request: Request) -> str:
+        """Plantilla de la ruta (no la URL) para no disparar la cardinalidad"""
+        route = request.scope.get("route")
+        if route is not None:
+            return route.path
+        endpoint = request.scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._routes is None:
+            self._routes = {
+                getattr(r, "endpoint", None): r.path for r in self.fastapi_app.routes if hasattr(r, "path")
+            }
+        return self._routes.get(endpoint, "unmatched")
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path == "/metrics":
+            return await call_next(request)
+
+        method = request.method
+        in_flight = HTTP_IN_FLIGHT.labels(method=method)
+        in_flight.inc()
+        start = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            in_flight.dec()
+            HTTP_REQUEST_SECONDS.labels(
+                method=method, route=self._route_label(request), status=str(status_code)
+            ).observe(time.perf_counter() - start)
+
+
+def setup_metrics(app: FastAPI) -> None:
+    """Registrar el middleware y el endpoint /metrics"""
+    if not settings.metrics_enabled:
+        return
+    if not PROMETHEUS_AVAILABLE:
+        logger.warning("prometheus_client no está instalado, /metrics deshabilitado")
+        return
+
+    REGISTRY.register(StateCollector())
+    app.add_middleware(MetricsMiddleware, fastapi_app=app)
+
+    async def metrics_endpoint(request: Request) -> Response:
+        if settings.metrics_token:
+            if request.headers.get("authorization") != f"Bearer {settings.metrics_token}":
+                return Response(status_code=401)
+        return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+    logger.info("Métricas Prometheus disponibles en /metrics")
@@ -0,0 +1,160 @@
+"""
+Perfilado opcional de requests individuales
+
+Un administrador activa el perfilado de un request con el header
+`X-Profile: 1` o el parámetro `?profile=1`. El request se ejecuta dentro de
+pyinstrument (si está instalado, con soporte async) o cProfile, y el
+resultado se guarda en logs_dir/profiles. El nombre del archivo vuelve en el
+header `X-Profile-File`.
+
+Con `X-Profile: html` (o `?profile=html`) se devuelve el reporte en lugar de
+la respuesta del endpoint: HTML de pyinstrument o el resumen de pstats.
+
+Solo se perfila un request a la vez: cProfile es global al intérprete y
+mezclaría requests concurrentes.
+"""
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import HTMLResponse, PlainTextResponse, Response
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pyinstrument import Profiler
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY = "profile"
+
+
+def _profile_mode(request: Request) -> Optional[str]:
+    """Modo pedido por el cliente: None, "store" o "html\""""
+    value = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY)
+    if not value or value.lower() in ("0", "false", "no"):
+        return None
+    return "html" if value.lower() == "html" else "store"
+
+
+def _is_admin(request: Request) -> bool:
+    """Verificar que el token Bearer pertenezca a un administrador"""
+    authorization = request.headers.get("authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return False
+    try:
+        from ..auth.jwt_handler import jwt_handler
+        payload = jwt_handler.verify_token(authorization[7:], token_type="access")
+    except Exception:
+        return False
+    return payload.get("role") == "admin"
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """Envuelve en un profiler los requests marcados por un administrador"""
+
+    def __init__(self, app, output_dir: Optional[Path] = None):
+        super().__init__(app)
+        self.output_dir = Path(output_dir or settings.logs_dir / "profiles")
+        self._lock = asyncio.Lock()
+
+    async def dispatch(self, request: Request, call_next):
+        mode = _profile_mode(request)
+        if mode is None:
+            return await call_next(request)
+
+        if not _is_admin(request):
+            logger.warning(f"Perfilado rechazado (no admin): {request.method} {request.url.path}")
+            return await call_next(request)
+
+        if self._lock.locked():
+            response = await call_next(request)
+            response.headers["X-Profile"] = "busy"
+            return response
+
+        async with self._lock:
+            if PYINSTRUMENT_AVAILABLE:
+                return await self._profile_pyinstrument(request, call_next, mode)
+            return await self._profile_cprofile(request, call_next, mode)
+
+    def _output_path(self, request: Request, suffix: str) -> Path:
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_")[:80] or "root"
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        return self.output_dir / f"{timestamp}_{request.method}_{slug}.{suffix}"
+
+    @staticmethod
+    async def _consume(response: Response) -> bytes:
+        """Leer el cuerpo completo (la serialización queda dentro del perfil)"""
+        body = b""
+        async for chunk in response.body_iterator:
+            body += chunk
+        return body
+
+    async def _profile_pyinstrument(self, request: Request, call_next, mode: str) -> Response:
+        profiler = Profiler(async_mode="enabled")
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            response = await call_next(request)
+            body = await self._consume(response)
+        finally:
+            profiler.stop()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        html = profiler.output_html()
+        path = self._output_path(request, "html")
+        path.write_text(html, encoding="utf-8")
+        logger.info(f"Perfil guardado: {path} ({elapsed_ms:.1f} ms)")
+
+        if mode == "html":
+            return HTMLResponse(html, headers={"X-Profile-File": path.name})
+        return self._rebuild(response, body, path, elapsed_ms)
+
+    async def _profile_cprofile(self, request: Request, call_next, mode: str) -> Response:
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = await call_next(request)
+            body = await self._consume(response)
+        finally:
+            profiler.disable()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        path = self._output_path(request, "prof")
+        profiler.dump_stats(str(path))
+        logger.info(f"Perfil guardado: {path} ({elapsed_ms:.1f} ms)")
+
+        if mode == "html":
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(60)
+            return PlainTextResponse(summary.getvalue(), headers={"X-Profile-File": path.name})
+        return self._rebuild(response, body, path, elapsed_ms)
+
+    @staticmethod
+    def _rebuild(response: Response, body: bytes, path: Path, elapsed_ms: float) -> Response:
+        """Respuesta original con los headers del perfil"""
+        rebuilt = Response(content=body, status_code=response.status_code)
+        # raw_headers conserva los headers repetidos (p. ej. varios Set-Cookie)
+        rebuilt.raw_headers = [
+            (name, value) for name, value in response.raw_headers if name.lower() != b"content-length"
+        ] + [
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"x-profile-file", path.name.encode("latin-1")),
+            (b"x-profile-duration-ms", f"{elapsed_ms:.1f}".encode("latin-1")),
+        ]
+        return rebuilt
@@ -22,7 +22,8 @@ def get_redis_client() -> Optional[redis.Redis]:
 
     if redis_url:
         try:
-            client = redis.from_url(redis_url, decode_responses=True)
+            # Timeout corto: el ping se hace al importar y no debe bloquear el arranque
+            client = redis.from_url(redis_url, decode_responses=True, socket_connect_timeout=2)
             client.ping()  # Verificar conexión
             logger.info("Redis connected for rate limiting")
             return client
@@ -4,6 +4,7 @@ Basado en las especificaciones del README.md
 """
 from datetime import date, datetime
 from typing import List, Optional
+from uuid import UUID
 from pydantic import BaseModel, Field, validator
 from enum import Enum
 
@@ -254,6 +255,25 @@ class DailyReportUpdate(BaseModel):
     )
 
 
+# Maximo de reportes por consulta de detalles en lote
+MAX_BATCH_REPORTS = 100
+
+
+class ReportBatchRequest(BaseModel):
+    """IDs de reportes para obtener sus detalles en una sola consulta"""
+    ids: List[UUID] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_REPORTS,
+        description=f"IDs de los reportes (maximo {MAX_BATCH_REPORTS})"
+    )
+    fechas: Optional[List[date]] = Field(
+        None,
+        max_length=MAX_BATCH_REPORTS,
+        description="Fechas de los reportes si se conocen (acotan las particiones leídas)"
+    )
+
+
 class DailyReportResponse(BaseModel):
     """Modelo de respuesta para reportes diarios"""
     id: str = Field(..., description="ID unico del reporte")
@@ -0,0 +1,161 @@
+"""
+Endpoints de notificaciones por correo
+Prueba de SMTP y recordatorios de reporte diario a los administradores
+"""
+from datetime import date
+from fastapi import APIRouter, HTTPException, Depends, status
+import logging
+
+from ..config import settings
+from ..dependencies import get_excel_handler
+from ..email_service import email_service
+from ..models import APIResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix=f"{settings.api_v1_prefix}/notifications", tags=["Notificaciones"])
+
+@router.post(
+    "/test-email",
+    summary="Probar conexión de email",
+    description="Probar la conexión SMTP del servicio de email"
+)
+async def test_email_connection():
+    """Probar conexión de email"""
+    try:
+        success, message = email_service.test_connection()
+        return APIResponse(
+            success=success,
+            message=message,
+            data={"smtp_server": email_service.smtp_server}
+        )
+    except Exception as e:
+        logger.error(f"Error probando conexión de email: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno probando conexión de email"
+        )
+
+
+@router.post(
+    "/send-reminder/{admin_name}",
+    summary="Enviar recordatorio a administrador específico",
+    description="Enviar recordatorio de reporte diario a un administrador específico"
+)
+async def send_admin_reminder(admin_name: str, excel=Depends(get_excel_handler)):
+    """Enviar recordatorio a administrador específico"""
+    try:
+        # Obtener estado actual de reportes del administrador
+        today = date.today()
+        existing_reports = excel.get_reports_by_date(today)
+        admin_reports_today = [
+            r for r in existing_reports 
+            if r.get('Administrador', '').lower() == admin_name.lower()
+        ]
+        
+        report_status = {
+            "administrador": admin_name,
+            "fecha": today.isoformat(),
+            "reportes_enviados": len(admin_reports_today),
+            "ha_reportado": len(admin_reports_today) > 0,
+            "reportes": [
+                {
+                    "id": r.get('ID'),
+                    "hora": r.get('Fecha_Creacion'),
+                    "estado": r.get('Estado', 'Completado')
+                } for r in admin_reports_today
+            ]
+        }
+        
+        # Enviar recordatorio
+        success, message = email_service.send_daily_reminder(admin_name, report_status)
+        
+        if success:
+            logger.info(f"Recordatorio enviado a {admin_name}")
+            return APIResponse(
+                success=True,
+                message=message,
+                data={
+                    "administrador": admin_name,
+                    "estado_reporte": report_status
+                }
+            )
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=message
+            )
+            
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error enviando recordatorio a {admin_name}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno enviando recordatorio"
+        )
+
+
+@router.post(
+    "/send-bulk-reminders",
+    summary="Enviar recordatorios masivos",
+    description="Enviar recordatorios a todos los administradores que no han reportado"
+)
+async def send_bulk_reminders(excel=Depends(get_excel_handler)):
+    """Enviar recordatorios masivos a administradores pendientes"""
+    try:
+        today = date.today()
+        existing_reports = excel.get_reports_by_date(today)
+        
+        # Preparar estados para cada administrador
+        admin_statuses = {}
+        
+        # Obtener lista de todos los administradores
+        all_admins = list(email_service.admin_emails.keys())
+        
+        for admin_name in all_admins:
+            admin_reports_today = [
+                r for r in existing_reports 
+                if r.get('Administrador', '').lower() == admin_name.lower()
+            ]
+            
+            admin_statuses[admin_name] = {
+                "administrador": admin_name,
+                "fecha": today.isoformat(),
+                "reportes_enviados": len(admin_reports_today),
+                "ha_reportado": len(admin_reports_today) > 0,
+                "reportes": [
+                    {
+                        "id": r.get('ID'),
+                        "hora": r.get('Fecha_Creacion'),
+                        "estado": r.get('Estado', 'Completado')
+                    } for r in admin_reports_today
+                ]
+            }
+        
+        # Enviar solo a los que no han reportado (o enviar confirmación a los que sí)
+        results = email_service.send_bulk_reminders(admin_statuses)
+        
+        successful_sends = [admin for admin, (success, _) in results.items() if success]
+        failed_sends = [admin for admin, (success, _) in results.items() if not success]
+        
+        logger.info(f"Recordatorios enviados: {len(successful_sends)} exitosos, {len(failed_sends)} fallidos")
+        
+        return APIResponse(
+            success=True,
+            message=f"Proceso completado: {len(successful_sends)} exitosos, {len(failed_sends)} fallidos",
+            data={
+                "total_enviados": len(successful_sends),
+                "total_fallidos": len(failed_sends),
+                "resultados": results,
+                "administradores_exitosos": successful_sends,
+                "administradores_fallidos": failed_sends
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"Error enviando recordatorios masivos: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno enviando recordatorios masivos"
+        )
@@ -0,0 +1,313 @@
+"""
+Endpoints de reportes diarios
+Creación (Excel + outbox hacia PostgreSQL), estado del día por administrador,
+eliminación y configuración del formulario
+"""
+from datetime import date, datetime
+from typing import Dict, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+import logging
+
+from ..config import settings, ADMINISTRATORS, CLIENT_OPERATIONS, INCIDENT_TYPES, EMPLOYEE_STATUSES
+from ..dependencies import get_excel_handler, get_client_info
+from ..models import DailyReportCreate, APIResponse, ReportCreateResponse
+from ..services.cache_service import invalidate_report_write
+from ..services.event_service import event_broadcaster, REPORT_CREATED, REPORT_DELETED
+from ..services.outbox_service import outbox
+from ..services.report_service import ReportService, get_report_service, report_status_value
+from ..utils.date_utils import convert_to_bogota_timezone, get_local_today
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix=settings.api_v1_prefix, tags=["Reportes"])
+
+
+@router.post(
+    "/reportes",
+    response_model=ReportCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Crear nuevo reporte diario",
+    description="Endpoint principal para crear reportes diarios de administradores"
+)
+async def create_daily_report(
+    request: Request,
+    report: DailyReportCreate,
+    client_info: Dict[str, str] = Depends(get_client_info),
+    excel=Depends(get_excel_handler)
+) -> ReportCreateResponse:
+    """
+    Crear un nuevo reporte diario
+
+    - **administrador**: Administrador que reporta (de la lista predefinida)
+    - **cliente_operacion**: Cliente/Operacion (de la lista predefinida)
+    - **horas_diarias**: Horas trabajadas (1-24)
+    - **personal_staff**: Cantidad de personal staff (e0)
+    - **personal_base**: Cantidad de personal base (e0)
+    - **incidencias**: Lista de incidencias (opcional)
+    - **ingresos_retiros**: Lista de movimientos de personal (opcional)
+    """
+    try:
+        # Obtener reportes existentes del día (información para el frontend)
+        # Usar timezone de Bogotá para fecha del reporte
+        today = get_local_today()
+        existing_reports = excel.get_reports_by_date(today)
+        admin_reports_today = [
+            r for r in existing_reports
+            if r.get('Administrador') == report.administrador
+        ]
+
+        # Guardar reporte en Excel
+        saved_report = excel.save_report(report, client_info)
+        logger.info(f"Reporte creado en Excel: {saved_report.id} por {report.administrador}")
+        # Las vistas 1-4 leen del Excel; PostgreSQL invalida al aplicar el outbox
+        invalidate_report_write(today)
+
+        # DUAL-WRITE: la escritura en PostgreSQL se registra en el outbox y la
+        # aplica el worker en segundo plano (con reintentos); el evento
+        # report.created se publica al confirmarla (apply_create_payload)
+        if not request.app.state.auth_enabled:
+            event_broadcaster.publish(
+                REPORT_CREATED,
+                id=saved_report.id,
+                administrador=report.administrador,
+                cliente_operacion=report.cliente_operacion,
+                fecha=today
+            )
+        else:
+            try:
+                payload = ReportService.build_create_payload(
+                    report=report,
+                    admin_name=report.administrador,
+                    client_info=client_info,
+                    report_date=today,
+                    legacy_id=saved_report.id
+                )
+                entry_id = outbox.enqueue("report.create", payload)
+                logger.info(f"Reporte {saved_report.id} encolado para PostgreSQL (outbox {entry_id})")
+            except Exception as e:
+                # Excel ya confirmó el reporte; la sincronización incremental lo recupera
+                logger.error(f"No se pudo encolar el reporte {saved_report.id} para PostgreSQL: {e}")
+        
+        # Preparar mensaje informativo
+        message = "Reporte creado exitosamente"
+        if len(admin_reports_today) > 0:
+            message += f" (Reporte #{len(admin_reports_today) + 1} del día)"
+        
+        return ReportCreateResponse(
+            success=True,
+            message=message,
+            data={
+                "id": saved_report.id,
+                "fecha_creacion": saved_report.fecha_creacion.isoformat(),
+                "reportes_del_dia": len(admin_reports_today) + 1,
+                "es_primer_reporte": len(admin_reports_today) == 0
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creando reporte: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor al crear el reporte"
+        )
+
+
+# Endpoint para verificar reportes del día por administrador
+@router.get(
+    "/reportes/admin/{admin_name}/today",
+    summary="Verificar reportes del día por administrador",
+    description="Obtener información sobre reportes enviados hoy por un administrador específico (opcionalmente filtrado por operación)"
+)
+async def check_admin_today_reports(
+    admin_name: str,
+    operacion: Optional[str] = None,
+    service: ReportService = Depends(get_report_service)
+):
+    """
+    Verificar reportes enviados hoy por un administrador específico
+
+    Args:
+        admin_name: Nombre del administrador
+        operacion: (Opcional) Filtrar por operación específica
+
+    Returns:
+        Información sobre reportes del día, incluyendo operaciones
+    """
+    try:
+        # Usar timezone configurada (America/Bogota)
+        today = get_local_today()
+
+        # Consultar PostgreSQL
+        admin_reports_today = service.get_admin_reports_for_date(admin_name, today, operacion)
+
+        reports_list = []
+        operaciones_reportadas = set()
+
+        for r in admin_reports_today:
+            # Desencriptar para obtener la operación
+            r_decrypted = service.encryptor.decrypt_model_fields(r, "reports")
+            operaciones_reportadas.add(r_decrypted.client_operation)
+
+            reports_list.append({
+                "id": str(r.id),
+                "operacion": r_decrypted.client_operation,
+                "hora": convert_to_bogota_timezone(r.created_at),
+                "estado": report_status_value(r.status)
+            })
+
+        return APIResponse(
+            success=True,
+            message=f"Información de reportes del día para {admin_name}" + (f" - {operacion}" if operacion else ""),
+            data={
+                "administrador": admin_name,
+                "operacion_filtrada": operacion,
+                "fecha": today.isoformat(),
+                "reportes_enviados": len(admin_reports_today),
+                "ha_reportado": len(admin_reports_today) > 0,
+                "operaciones_reportadas": list(operaciones_reportadas),
+                "reportes": reports_list
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Error verificando reportes del administrador {admin_name}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor al verificar reportes"
+        )
+
+
+# Endpoint para eliminar un reporte específico
+@router.delete(
+    "/reportes/{report_id}",
+    summary="Eliminar un reporte específico",
+    description="Eliminar un reporte (administradores del sistema pueden eliminar cualquier reporte)"
+)
+async def delete_report(
+    report_id: str,
+    fecha: Optional[date] = Query(None, description="Fecha del reporte si se conoce (acota la partición leída)"),
+    client_info: Dict[str, str] = Depends(get_client_info),
+    excel=Depends(get_excel_handler),
+    service: ReportService = Depends(get_report_service)
+):
+    """Eliminar un reporte específico (dual-delete: Excel + PostgreSQL)"""
+    try:
+        excel_success = False
+        postgres_success = False
+        report_found = False
+        origin = {}
+
+        # Intentar eliminar de PostgreSQL primero
+        try:
+            result = service.delete_report(report_id, fecha)
+            if result["found"]:
+                report_found = True
+                postgres_success = True
+                origin = {
+                    "administrador": result["administrator"],
+                    "cliente_operacion": result["client_operation"],
+                    "fecha": result["report_date"]
+                }
+                logger.info(f"Reporte eliminado de PostgreSQL: {report_id}")
+
+                # Si tiene legacy_id, intentar eliminar de Excel
+                legacy_id = result["legacy_id"]
+                if legacy_id:
+                    try:
+                        excel_success = excel.delete_report(legacy_id)
+                        if excel_success:
+                            logger.info(f"Reporte eliminado de Excel: {legacy_id}")
+                    except Exception as excel_err:
+                        logger.warning(f"No se pudo eliminar de Excel (legacy_id: {legacy_id}): {excel_err}")
+            else:
+                logger.warning(f"Reporte no encontrado en PostgreSQL: {report_id}")
+        except Exception as e:
+            logger.error(f"Error en eliminación de PostgreSQL: {e}")
+
+        # Si no se encontró en PostgreSQL, intentar en Excel
+        if not report_found:
+            try:
+                all_reports = excel.get_all_reports()
+                report_to_delete = next((r for r in all_reports if r.get('ID') == report_id), None)
+
+                if report_to_delete:
+                    report_found = True
+                    fecha_creacion = report_to_delete.get('Fecha_Creacion')
+                    origin = {
+                        "administrador": report_to_delete.get('Administrador'),
+                        "cliente_operacion": report_to_delete.get('Cliente_Operacion'),
+                        "fecha": fecha_creacion.date() if isinstance(fecha_creacion, datetime) else fecha_creacion
+                    }
+                    excel_success = excel.delete_report(report_id)
+                    logger.info(f"Reporte eliminado de Excel: {report_id}")
+                    invalidate_report_write(report_id=report_id)
+            except Exception as excel_err:
+                logger.error(f"Error eliminando de Excel: {excel_err}")
+
+        if not report_found:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Reporte {report_id} no encontrado en ningún sistema"
+            )
+
+        if postgres_success or excel_success:
+            logger.info(f"Reporte eliminado: {report_id} por IP {client_info['ip']}")
+            event_broadcaster.publish(REPORT_DELETED, id=report_id, **origin)
+            return APIResponse(
+                success=True,
+                message=f"Reporte {report_id} eliminado exitosamente",
+                data={
+                    "id_eliminado": report_id,
+                    "fecha_eliminacion": datetime.now().isoformat(),
+                    "excel_eliminado": excel_success,
+                    "postgres_eliminado": postgres_success
+                }
+            )
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error eliminando el reporte de ambos sistemas"
+            )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error eliminando reporte {report_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor al eliminar el reporte"
+        )
+
+# Endpoint para obtener configuraciones/constantes
+@router.get(
+    "/config",
+    summary="Obtener configuraciones del sistema",
+    description="Obtener listas de administradores, operaciones, tipos de incidencias, etc."
+)
+async def get_system_config():
+    """Obtener configuraciones y constantes del sistema"""
+    try:
+        return APIResponse(
+            success=True,
+            message="Configuraciones obtenidas exitosamente",
+            data={
+                "administradores": ADMINISTRATORS,
+                "operaciones": CLIENT_OPERATIONS,
+                "tipos_incidencias": INCIDENT_TYPES,
+                "estados_empleado": EMPLOYEE_STATUSES,
+                "limites": {
+                    "max_incidencias": settings.max_incidencias_per_report,
+                    "max_movimientos": settings.max_movimientos_per_report,
+                    "max_reportes_por_admin_por_dia": settings.max_reportes_per_admin_per_day
+                }
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"Error obteniendo configuraciones: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error interno del servidor al obtener configuraciones"
+        )
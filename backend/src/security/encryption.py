@@ -8,9 +8,35 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
 import os
 import json
+from functools import lru_cache
 from typing import Any, Optional, Dict, List
 from loguru import logger
 
+try:
+    from ..middleware.metrics import track_crypto
+except ImportError:
+    # Importado como `security.encryption` desde los scripts de migración
+    def track_crypto(operation: str):
+        return lambda func: func
+
+
+@lru_cache(maxsize=8)
+def _derive_key(password: str, salt: str) -> bytes:
+    """
+    Derivar clave Fernet con PBKDF2 (100k iteraciones)
+
+    Se cachea por proceso: las instancias globales (data, field y token
+    encryptor) comparten la misma clave y no repiten la derivacion al importar.
+    """
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt.encode(),
+        iterations=100000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+
+
 class DataEncryption:
     """
     Manejador de encriptación para datos sensibles
@@ -59,17 +85,8 @@ class DataEncryption:
         Returns:
             Clave de encriptación compatible con Fernet
         """
-        salt = os.getenv("ENCRYPTION_SALT", "default-salt").encode()
-
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-        return key
+        salt = os.getenv("ENCRYPTION_SALT", "default-salt")
+        return _derive_key(password, salt)
 
     @classmethod
     def generate_new_key(cls) -> str:
@@ -81,6 +98,7 @@ class DataEncryption:
         """
         return Fernet.generate_key().decode()
 
+    @track_crypto("encrypt")
     def encrypt(self, data: str) -> str:
         """
         Encriptar string de datos
@@ -101,6 +119,7 @@ class DataEncryption:
             logger.error(f"Encryption failed: {e}")
             raise
 
+    @track_crypto("decrypt")
     def decrypt(self, encrypted_data: str) -> str:
         """
         Desencriptar datos
@@ -122,6 +141,41 @@ class DataEncryption:
             logger.error(f"Decryption failed: {e}")
             raise
 
+    @track_crypto("decrypt_many")
+    def decrypt_many(self, values: List[str]) -> List[Optional[str]]:
+        """
+        Desencriptar un lote de valores (una sola medición para todo el lote)
+
+        Cada valor se decodifica una vez: los que no son tokens Fernet se
+        devuelven sin cambios y los que fallan quedan en None.
+
+        Args:
+            values: Valores encriptados en base64
+
+        Returns:
+            Valores desencriptados, en el mismo orden
+        """
+        cipher = self.cipher
+        result: List[Optional[str]] = []
+        for value in values:
+            if not value or not isinstance(value, str):
+                result.append(value)
+                continue
+            try:
+                decoded = base64.urlsafe_b64decode(value.encode())
+            except Exception:
+                result.append(value)
+                continue
+            if not decoded.startswith(b'gAAAAA'):
+                result.append(value)
+                continue
+            try:
+                result.append(cipher.decrypt(decoded).decode())
+            except Exception as e:
+                logger.warning(f"Could not decrypt value: {e}")
+                result.append(None)
+        return result
+
     def encrypt_dict(self, data: Dict) -> str:
         """
         Encriptar diccionario completo
@@ -285,6 +339,64 @@ class FieldEncryptor:
 
         return model_instance
 
+    def decrypt_many_model_fields(self, model_instances: List[Any], table: str) -> List[Any]:
+        """
+        Desencriptar los campos sensibles de varios modelos en un solo lote
+
+        Equivale a decrypt_model_fields sobre cada instancia; un campo que no
+        se puede desencriptar conserva su valor (igual que en el caso unitario).
+
+        Args:
+            model_instances: Instancias del modelo SQLAlchemy
+            table: Nombre de la tabla
+
+        Returns:
+            Las mismas instancias con campos desencriptados
+        """
+        encrypted_fields = self.ENCRYPTED_FIELDS.get(table, [])
+        targets = []
+        for instance in model_instances:
+            for field in encrypted_fields:
+                value = getattr(instance, field, None)
+                if value and isinstance(value, str):
+                    targets.append((instance, field, value))
+
+        decrypted = self.encryptor.decrypt_many([value for _, _, value in targets])
+        for (instance, field, value), plain in zip(targets, decrypted):
+            if plain is not None and plain != value:
+                setattr(instance, field, plain)
+
+        return model_instances
+
+    def decrypt_many_dict_fields(self, rows: List[Dict], table: str) -> List[Dict]:
+        """
+        Desencriptar en lote los campos sensibles presentes en varios diccionarios
+
+        Solo se procesan las claves que trae cada diccionario (proyecciones
+        parciales); los diccionarios se modifican en el lugar.
+
+        Args:
+            rows: Diccionarios con datos encriptados
+            table: Nombre de la tabla
+
+        Returns:
+            Los mismos diccionarios con campos desencriptados
+        """
+        encrypted_fields = self.ENCRYPTED_FIELDS.get(table, [])
+        targets = [
+            (row, field, row[field])
+            for row in rows
+            for field in encrypted_fields
+            if row.get(field) and isinstance(row[field], str)
+        ]
+
+        decrypted = self.encryptor.decrypt_many([value for _, _, value in targets])
+        for (row, field, value), plain in zip(targets, decrypted):
+            if plain is not None:
+                row[field] = plain
+
+        return rows
+
     def _is_encrypted(self, value: str) -> bool:
         """
         Verificar si un valor ya está encriptado
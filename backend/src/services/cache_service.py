@@ -0,0 +1,476 @@
+"""
+Cache de respuestas para los endpoints de lectura del área admin
+
+Dashboard, analytics, vistas 1-4 y detalle de reportes se leen muchas más veces
+de las que se escriben reportes. Las respuestas se guardan por endpoint +
+parámetros y se etiquetan por fecha y por reporte; crear, editar o eliminar un
+reporte invalida exactamente las etiquetas afectadas.
+
+Backend en memoria (LRU acotado por entradas y bytes) o Redis si REDIS_URL está
+configurado (la misma variable que usa el rate limiter). Con varios workers de
+uvicorn se recomienda Redis para que la invalidación alcance a todos.
+"""
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Etiquetas de invalidación
+REPORTS_TAG = "reportes"
+ANALYTICS_TAG = "analytics"
+DATES_TAG = "fechas"  # Presente en toda entrada asociada a una o más fechas
+
+# Rangos más largos se etiquetan solo con DATES_TAG
+MAX_TAGGED_DAYS = 400
+
+
+def date_tag(value: date) -> str:
+    """Etiqueta de una fecha de reporte"""
+    return f"date:{value.isoformat()}"
+
+
+def report_tag(report_id: Any) -> str:
+    """Etiqueta de un reporte específico"""
+    return f"report:{report_id}"
+
+
+def date_range_tags(start: date, end: date) -> List[str]:
+    """Etiquetas para una respuesta que cubre el rango [start, end]"""
+    if start > end:
+        start, end = end, start
+    days = (end - start).days
+    if days >= MAX_TAGGED_DAYS:
+        return [DATES_TAG]
+    return [DATES_TAG] + [date_tag(start + timedelta(days=i)) for i in range(days + 1)]
+
+
+class MemoryCacheBackend:
+    """LRU en memoria del proceso, acotado por cantidad de entradas y bytes"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (expira, tamaño, valor, etiquetas)
+        self._entries: "OrderedDict[str, Tuple[float, int, Any, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._versions: Dict[str, int] = {}
+        self._modified: Dict[str, float] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Los contadores viven en el proceso: un reinicio cambia la época
+        self.epoch = uuid.uuid4().hex[:12]
+        self._started_at = time.time()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key: str, value: Any, serialized: str, tags: Iterable[str], ttl: int) -> None:
+        size = len(serialized)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            tags = tuple(tags)
+            self._entries[key] = (time.monotonic() + ttl, size, value, tags)
+            self._bytes += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            # Desalojar las menos usadas recientemente
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        _, size, _, tags = self._entries.pop(key)
+        self._bytes -= size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys: Set[str] = set()
+            now = time.time()
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+                self._modified[tag] = now
+                keys |= self._tags.get(tag, set())
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+            return len(keys)
+
+    def tag_state(self, tags: Iterable[str]) -> Tuple[List[int], float]:
+        """Contador de escrituras por etiqueta y última modificación (epoch)"""
+        with self._lock:
+            tags = list(tags)
+            modified = [self._modified.get(tag, self._started_at) for tag in tags]
+            return [self._versions.get(tag, 0) for tag in tags], max(modified, default=self._started_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "memory_bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_memory_bytes": self.max_bytes,
+                "tags": len(self._tags),
+            }
+
+
+class RedisCacheBackend:
+    """Cache compartido en Redis; cada etiqueta es un SET con las claves asociadas"""
+
+    name = "redis"
+    PREFIX = "respcache:"
+
+    def __init__(self, client):
+        self.client = client
+        # Época compartida por todos los workers; cambia si se vacía Redis
+        epoch_key = f"{self.PREFIX}epoch"
+        self.client.set(epoch_key, f"{uuid.uuid4().hex[:12]}:{time.time()}", nx=True)
+        self.epoch, started_at = self.client.get(epoch_key).split(":", 1)
+        self._started_at = float(started_at)
+
+    def _key(self, key: str) -> str:
+        return f"{self.PREFIX}entry:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.PREFIX}tag:{tag}"
+
+    def _version_key(self, tag: str) -> str:
+        return f"{self.PREFIX}ver:{tag}"
+
+    def _modified_key(self, tag: str) -> str:
+        return f"{self.PREFIX}mod:{tag}"
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self._key(key))
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, serialized: str, tags: Iterable[str], ttl: int) -> None:
+        entry_key = self._key(key)
+        pipe = self.client.pipeline()
+        pipe.setex(entry_key, ttl, serialized)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), entry_key)
+            pipe.expire(self._tag_key(tag), ttl)
+        pipe.execute()
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            members = self.client.smembers(tag_key)
+            pipe = self.client.pipeline()
+            pipe.incr(self._version_key(tag))
+            pipe.set(self._modified_key(tag), time.time())
+            if members:
+                pipe.delete(*members)
+            pipe.delete(tag_key)
+            pipe.execute()
+            removed += len(members)
+        return removed
+
+    def tag_state(self, tags: Iterable[str]) -> Tuple[List[int], float]:
+        """Contador de escrituras por etiqueta y última modificación (epoch)"""
+        tags = list(tags)
+        if not tags:
+            return [], self._started_at
+        values = self.client.mget(
+            [self._version_key(tag) for tag in tags] + [self._modified_key(tag) for tag in tags]
+        )
+        versions = [int(v or 0) for v in values[:len(tags)]]
+        modified = max((float(v) for v in values[len(tags):] if v), default=self._started_at)
+        return versions, max(modified, self._started_at)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.PREFIX}entry:*"))
+        keys += list(self.client.scan_iter(match=f"{self.PREFIX}tag:*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> Dict[str, Any]:
+        entries = sum(1 for _ in self.client.scan_iter(match=f"{self.PREFIX}entry:*", count=500))
+        memory = self.client.info("memory")
+        return {
+            "entries": entries,
+            "memory_bytes": memory.get("used_memory"),
+            "max_memory_bytes": memory.get("maxmemory") or None,
+        }
+
+
+class ResponseCache:
+    """Cache de respuestas con invalidación por etiquetas"""
+
+    def __init__(self, backend=None, ttl_seconds: Optional[int] = None, enabled: Optional[bool] = None):
+        """
+        Inicializar el cache
+
+        Args:
+            backend: Backend explícito (por defecto Redis si hay REDIS_URL, si no memoria)
+            ttl_seconds: Vida máxima de una entrada (red de seguridad ante
+                ediciones del Excel fuera de la API)
+            enabled: Activar/desactivar el cache (por defecto settings.cache_enabled)
+        """
+        self.enabled = settings.cache_enabled if enabled is None else enabled
+        self.ttl_seconds = ttl_seconds or settings.cache_ttl_seconds
+        self._backend = backend
+        self._backend_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.errors = 0
+
+    @property
+    def backend(self):
+        """Backend creado en el primer uso (no conecta a Redis al importar)"""
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = self._create_backend()
+        return self._backend
+
+    @staticmethod
+    def _create_backend():
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            try:
+                import redis
+
+                client = redis.from_url(redis_url, decode_responses=True, socket_connect_timeout=2)
+                client.ping()
+                logger.info("Cache de respuestas usando Redis")
+                return RedisCacheBackend(client)
+            except Exception as e:
+                logger.warning(f"Redis no disponible para el cache de respuestas ({e}), usando memoria")
+
+        return MemoryCacheBackend(
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.cache_max_memory_mb * 1024 * 1024
+        )
+
+    @staticmethod
+    def make_key(namespace: str, **params: Any) -> str:
+        """Clave estable para endpoint + parámetros (se omiten los None)"""
+        items = sorted(
+            (name, value.isoformat() if isinstance(value, date) else str(value))
+            for name, value in params.items()
+            if value is not None
+        )
+        return f"{namespace}?{urlencode(items)}" if items else namespace
+
+    def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        tags: Iterable[str],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Devolver la respuesta cacheada o calcularla y guardarla
+
+        Si alguna etiqueta se invalida mientras se calcula, el resultado se
+        devuelve pero no se guarda (evita cachear datos anteriores a la escritura).
+        Los valores None no se cachean.
+        """
+        if not self.enabled:
+            return compute()
+
+        tags = list(tags)
+        try:
+            cached = self.backend.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            versions = self.backend.tag_state(tags)[0]
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Error leyendo del cache ({key}): {e}")
+            return compute()
+
+        self.misses += 1
+        value = compute()
+        if value is None:
+            return value
+
+        try:
+            if self.backend.tag_state(tags)[0] == versions:
+                serialized = json.dumps(value, default=str)
+                self.backend.set(key, value, serialized, tags, ttl or self.ttl_seconds)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Error guardando en el cache ({key}): {e}")
+        return value
+
+    def validators(self, key: str, tags: Iterable[str], ttl: Optional[int] = None) -> Tuple[str, datetime]:
+        """
+        ETag y Last-Modified de un recurso a partir de los contadores de sus etiquetas
+
+        No consulta la base de datos ni el Excel. El ETag también cambia al
+        terminar cada ventana de TTL para que las ediciones hechas fuera de la
+        API (Excel manual, scripts de sincronización) se vean como máximo con
+        el mismo retraso que el cache.
+        """
+        ttl = ttl or self.ttl_seconds
+        versions, modified = self.backend.tag_state(tags)
+        bucket = int(time.time() // ttl)
+        modified = max(modified, bucket * ttl)
+
+        digest = hashlib.sha1(
+            f"{self.backend.epoch}|{key}|{bucket}|{versions}".encode("utf-8")
+        ).hexdigest()[:20]
+        # Redondeo hacia arriba: HTTP-date tiene resolución de segundos
+        last_modified = datetime.fromtimestamp(math.ceil(modified), tz=timezone.utc)
+        return f'W/"{digest}"', last_modified
+
+    def invalidate(self, *tags: str) -> int:
+        """Eliminar las entradas asociadas a las etiquetas"""
+        if not self.enabled or not tags:
+            return 0
+        try:
+            removed = self.backend.invalidate_tags(tags)
+            self.invalidated += removed
+            return removed
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error invalidando el cache ({', '.join(tags)}): {e}")
+            return 0
+
+    def clear(self) -> None:
+        """Vaciar el cache"""
+        self.backend.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Aciertos, fallos, tasa de acierto y uso de memoria"""
+        lookups = self.hits + self.misses
+        stats = {
+            "enabled": self.enabled,
+            "backend": self.backend.name if self.enabled else None,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "invalidated": self.invalidated,
+            "errors": self.errors,
+        }
+        if self.enabled:
+            try:
+                stats.update(self.backend.stats())
+            except Exception as e:
+                logger.warning(f"Error obteniendo estadísticas del backend de cache: {e}")
+        return stats
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparación débil de If-None-Match (lista separada por comas o *)"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    key: str,
+    tags: Iterable[str],
+    ttl: Optional[int] = None
+) -> Optional[Response]:
+    """
+    GET condicional con ETag / Last-Modified
+
+    Agrega los validadores a la respuesta y devuelve un 304 si el cliente ya
+    tiene la versión actual (el handler debe retornarlo sin calcular nada).
+    Con el cache desactivado no hay contadores fiables y no se emiten validadores.
+    """
+    if not response_cache.enabled:
+        return None
+
+    try:
+        etag, last_modified = response_cache.validators(key, tags, ttl)
+    except Exception as e:
+        logger.warning(f"Error calculando validadores HTTP ({key}): {e}")
+        return None
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        # El navegador revalida siempre; Cloudflare no debe compartir la respuesta
+        "Cache-Control": "private, no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    not_modified = False
+    if if_none_match:
+        not_modified = _etag_matches(if_none_match, etag)
+    elif if_modified_since:
+        try:
+            not_modified = last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            not_modified = False
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
+def invalidate_report_write(report_date: Optional[date] = None, report_id: Any = None) -> int:
+    """
+    Invalidar lo que cambia al crear, editar o eliminar un reporte
+
+    Sin fecha conocida se invalidan todas las entradas asociadas a fechas.
+    """
+    tags = [REPORTS_TAG, ANALYTICS_TAG, date_tag(report_date) if report_date else DATES_TAG]
+    if report_id is not None:
+        tags.append(report_tag(report_id))
+    return response_cache.invalidate(*tags)
+
+
+# Instancia global
+response_cache = ResponseCache()
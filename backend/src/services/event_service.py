@@ -0,0 +1,158 @@
+"""
+Eventos en vivo de reportes (Server-Sent Events)
+
+Las rutas de escritura publican eventos compactos (report.created,
+report.updated, report.deleted con id, administrador, operación y fecha) y
+GET /api/v1/events los entrega a los navegadores conectados. Así el estado
+del día y el dashboard se actualizan sin volver a consultar a ciegas.
+
+Con REDIS_URL los eventos pasan por un canal pub/sub de Redis, de modo que
+todos los workers/instancias los reciben; sin Redis el reparto es en proceso.
+
+Cada suscriptor tiene una cola acotada: si un cliente no consume a tiempo se
+descartan sus eventos pendientes y recibe `resync` (debe recargar los datos).
+"""
+import asyncio
+import itertools
+import json
+import logging
+import os
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+REPORT_CREATED = "report.created"
+REPORT_UPDATED = "report.updated"
+REPORT_DELETED = "report.deleted"
+RESYNC = "resync"
+
+REDIS_CHANNEL = "reportes:eventos"
+SUBSCRIBER_QUEUE_SIZE = 100
+KEEPALIVE_SECONDS = 15
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class EventBroadcaster:
+    """Reparte eventos a los suscriptores SSE del proceso (y vía Redis entre procesos)"""
+
+    def __init__(self):
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+        self._ids = itertools.count(1)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def start(self) -> None:
+        """Registrar el loop y, si hay REDIS_URL, escuchar el canal pub/sub"""
+        self._loop = asyncio.get_running_loop()
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url:
+            return
+        try:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(redis_url, decode_responses=True, socket_connect_timeout=2)
+            await self._redis.ping()
+            self._listener = asyncio.create_task(self._listen_redis())
+            logger.info("Eventos en vivo usando Redis pub/sub")
+        except Exception as e:
+            self._redis = None
+            logger.warning(f"Redis no disponible para eventos ({e}), reparto en proceso")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+        if self._redis is not None:
+            await self._redis.close()
+
+    async def _listen_redis(self) -> None:
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(REDIS_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._deliver(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Suscripción a eventos en Redis interrumpida: {e}")
+                # Los clientes pudieron perder eventos mientras tanto
+                self._deliver({"type": RESYNC})
+                await asyncio.sleep(2)
+
+    def publish(self, event_type: str, **data: Any) -> None:
+        """
+        Publicar un evento (seguro desde cualquier hilo)
+
+        No lanza excepciones: un fallo al notificar no debe afectar la escritura.
+        """
+        if self._loop is None or self._loop.is_closed():
+            return
+        event = {"type": event_type, **{k: _jsonable(v) for k, v in data.items()}}
+        try:
+            self._loop.call_soon_threadsafe(self._dispatch, event)
+        except RuntimeError:
+            pass
+
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        if self._redis is None:
+            self._deliver(event)
+            return
+
+        async def send():
+            try:
+                await self._redis.publish(REDIS_CHANNEL, json.dumps(event))
+            except Exception as e:
+                logger.warning(f"No se pudo publicar el evento en Redis ({e}), reparto local")
+                self._deliver(event)
+
+        asyncio.ensure_future(send())
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        sequence = next(self._ids)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait((sequence, event))
+            except asyncio.QueueFull:
+                # Cliente lento: descartar lo pendiente y pedirle que recargue
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait((sequence, {"type": RESYNC}))
+
+    async def stream(self, is_disconnected) -> AsyncIterator[str]:
+        """Generador SSE para un cliente: eventos y comentarios de keep-alive"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        try:
+            # Reintento del EventSource si se corta la conexión
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    sequence, event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                payload = json.dumps(event, ensure_ascii=False)
+                yield f"id: {sequence}\nevent: {event['type']}\ndata: {payload}\n\n"
+        finally:
+            self._subscribers.discard(queue)
+
+
+event_broadcaster = EventBroadcaster()
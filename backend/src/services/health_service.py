@@ -0,0 +1,152 @@
+"""
+Estado de salud del servicio para las sondas de liveness/readiness
+
+Un worker en segundo plano sondea cada settings.health_probe_interval_seconds:
+- PostgreSQL: SELECT 1 por un engine con NullPool (no usa el pool de la app)
+- Redis: PING, solo si REDIS_URL está definido
+- Excel: el archivo existe y es legible/escribible (sin abrir el libro)
+
+/health/ready devuelve el último resultado en memoria, así que las sondas de
+Docker y del túnel no hacen I/O ni toman conexiones. Los cambios de estado
+se registran una vez (no en cada sonda).
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+HEALTHY = "healthy"
+UNHEALTHY = "unhealthy"
+NOT_CONFIGURED = "not_configured"
+
+
+class HealthMonitor:
+    """Resultado cacheado de las sondas de dependencias"""
+
+    def __init__(self, interval_seconds: int = 15, timeout_seconds: int = 3):
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.database_enabled = False
+        self._components: Dict[str, Dict[str, Any]] = {}
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._db_engine = None
+        self._redis_client = None
+
+    # Sondas (se ejecutan en un hilo)
+    def _probe_database(self) -> str:
+        if not self.database_enabled:
+            return NOT_CONFIGURED
+        from sqlalchemy import create_engine, text
+        from sqlalchemy.pool import NullPool
+
+        if self._db_engine is None:
+            from ..database.connection import DATABASE_URL
+
+            connect_args = {}
+            if DATABASE_URL.startswith("postgresql"):
+                connect_args["connect_timeout"] = self.timeout_seconds
+            self._db_engine = create_engine(DATABASE_URL, poolclass=NullPool, connect_args=connect_args)
+        with self._db_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return HEALTHY
+
+    def _probe_redis(self) -> str:
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url:
+            return NOT_CONFIGURED
+        if self._redis_client is None:
+            import redis
+
+            self._redis_client = redis.from_url(
+                redis_url, socket_connect_timeout=self.timeout_seconds, socket_timeout=self.timeout_seconds
+            )
+        self._redis_client.ping()
+        return HEALTHY
+
+    @staticmethod
+    def _probe_excel() -> str:
+        path = settings.excel_file_path
+        if path.exists():
+            if not os.access(path, os.R_OK | os.W_OK):
+                raise PermissionError(f"Sin permisos de lectura/escritura sobre {path}")
+        elif not os.access(path.parent, os.W_OK):
+            # El libro se crea al primer uso: basta con poder escribir el directorio
+            raise PermissionError(f"No existe {path} y el directorio no es escribible")
+        return HEALTHY
+
+    def _run_probe(self, probe: Callable[[], str]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            status, error = probe(), None
+        except Exception as e:
+            status, error = UNHEALTHY, str(e)[:200]
+        result = {"status": status, "latency_ms": round((time.perf_counter() - start) * 1000, 1)}
+        if error:
+            result["error"] = error
+        return result
+
+    def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """Ejecutar todas las sondas y registrar los cambios de estado"""
+        components = {
+            "database": self._run_probe(self._probe_database),
+            "redis": self._run_probe(self._probe_redis),
+            "excel": self._run_probe(self._probe_excel),
+        }
+        with self._lock:
+            previous = self._components
+            self._components = components
+            self._checked_at = time.time()
+
+        for name, result in components.items():
+            before = previous.get(name, {}).get("status")
+            if result["status"] == before:
+                continue
+            if result["status"] == UNHEALTHY:
+                logger.warning(f"Health: {name} no disponible ({result.get('error')})")
+            elif before is not None:
+                logger.info(f"Health: {name} {before} -> {result['status']}")
+        return components
+
+    async def run(self) -> None:
+        """Worker: refrescar el estado cada interval_seconds"""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.error(f"Error en las sondas de salud: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Último estado conocido (sin I/O)"""
+        with self._lock:
+            components = dict(self._components)
+            checked_at = self._checked_at
+
+        if checked_at is None:
+            return {"ready": False, "status": "starting", "components": {}, "checked_at": None}
+
+        age = time.time() - checked_at
+        # Si el worker dejó de refrescar, el resultado ya no es confiable
+        stale = age > self.interval_seconds * 3 + self.timeout_seconds * 3
+        ready = not stale and all(c["status"] != UNHEALTHY for c in components.values())
+        return {
+            "ready": ready,
+            "status": "stale" if stale else ("ready" if ready else "not_ready"),
+            "components": components,
+            "checked_at": datetime.fromtimestamp(checked_at).isoformat(),
+            "age_seconds": round(age, 1),
+        }
+
+
+health_monitor = HealthMonitor(
+    interval_seconds=settings.health_probe_interval_seconds,
+    timeout_seconds=settings.health_probe_timeout_seconds
+)
@@ -0,0 +1,620 @@
+"""
+Vistas 1-4 del area admin (operaciones diarias y acumuladas) sobre PostgreSQL
+
+Mismos cálculos que excel_handler (get_daily_general_operations,
+get_daily_detailed_operations, get_accumulated_general_operations,
+get_accumulated_detailed_operations) con consultas por conjuntos: los
+agregados salen de un GROUP BY client_operation sobre reports y las listas
+con origen de un join incidents/movements -> reports para todo el período,
+con desencriptación en lote. La salida tiene la misma forma que la de Excel.
+
+settings.operations_views_source elige la fuente de las vistas:
+- "excel": libro de Excel (comportamiento actual)
+- "postgres": esta implementación
+- "shadow": responde con Excel y, en una muestra de requests
+  (settings.operations_shadow_sample_rate), calcula también la versión
+  PostgreSQL en segundo plano, compara ambas y registra latencias y diferencias
+"""
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytz
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database.connection import SessionLocal
+from ..database.models import Report, Incident, Movement
+from ..models import (
+    DailyGeneralOperationsResponse, DailyDetailedOperationsResponse,
+    AccumulatedGeneralOperationsResponse, AccumulatedDetailedOperationsResponse
+)
+from ..security.encryption import field_encryptor, FieldEncryptor
+from ..utils.date_utils import get_local_today
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS_VIEW_SOURCES = ("excel", "postgres", "shadow")
+
+# Modelo de respuesta de cada vista (normaliza ambas salidas antes de comparar)
+VIEW_RESPONSE_MODELS = {
+    "get_daily_general_operations": DailyGeneralOperationsResponse,
+    "get_daily_detailed_operations": DailyDetailedOperationsResponse,
+    "get_accumulated_general_operations": AccumulatedGeneralOperationsResponse,
+    "get_accumulated_detailed_operations": AccumulatedDetailedOperationsResponse,
+}
+
+# Diferencias que se registran por comparación
+MAX_LOGGED_DIFFERENCES = 5
+
+
+def _local_datetime(value: Optional[datetime]) -> Optional[datetime]:
+    """Datetime naive en la timezone local (como Fecha_Creacion en Excel)"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = pytz.UTC.localize(value)
+    return value.astimezone(pytz.timezone(settings.timezone)).replace(tzinfo=None)
+
+
+def _local_day_iso(value: Optional[datetime]) -> Optional[str]:
+    """Día local a medianoche en ISO (las vistas acumuladas truncan a fecha)"""
+    local = _local_datetime(value)
+    if local is None:
+        return None
+    return local.strftime('%Y-%m-%dT00:00:00')
+
+
+class PostgresOperationsViews:
+    """Vistas 1-4 calculadas con consultas agrupadas en PostgreSQL"""
+
+    def __init__(self, db: Session, encryptor: FieldEncryptor = field_encryptor):
+        self.db = db
+        self.encryptor = encryptor
+
+    # --- Consultas por período -------------------------------------------
+
+    @staticmethod
+    def _in_period(fecha_inicio: date, fecha_fin: date):
+        return Report.report_date.between(fecha_inicio, fecha_fin)
+
+    def _operation_totals(self, fecha_inicio: date, fecha_fin: date) -> Dict[str, Dict[str, Any]]:
+        """Conteo, sumas y promedios por operación (un GROUP BY)"""
+        rows = (
+            self.db.query(
+                Report.client_operation,
+                func.count(Report.id).label("num_reportes"),
+                func.sum(Report.daily_hours).label("horas"),
+                func.avg(Report.daily_hours).label("promedio_horas"),
+                func.sum(Report.staff_personnel).label("staff"),
+                func.sum(Report.base_personnel).label("base"),
+                func.avg(Report.staff_personnel).label("promedio_staff"),
+                func.avg(Report.base_personnel).label("promedio_base"),
+            )
+            .filter(self._in_period(fecha_inicio, fecha_fin))
+            .group_by(Report.client_operation)
+            .all()
+        )
+        return {
+            row.client_operation: {
+                "num_reportes": row.num_reportes,
+                "horas": float(row.horas or 0),
+                "promedio_horas": float(row.promedio_horas or 0),
+                "staff": int(row.staff or 0),
+                "base": int(row.base or 0),
+                "promedio_staff": float(row.promedio_staff or 0),
+                "promedio_base": float(row.promedio_base or 0),
+            }
+            for row in rows
+        }
+
+    def _operation_administrators(self, fecha_inicio: date, fecha_fin: date) -> Dict[str, List[str]]:
+        """Administradores distintos por operación"""
+        rows = (
+            self.db.query(Report.client_operation, Report.administrator)
+            .filter(self._in_period(fecha_inicio, fecha_fin))
+            .distinct()
+            .all()
+        )
+        administrators: Dict[str, List[str]] = {}
+        for operation, administrator in rows:
+            administrators.setdefault(operation, []).append(administrator)
+        return {operation: sorted(names) for operation, names in administrators.items()}
+
+    def _incidents(self, fecha_inicio: date, fecha_fin: date) -> List[Dict[str, Any]]:
+        """Incidencias del período con el origen del reporte padre"""
+        rows = (
+            self.db.query(
+                Incident.incident_type,
+                Incident.employee_name,
+                Incident.end_date,
+                Incident.created_at,
+                Report.administrator,
+                Report.client_operation,
+                Report.created_at.label("report_created_at"),
+            )
+            .join(Report, (Incident.report_id == Report.id) & (Incident.report_date == Report.report_date))
+            .filter(self._in_period(fecha_inicio, fecha_fin))
+            .order_by(Report.created_at, Incident.created_at, Incident.id)
+            .all()
+        )
+        return self.encryptor.decrypt_many_dict_fields([dict(row._mapping) for row in rows], "incidents")
+
+    def _movements(self, fecha_inicio: date, fecha_fin: date) -> List[Dict[str, Any]]:
+        """Movimientos del período con el origen del reporte padre"""
+        rows = (
+            self.db.query(
+                Movement.employee_name,
+                Movement.position,
+                Movement.movement_type,
+                Movement.created_at,
+                Report.administrator,
+                Report.client_operation,
+                Report.created_at.label("report_created_at"),
+            )
+            .join(Report, (Movement.report_id == Report.id) & (Movement.report_date == Report.report_date))
+            .filter(self._in_period(fecha_inicio, fecha_fin))
+            .order_by(Report.created_at, Movement.created_at, Movement.id)
+            .all()
+        )
+        return self.encryptor.decrypt_many_dict_fields([dict(row._mapping) for row in rows], "movements")
+
+    def _relevant_facts(self, fecha_inicio: date, fecha_fin: date) -> List[Dict[str, Any]]:
+        """Hechos relevantes no vacíos del período (se desencriptan antes de filtrar)"""
+        rows = (
+            self.db.query(
+                Report.relevant_facts,
+                Report.administrator,
+                Report.client_operation,
+                Report.created_at,
+            )
+            .filter(self._in_period(fecha_inicio, fecha_fin), Report.relevant_facts.isnot(None))
+            .order_by(Report.created_at)
+            .all()
+        )
+        facts = self.encryptor.decrypt_many_dict_fields([dict(row._mapping) for row in rows], "reports")
+        for fact in facts:
+            fact["relevant_facts"] = (fact["relevant_facts"] or "").strip()
+        return [fact for fact in facts if fact["relevant_facts"]]
+
+    # --- Formato de las listas con origen ---------------------------------
+
+    @staticmethod
+    def _incident_item(row: Dict[str, Any], fecha_registro: Any) -> Dict[str, Any]:
+        return {
+            "tipo": row["incident_type"] or "",
+            "nombre_empleado": row["employee_name"] or "",
+            "fecha_fin": row["end_date"],
+            "administrador": row["administrator"],
+            "cliente_operacion": row["client_operation"],
+            "fecha_registro": fecha_registro,
+        }
+
+    @staticmethod
+    def _movement_item(row: Dict[str, Any], fecha_registro: Any) -> Dict[str, Any]:
+        return {
+            "nombre_empleado": row["employee_name"] or "",
+            "cargo": row["position"] or "",
+            "estado": row["movement_type"] or "",
+            "administrador": row["administrator"],
+            "cliente_operacion": row["client_operation"],
+            "fecha_registro": fecha_registro,
+        }
+
+    @staticmethod
+    def _fact_item(row: Dict[str, Any], fecha_registro: Any) -> Dict[str, Any]:
+        return {
+            "hecho": row["relevant_facts"],
+            "administrador": row["administrator"],
+            "cliente_operacion": row["client_operation"],
+            "fecha_registro": fecha_registro,
+        }
+
+    def _daily_lists(self, target_date: date, own_timestamps: bool) -> Tuple[list, list, list]:
+        """
+        Listas con origen de un día
+
+        Vista 1 fecha cada elemento con la creación del reporte; Vista 2 usa la
+        fecha de registro de la propia incidencia o movimiento.
+        """
+        child_key = "created_at" if own_timestamps else "report_created_at"
+        incidents = [
+            self._incident_item(row, _local_datetime(row[child_key]))
+            for row in self._incidents(target_date, target_date)
+        ]
+        movements = [
+            self._movement_item(row, _local_datetime(row[child_key]))
+            for row in self._movements(target_date, target_date)
+        ]
+        facts = [
+            self._fact_item(row, _local_datetime(row["created_at"]))
+            for row in self._relevant_facts(target_date, target_date)
+        ]
+        return incidents, movements, facts
+
+    def _period_lists(self, fecha_inicio: date, fecha_fin: date) -> Tuple[list, list, list]:
+        """Listas con origen de un período (fecha de registro truncada al día)"""
+        incidents = [
+            self._incident_item(row, _local_day_iso(row["created_at"]))
+            for row in self._incidents(fecha_inicio, fecha_fin)
+        ]
+        movements = [
+            self._movement_item(row, _local_day_iso(row["created_at"]))
+            for row in self._movements(fecha_inicio, fecha_fin)
+        ]
+        facts = [
+            self._fact_item(row, _local_day_iso(row["created_at"]))
+            for row in self._relevant_facts(fecha_inicio, fecha_fin)
+        ]
+        return incidents, movements, facts
+
+    @staticmethod
+    def _by_operation(items: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            grouped.setdefault(item["cliente_operacion"], []).append(item)
+        return grouped
+
+    # --- Vistas ---------------------------------------------------------
+
+    def get_daily_general_operations(self, target_date: date) -> Dict[str, Any]:
+        """Vista 1: Operación General Diaria"""
+        totals = self._operation_totals(target_date, target_date)
+        descripcion = f"Operación General para {target_date.strftime('%d de %B de %Y')}"
+        if not totals:
+            return {
+                "fecha": target_date,
+                "periodo_descripcion": descripcion,
+                "promedio_horas_diarias": 0.0,
+                "total_personal_staff": 0,
+                "total_personal_base": 0,
+                "incidencias": [],
+                "movimientos": [],
+                "hechos_relevantes": [],
+                "total_reportes": 0,
+                "operaciones_reportadas": [],
+                "total_incidencias": 0,
+                "total_movimientos": 0
+            }
+
+        total_reportes = sum(op["num_reportes"] for op in totals.values())
+        total_horas = sum(op["horas"] for op in totals.values())
+        incidencias, movimientos, hechos = self._daily_lists(target_date, own_timestamps=False)
+
+        return {
+            "fecha": target_date,
+            "periodo_descripcion": descripcion,
+            "promedio_horas_diarias": round(total_horas / total_reportes, 2),
+            "total_personal_staff": sum(op["staff"] for op in totals.values()),
+            "total_personal_base": sum(op["base"] for op in totals.values()),
+            "incidencias": incidencias,
+            "movimientos": movimientos,
+            "hechos_relevantes": hechos,
+            "total_reportes": total_reportes,
+            "operaciones_reportadas": sorted(totals),
+            "total_incidencias": len(incidencias),
+            "total_movimientos": len(movimientos)
+        }
+
+    def get_daily_detailed_operations(self, target_date: date) -> Dict[str, Any]:
+        """Vista 2: Detalle Diario por Operaciones"""
+        totals = self._operation_totals(target_date, target_date)
+        descripcion = f"Detalle por Operaciones para {target_date.strftime('%d de %B de %Y')}"
+        if not totals:
+            return {
+                "fecha": target_date,
+                "periodo_descripcion": descripcion,
+                "operaciones": [],
+                "total_operaciones": 0,
+                "total_reportes": 0
+            }
+
+        administradores = self._operation_administrators(target_date, target_date)
+        incidencias, movimientos, hechos = (
+            self._by_operation(items) for items in self._daily_lists(target_date, own_timestamps=True)
+        )
+
+        operaciones = []
+        for operacion in sorted(totals):
+            op = totals[operacion]
+            num_reportes = op["num_reportes"]
+            op_incidencias = incidencias.get(operacion, [])
+            op_movimientos = movimientos.get(operacion, [])
+            op_hechos = hechos.get(operacion, [])
+            operaciones.append({
+                "cliente_operacion": operacion,
+                "administradores": administradores.get(operacion, []),
+                "horas_diarias": round(op["promedio_horas"], 2) if num_reportes == 1 else round(op["horas"], 2),
+                "es_promedio_horas": num_reportes > 1,
+                "personal_staff": op["staff"],
+                "personal_base": op["base"],
+                "incidencias": op_incidencias,
+                "movimientos": op_movimientos,
+                "hechos_relevantes": op_hechos,
+                "num_reportes": num_reportes,
+                "total_incidencias": len(op_incidencias),
+                "total_movimientos": len(op_movimientos),
+                "total_hechos_relevantes": len(op_hechos)
+            })
+
+        return {
+            "fecha": target_date,
+            "periodo_descripcion": descripcion,
+            "operaciones": operaciones,
+            "total_operaciones": len(operaciones),
+            "total_reportes": sum(op["num_reportes"] for op in totals.values())
+        }
+
+    def get_accumulated_general_operations(self, fecha_inicio=None, fecha_fin=None) -> Dict[str, Any]:
+        """Vista 3: Operación General Acumulado"""
+        fecha_inicio, fecha_fin = self._period(fecha_inicio, fecha_fin)
+        totals = self._operation_totals(fecha_inicio, fecha_fin)
+        if not totals:
+            return {
+                "fecha_inicio": fecha_inicio,
+                "fecha_fin": fecha_fin,
+                "periodo_descripcion": f"Período {fecha_inicio.strftime('%d/%m/%Y')} - {fecha_fin.strftime('%d/%m/%Y')} (Sin datos)",
+                "promedio_horas_diarias": 0.0,
+                "total_personal_staff": 0,
+                "total_personal_base": 0,
+                "total_reportes": 0,
+                "total_incidencias": 0,
+                "total_movimientos": 0,
+                "total_hechos_relevantes": 0,
+                "operaciones_reportadas": [],
+                "incidencias": [],
+                "movimientos": [],
+                "hechos_relevantes": []
+            }
+
+        total_reportes = sum(op["num_reportes"] for op in totals.values())
+        total_horas = sum(op["horas"] for op in totals.values())
+        incidencias, movimientos, hechos = self._period_lists(fecha_inicio, fecha_fin)
+
+        if fecha_inicio == fecha_fin:
+            periodo_desc = f"Datos para {fecha_inicio.strftime('%d de %B de %Y')}"
+        else:
+            periodo_desc = f"Período {fecha_inicio.strftime('%d/%m/%Y')} - {fecha_fin.strftime('%d/%m/%Y')}"
+
+        return {
+            "fecha_inicio": fecha_inicio,
+            "fecha_fin": fecha_fin,
+            "periodo_descripcion": periodo_desc,
+            "promedio_horas_diarias": round(total_horas / total_reportes, 1),
+            "total_personal_staff": sum(op["staff"] for op in totals.values()),
+            "total_personal_base": sum(op["base"] for op in totals.values()),
+            "total_reportes": total_reportes,
+            "total_incidencias": len(incidencias),
+            "total_movimientos": len(movimientos),
+            "total_hechos_relevantes": len(hechos),
+            "operaciones_reportadas": sorted(totals),
+            "incidencias": incidencias,
+            "movimientos": movimientos,
+            "hechos_relevantes": hechos
+        }
+
+    def get_accumulated_detailed_operations(self, fecha_inicio=None, fecha_fin=None) -> Dict[str, Any]:
+        """Vista 4: Detalle Acumulado por Operaciones"""
+        fecha_inicio, fecha_fin = self._period(fecha_inicio, fecha_fin)
+        totals = self._operation_totals(fecha_inicio, fecha_fin)
+        if not totals:
+            return {
+                "fecha_inicio": fecha_inicio,
+                "fecha_fin": fecha_fin,
+                "periodo_descripcion": f"Período {fecha_inicio.strftime('%d/%m/%Y')} - {fecha_fin.strftime('%d/%m/%Y')} (Sin datos)",
+                "operaciones": [],
+                "total_operaciones": 0,
+                "total_reportes": 0
+            }
+
+        administradores = self._operation_administrators(fecha_inicio, fecha_fin)
+        incidencias, movimientos, hechos = (
+            self._by_operation(items) for items in self._period_lists(fecha_inicio, fecha_fin)
+        )
+
+        operaciones = []
+        for operacion in sorted(totals):
+            op = totals[operacion]
+            op_incidencias = incidencias.get(operacion, [])
+            op_movimientos = movimientos.get(operacion, [])
+            op_hechos = hechos.get(operacion, [])
+            operaciones.append({
+                "cliente_operacion": operacion,
+                "administradores": administradores.get(operacion, []),
+                "promedio_horas_diarias": round(op["promedio_horas"], 1),
+                "promedio_personal_staff": round(op["promedio_staff"], 1),
+                "promedio_personal_base": round(op["promedio_base"], 1),
+                "incidencias": op_incidencias,
+                "movimientos": op_movimientos,
+                "hechos_relevantes": op_hechos,
+                "num_reportes": op["num_reportes"],
+                "total_incidencias": len(op_incidencias),
+                "total_movimientos": len(op_movimientos),
+                "total_hechos_relevantes": len(op_hechos)
+            })
+
+        if fecha_inicio == fecha_fin:
+            periodo_desc = f"Detalle Acumulado para {fecha_inicio.strftime('%d de %B de %Y')}"
+        else:
+            periodo_desc = f"Detalle Acumulado - Período {fecha_inicio.strftime('%d/%m/%Y')} - {fecha_fin.strftime('%d/%m/%Y')}"
+
+        return {
+            "fecha_inicio": fecha_inicio,
+            "fecha_fin": fecha_fin,
+            "periodo_descripcion": periodo_desc,
+            "operaciones": operaciones,
+            "total_operaciones": len(operaciones),
+            "total_reportes": sum(op["num_reportes"] for op in totals.values())
+        }
+
+    @staticmethod
+    def _period(fecha_inicio: Optional[date], fecha_fin: Optional[date]) -> Tuple[date, date]:
+        """Mismos defaults que excel_handler: hoy, o un solo día"""
+        if fecha_inicio is None:
+            today = get_local_today()
+            return today, today
+        return fecha_inicio, fecha_fin or fecha_inicio
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Forma comparable de una vista ya serializada a JSON
+
+    Ordena las listas (el orden de Excel depende de la hoja y de sets) y
+    compara fecha_registro solo por el día: Excel guarda la hora local de
+    escritura en el libro y PostgreSQL la del servidor.
+    """
+    if isinstance(value, dict):
+        return {
+            key: (item[:10] if key == "fecha_registro" and isinstance(item, str) else _canonical(item))
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        items = [_canonical(item) for item in value]
+        return sorted(items, key=lambda item: json.dumps(item, sort_keys=True, ensure_ascii=False))
+    return value
+
+
+def _differences(expected: Any, actual: Any, path: str = "") -> List[str]:
+    """Rutas en las que difieren dos vistas canónicas"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        found = []
+        for key in sorted(set(expected) | set(actual)):
+            found.extend(_differences(expected.get(key), actual.get(key), f"{path}.{key}" if path else key))
+        return found
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path}: {len(expected)} elementos en Excel, {len(actual)} en PostgreSQL"]
+        found = []
+        for index, (left, right) in enumerate(zip(expected, actual)):
+            found.extend(_differences(left, right, f"{path}[{index}]"))
+        return found
+    if expected != actual:
+        return [f"{path}: Excel={expected!r} PostgreSQL={actual!r}"]
+    return []
+
+
+def _format_args(args: tuple) -> str:
+    return ", ".join(str(arg) for arg in args)
+
+
+class OperationsViews:
+    """
+    Fuente de las vistas 1-4 según settings.operations_views_source
+
+    Expone los mismos métodos que ExcelHandler para que los endpoints no
+    dependan de la fuente. En modo "shadow" la comparación corre en un hilo
+    aparte y nunca afecta la respuesta; si hay una comparación en curso, la
+    muestra se omite en lugar de encolarse.
+    """
+
+    def __init__(
+        self,
+        excel_handler_getter: Callable[[], Any],
+        session_factory: Callable[[], Session] = SessionLocal,
+        source: Optional[str] = None,
+        sample_rate: Optional[float] = None
+    ):
+        self._excel_handler_getter = excel_handler_getter
+        self._session_factory = session_factory
+        source = (source or settings.operations_views_source).lower()
+        if source not in OPERATIONS_VIEW_SOURCES:
+            logger.warning(f"operations_views_source desconocido '{source}', se usa Excel")
+            source = "excel"
+        self.source = source
+        self.sample_rate = settings.operations_shadow_sample_rate if sample_rate is None else sample_rate
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._shadow_slot = threading.Semaphore(1)
+
+    def get_daily_general_operations(self, target_date: date) -> Dict[str, Any]:
+        return self._run("get_daily_general_operations", target_date)
+
+    def get_daily_detailed_operations(self, target_date: date) -> Dict[str, Any]:
+        return self._run("get_daily_detailed_operations", target_date)
+
+    def get_accumulated_general_operations(self, fecha_inicio=None, fecha_fin=None) -> Dict[str, Any]:
+        return self._run("get_accumulated_general_operations", fecha_inicio, fecha_fin)
+
+    def get_accumulated_detailed_operations(self, fecha_inicio=None, fecha_fin=None) -> Dict[str, Any]:
+        return self._run("get_accumulated_detailed_operations", fecha_inicio, fecha_fin)
+
+    def _run(self, view: str, *args) -> Dict[str, Any]:
+        if self.source == "postgres":
+            return self._postgres(view, *args)
+
+        start = time.perf_counter()
+        result = getattr(self._excel_handler_getter(), view)(*args)
+        excel_ms = (time.perf_counter() - start) * 1000
+
+        if self.source == "shadow" and random.random() < self.sample_rate:
+            self._submit_shadow(view, args, result, excel_ms)
+        return result
+
+    def _postgres(self, view: str, *args) -> Dict[str, Any]:
+        db = self._session_factory()
+        try:
+            return getattr(PostgresOperationsViews(db), view)(*args)
+        finally:
+            db.close()
+
+    def _submit_shadow(self, view: str, args: tuple, excel_result: Dict[str, Any], excel_ms: float) -> None:
+        if not self._shadow_slot.acquire(blocking=False):
+            logger.debug(f"Comparación de {view} omitida: hay otra en curso")
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="operations-shadow")
+        try:
+            self._executor.submit(self._compare, view, args, excel_result, excel_ms)
+        except RuntimeError:
+            # Executor cerrado (apagado del proceso)
+            self._shadow_slot.release()
+
+    def _compare(self, view: str, args: tuple, excel_result: Dict[str, Any], excel_ms: float) -> None:
+        """Calcular la vista en PostgreSQL y compararla con la de Excel"""
+        try:
+            start = time.perf_counter()
+            postgres_result = self._postgres(view, *args)
+            postgres_ms = (time.perf_counter() - start) * 1000
+
+            model = VIEW_RESPONSE_MODELS[view]
+            expected = _canonical(model(**excel_result).model_dump(mode="json"))
+            actual = _canonical(model(**postgres_result).model_dump(mode="json"))
+            differences = _differences(expected, actual)
+
+            summary = (
+                f"Shadow {view}({_format_args(args)}): excel_ms={excel_ms:.1f} postgres_ms={postgres_ms:.1f} "
+                f"match={not differences}"
+            )
+            if differences:
+                logger.warning(
+                    f"{summary} diferencias={len(differences)}: "
+                    + "; ".join(differences[:MAX_LOGGED_DIFFERENCES])
+                )
+            else:
+                logger.info(summary)
+        except Exception as e:
+            logger.error(f"Shadow {view}({_format_args(args)}): error comparando con PostgreSQL: {e}")
+        finally:
+            self._shadow_slot.release()
+
+
+# Instancia global (se crea en el primer uso)
+_operations_views: Optional[OperationsViews] = None
+_operations_views_lock = threading.Lock()
+
+
+def get_operations_views() -> OperationsViews:
+    """Obtener la fuente de las vistas 1-4"""
+    global _operations_views
+    if _operations_views is None:
+        with _operations_views_lock:
+            if _operations_views is None:
+                from ..dependencies import get_excel_handler
+                _operations_views = OperationsViews(get_excel_handler)
+    return _operations_views
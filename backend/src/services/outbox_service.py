@@ -0,0 +1,267 @@
+"""
+Outbox local para el dual-write Excel -> PostgreSQL
+
+El reporte se confirma primero en Excel (almacenamiento principal) y la
+escritura en PostgreSQL se registra en un journal SQLite dentro de data_dir.
+Un worker en segundo plano drena el journal con reintentos y backoff
+exponencial, de modo que la respuesta no espera a PostgreSQL y una caída de la
+base de datos no pierde filas: quedan pendientes hasta que se puedan aplicar.
+
+Los handlers deben ser idempotentes (p. ej. por legacy_id), porque una entrada
+puede aplicarse más de una vez si el proceso se detiene antes de marcarla.
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Estados de una entrada del outbox
+PENDING = "pending"
+PROCESSING = "processing"
+DONE = "done"
+DEAD = "dead"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    locked_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    processed_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+class OutboxService:
+    """Journal SQLite de escrituras pendientes hacia el almacenamiento secundario"""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_attempts: int = 12,
+        base_delay: float = 2.0,
+        max_delay: float = 600.0,
+        lease_seconds: float = 120.0,
+        retention_seconds: float = 7 * 24 * 3600
+    ):
+        """
+        Inicializar el outbox
+
+        Args:
+            db_path: Ruta del archivo SQLite (por defecto data_dir/outbox.sqlite3)
+            max_attempts: Intentos antes de marcar la entrada como "dead"
+            base_delay: Segundos del primer reintento (se duplica en cada intento)
+            max_delay: Tope del backoff en segundos
+            lease_seconds: Tiempo que una entrada queda reservada por un worker
+            retention_seconds: Antigüedad a partir de la cual se purgan entradas aplicadas
+        """
+        self.db_path = Path(db_path or settings.data_dir / "outbox.sqlite3")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_seconds = lease_seconds
+        self.retention_seconds = retention_seconds
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abrir conexión (una por operación; SQLite serializa las escrituras)"""
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(_SCHEMA)
+                    self._initialized = True
+        return conn
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any]], Any]) -> None:
+        """Registrar el handler (síncrono) que aplica las entradas de un tipo"""
+        self.handlers[kind] = handler
+
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> int:
+        """
+        Registrar una escritura pendiente de forma durable
+
+        Returns:
+            ID de la entrada en el outbox
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "INSERT INTO outbox (kind, payload, next_attempt_at, created_at) VALUES (?, ?, ?, ?)",
+                (kind, json.dumps(payload, default=str), now, now)
+            )
+            entry_id = cursor.lastrowid
+
+        # Despertar al worker si corre en este proceso
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return entry_id
+
+    def _claim_due(self, limit: int) -> List[sqlite3.Row]:
+        """Reservar entradas vencidas (pendientes o con reserva expirada)"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT id, kind, payload, attempts FROM outbox
+                    WHERE (status = ? AND next_attempt_at <= ?)
+                       OR (status = ? AND locked_until <= ?)
+                    ORDER BY id
+                    LIMIT ?
+                    """,
+                    (PENDING, now, PROCESSING, now, limit)
+                ).fetchall()
+                if rows:
+                    conn.executemany(
+                        "UPDATE outbox SET status = ?, locked_until = ? WHERE id = ?",
+                        [(PROCESSING, now + self.lease_seconds, row["id"]) for row in rows]
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def _mark_done(self, entry_id: int) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE outbox SET status = ?, processed_at = ?, locked_until = NULL, last_error = NULL WHERE id = ?",
+                (DONE, time.time(), entry_id)
+            )
+
+    def _mark_failed(self, entry_id: int, attempts: int, error: str) -> str:
+        """Programar reintento con backoff exponencial o marcar como "dead\""""
+        status = DEAD if attempts >= self.max_attempts else PENDING
+        delay = min(self.base_delay * (2 ** (attempts - 1)), self.max_delay)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                """
+                UPDATE outbox
+                SET status = ?, attempts = ?, next_attempt_at = ?, locked_until = NULL, last_error = ?
+                WHERE id = ?
+                """,
+                (status, attempts, time.time() + delay, error[:2000], entry_id)
+            )
+        return status
+
+    def process_due(self, limit: int = 50) -> int:
+        """
+        Aplicar las entradas vencidas (síncrono; se ejecuta en un hilo)
+
+        Returns:
+            Cantidad de entradas aplicadas con éxito
+        """
+        applied = 0
+        for row in self._claim_due(limit):
+            handler = self.handlers.get(row["kind"])
+            attempts = row["attempts"] + 1
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler registered for outbox kind '{row['kind']}'")
+                handler(json.loads(row["payload"]))
+                self._mark_done(row["id"])
+                applied += 1
+            except Exception as e:
+                status = self._mark_failed(row["id"], attempts, str(e))
+                if status == DEAD:
+                    logger.error(f"Outbox {row['id']} ({row['kind']}) descartada tras {attempts} intentos: {e}")
+                else:
+                    logger.warning(f"Outbox {row['id']} ({row['kind']}) falló (intento {attempts}): {e}")
+        return applied
+
+    def purge_done(self) -> int:
+        """Eliminar entradas aplicadas más antiguas que la retención"""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "DELETE FROM outbox WHERE status = ? AND processed_at < ?",
+                (DONE, time.time() - self.retention_seconds)
+            )
+            return cursor.rowcount
+
+    def retry_dead(self) -> int:
+        """Volver a poner en cola las entradas descartadas"""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = ? WHERE status = ?",
+                (PENDING, time.time(), DEAD)
+            )
+            retried = cursor.rowcount
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return retried
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Conteo de entradas por estado y antigüedad de la pendiente más vieja"""
+        with closing(self._connect()) as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+            oldest = conn.execute(
+                "SELECT MIN(created_at) FROM outbox WHERE status IN (?, ?)", (PENDING, PROCESSING)
+            ).fetchone()[0]
+        return {
+            "pending": counts.get(PENDING, 0),
+            "processing": counts.get(PROCESSING, 0),
+            "done": counts.get(DONE, 0),
+            "dead": counts.get(DEAD, 0),
+            "oldest_pending_seconds": round(time.time() - oldest, 1) if oldest else None,
+        }
+
+    async def run_worker(self, poll_interval: float = 5.0, purge_interval: float = 3600.0) -> None:
+        """
+        Worker en segundo plano: drena el outbox hasta que se cancele la tarea
+
+        Se despierta al encolar una entrada o cada poll_interval para reintentos.
+        """
+        self._wakeup = asyncio.Event()
+        last_purge = 0.0
+        logger.info(f"Outbox worker iniciado ({self.db_path})")
+
+        try:
+            while True:
+                self._wakeup.clear()
+                try:
+                    # Drenar en bloques mientras haya trabajo vencido
+                    while await asyncio.to_thread(self.process_due):
+                        pass
+
+                    if time.time() - last_purge > purge_interval:
+                        purged = await asyncio.to_thread(self.purge_done)
+                        if purged:
+                            logger.info(f"Outbox: {purged} entradas aplicadas purgadas")
+                        last_purge = time.time()
+                except Exception as e:
+                    logger.error(f"Error en el worker del outbox: {e}")
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
+            logger.info("Outbox worker detenido")
+
+
+# Instancia global
+outbox = OutboxService()
@@ -0,0 +1,901 @@
+"""
+Servicio de reportes sobre PostgreSQL
+Concentra las consultas, la (des)encriptacion y la serializacion de reportes
+que antes se repetian en cada handler de api.py
+"""
+import logging
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..database.connection import get_db, SessionLocal
+from ..database.models import Report, ReportDeletion, Incident, Movement, User
+from ..models import DailyReportCreate, DailyReportUpdate
+from ..security.encryption import field_encryptor, FieldEncryptor
+from .cache_service import invalidate_report_write
+from .event_service import event_broadcaster, REPORT_CREATED
+from ..utils.date_utils import convert_to_bogota_timezone, get_bogota_now
+
+logger = logging.getLogger(__name__)
+
+# Margen con el que el token de sincronización retrocede al ponerse al día
+SYNC_OVERLAP_SECONDS = 30
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+# Campos del listado (?fields=) -> columna de Report que los alimenta
+REPORT_FIELD_COLUMNS: Dict[str, Optional[str]] = {
+    "ID": "id",
+    "Fecha_Creacion": "created_at",
+    "Administrador": "administrator",
+    "Cliente_Operacion": "client_operation",
+    "Horas_Diarias": "daily_hours",
+    "Personal_Staff": "staff_personnel",
+    "Personal_Base": "base_personnel",
+    "Cantidad_Incidencias": "incident_count",
+    "Cantidad_Ingresos_Retiros": "movement_count",
+    "Hechos_Relevantes": "relevant_facts",
+    "Estado": "status",
+    "IP_Origen": "client_ip",
+    "User_Agent": "user_agent",
+}
+
+# Hijos expandibles (?include=)
+REPORT_INCLUDES = ("incidencias", "ingresos_retiros")
+
+# Orden del listado (?ordenar_por=, descendente); los conteos usan los contadores
+REPORT_SORT_COLUMNS = {
+    "fecha": "created_at",
+    "incidencias": "incident_count",
+    "ingresos_retiros": "movement_count",
+}
+
+
+def _split_param(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def parse_report_projection(fields: Optional[str], include: Optional[str]) -> tuple:
+    """
+    Interpretar ?fields= e ?include= (listas separadas por comas)
+
+    Sin ninguno de los dos devuelve (None, None): reporte completo con hijos.
+    Con alguno, `fields` omitido son todos los campos e `include` omitido
+    ningún hijo. ID siempre se incluye.
+
+    Raises:
+        ValueError: si hay campos o hijos desconocidos
+    """
+    if fields is None and include is None:
+        return None, None
+
+    requested = set(_split_param(fields)) or set(REPORT_FIELD_COLUMNS)
+    includes = _split_param(include)
+    unknown = sorted(requested - set(REPORT_FIELD_COLUMNS)) + [i for i in includes if i not in REPORT_INCLUDES]
+    if unknown:
+        raise ValueError(f"Campos desconocidos: {', '.join(unknown)}")
+
+    requested.add("ID")
+    field_list = [field for field in REPORT_FIELD_COLUMNS if field in requested]
+    include_list = [child for child in REPORT_INCLUDES if child in includes]
+    return field_list, include_list
+
+
+def encode_sync_token(moment: datetime, report_id: Optional[uuid.UUID] = None) -> str:
+    """Token opaco `<microsegundos UTC>.<id>` (cursor sobre updated_at, id)"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    micros = (moment - _EPOCH) // timedelta(microseconds=1)
+    return f"{micros}.{(report_id or uuid.UUID(int=0)).hex}"
+
+
+def decode_sync_token(token: str) -> tuple:
+    """Inverso de encode_sync_token; ValueError si el token no es válido"""
+    micros, _, report_hex = token.partition(".")
+    try:
+        moment = _EPOCH + timedelta(microseconds=int(micros))
+    except OverflowError:
+        raise ValueError(f"Token de sincronización fuera de rango: {token}")
+    return moment, uuid.UUID(hex=report_hex or "0" * 32)
+
+
+class ReportService:
+    """Operaciones de reportes (con incidencias y movimientos) en PostgreSQL"""
+
+    def __init__(self, db: Session, encryptor: FieldEncryptor = field_encryptor):
+        self.db = db
+        self.encryptor = encryptor
+
+    # Serializacion compatible con el frontend
+
+    def serialize_incident(self, incident: Incident, decrypted: bool = False) -> Dict[str, Any]:
+        """Serializar una incidencia (desencriptando campos sensibles salvo `decrypted`)"""
+        inc = incident if decrypted else self.encryptor.decrypt_model_fields(incident, "incidents")
+        return {
+            "id": str(inc.id),
+            "tipo": inc.incident_type,
+            "nombre_empleado": inc.employee_name,
+            "fecha_fin": inc.end_date.isoformat() if inc.end_date else None,
+            "notas": inc.notes or ""
+        }
+
+    def serialize_movement(self, movement: Movement, decrypted: bool = False) -> Dict[str, Any]:
+        """Serializar un movimiento (desencriptando campos sensibles salvo `decrypted`)"""
+        mov = movement if decrypted else self.encryptor.decrypt_model_fields(movement, "movements")
+        return {
+            "id": str(mov.id),
+            "nombre_empleado": mov.employee_name,
+            "cargo": mov.position,
+            "estado": mov.movement_type,
+            "fecha_efectiva": mov.effective_date.isoformat() if mov.effective_date else None,
+            "notas": mov.notes or ""
+        }
+
+    def serialize_report(
+        self,
+        report: Report,
+        incidents_list: List[Dict[str, Any]],
+        movements_list: List[Dict[str, Any]],
+        include_client_info: bool = False,
+        decrypted: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Serializar un reporte con sus incidencias y movimientos ya serializados
+
+        Args:
+            report: Reporte de SQLAlchemy
+            incidents_list: Incidencias serializadas
+            movements_list: Movimientos serializados
+            include_client_info: Incluir IP y user agent (vista de listado)
+            decrypted: El reporte ya viene desencriptado (lotes)
+        """
+        report_decrypted = report if decrypted else self.encryptor.decrypt_model_fields(report, "reports")
+        report_data = {
+            "ID": str(report_decrypted.id),
+            "Fecha_Creacion": convert_to_bogota_timezone(report_decrypted.created_at),
+            "Administrador": report_decrypted.administrator,
+            "Cliente_Operacion": report_decrypted.client_operation,
+            "Horas_Diarias": report_decrypted.daily_hours,
+            "Personal_Staff": report_decrypted.staff_personnel,
+            "Personal_Base": report_decrypted.base_personnel,
+            "Cantidad_Incidencias": len(incidents_list),
+            "Cantidad_Ingresos_Retiros": len(movements_list),
+            "Hechos_Relevantes": report_decrypted.relevant_facts or "",
+            "Estado": report_status_value(report_decrypted.status),
+        }
+        if include_client_info:
+            report_data["IP_Origen"] = report_decrypted.client_ip
+            report_data["User_Agent"] = report_decrypted.user_agent
+        report_data["incidencias"] = incidents_list
+        report_data["ingresos_retiros"] = movements_list
+        return report_data
+
+    def _load_children(self, report_id, report_date) -> tuple:
+        """Obtener incidencias y movimientos serializados de un reporte (report_date acota la partición)"""
+        incidents = self.db.query(Incident).filter(
+            Incident.report_id == report_id, Incident.report_date == report_date
+        ).all()
+        movements = self.db.query(Movement).filter(
+            Movement.report_id == report_id, Movement.report_date == report_date
+        ).all()
+        return (
+            [self.serialize_incident(inc) for inc in incidents],
+            [self.serialize_movement(mov) for mov in movements],
+        )
+
+    def _load_children_many(
+        self,
+        report_keys: List[tuple],
+        incidents: bool = True,
+        movements: bool = True
+    ) -> tuple:
+        """
+        Incidencias y movimientos serializados de varios reportes, por report_id
+
+        report_keys son pares (report_id, report_date): el IN sobre las fechas
+        acota las particiones leídas. Una consulta por tipo de hijo y
+        desencriptación en lote.
+        """
+        report_ids = [report_id for report_id, _ in report_keys]
+        report_dates = list({report_date for _, report_date in report_keys})
+        incidents_by_report: Dict[Any, List[Dict[str, Any]]] = {report_id: [] for report_id in report_ids}
+        movements_by_report: Dict[Any, List[Dict[str, Any]]] = {report_id: [] for report_id in report_ids}
+        if incidents and report_ids:
+            rows = self.db.query(Incident).filter(
+                Incident.report_id.in_(report_ids), Incident.report_date.in_(report_dates)
+            ).all()
+            self.encryptor.decrypt_many_model_fields(rows, "incidents")
+            for inc in rows:
+                incidents_by_report[inc.report_id].append(self.serialize_incident(inc, decrypted=True))
+        if movements and report_ids:
+            rows = self.db.query(Movement).filter(
+                Movement.report_id.in_(report_ids), Movement.report_date.in_(report_dates)
+            ).all()
+            self.encryptor.decrypt_many_model_fields(rows, "movements")
+            for mov in rows:
+                movements_by_report[mov.report_id].append(self.serialize_movement(mov, decrypted=True))
+        return incidents_by_report, movements_by_report
+
+    def _serialize_many(self, reports: List[Report], include_client_info: bool = False) -> List[Dict[str, Any]]:
+        """
+        Serializar varios reportes con sus hijos sin N+1
+
+        Incidencias y movimientos se leen con una consulta IN cada uno y todos
+        los campos encriptados (reportes e hijos) se desencriptan en lote.
+        """
+        if not reports:
+            return []
+        incidents_by_report, movements_by_report = self._load_children_many(
+            [(report.id, report.report_date) for report in reports]
+        )
+        self.encryptor.decrypt_many_model_fields(reports, "reports")
+
+        return [
+            self.serialize_report(
+                report,
+                incidents_by_report[report.id],
+                movements_by_report[report.id],
+                include_client_info=include_client_info,
+                decrypted=True
+            )
+            for report in reports
+        ]
+
+    def _serialize_projection(
+        self,
+        rows: List[Dict[str, Any]],
+        fields: List[str],
+        include: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Serializar filas proyectadas (solo las columnas de `fields`)
+
+        Solo se desencripta Hechos_Relevantes si se pidió; los conteos salen de
+        los contadores del reporte (incident_count, movement_count).
+        """
+        report_keys = [(row["id"], row["report_date"]) for row in rows]
+        self.encryptor.decrypt_many_dict_fields(rows, "reports")
+
+        with_incidents = "incidencias" in include
+        with_movements = "ingresos_retiros" in include
+        incidents_by_report, movements_by_report = self._load_children_many(
+            report_keys, incidents=with_incidents, movements=with_movements
+        )
+
+        serialized = []
+        for row in rows:
+            report_id = row["id"]
+            data: Dict[str, Any] = {}
+            for field in fields:
+                value = row[REPORT_FIELD_COLUMNS[field]]
+                if field == "ID":
+                    value = str(value)
+                elif field == "Fecha_Creacion":
+                    value = convert_to_bogota_timezone(value)
+                elif field == "Hechos_Relevantes":
+                    value = value or ""
+                elif field == "Estado":
+                    value = report_status_value(value)
+                data[field] = value
+            if with_incidents:
+                data["incidencias"] = incidents_by_report[report_id]
+            if with_movements:
+                data["ingresos_retiros"] = movements_by_report[report_id]
+            serialized.append(data)
+        return serialized
+
+    # Lectura
+
+    @staticmethod
+    def _apply_listing_filters(
+        query,
+        model,
+        administrador: Optional[str] = None,
+        cliente: Optional[str] = None,
+        fecha_inicio: Optional[str] = None,
+        fecha_fin: Optional[str] = None
+    ):
+        """Filtros del listado (model: Report o ReportDeletion, mismas columnas)"""
+        if administrador:
+            query = query.filter(func.lower(model.administrator) == administrador.lower())
+
+        if cliente:
+            query = query.filter(func.lower(model.client_operation) == cliente.lower())
+
+        if fecha_inicio:
+            try:
+                fecha_inicio_parsed = datetime.fromisoformat(fecha_inicio).date()
+                query = query.filter(model.report_date >= fecha_inicio_parsed)
+            except (ValueError, TypeError):
+                logger.warning(f"Fecha inicio inválida: {fecha_inicio}")
+
+        if fecha_fin:
+            try:
+                fecha_fin_parsed = datetime.fromisoformat(fecha_fin).date()
+                query = query.filter(model.report_date <= fecha_fin_parsed)
+            except (ValueError, TypeError):
+                logger.warning(f"Fecha fin inválida: {fecha_fin}")
+
+        return query
+
+    def listing_query(
+        self,
+        administrador: Optional[str] = None,
+        cliente: Optional[str] = None,
+        fecha_inicio: Optional[str] = None,
+        fecha_fin: Optional[str] = None,
+        min_incidencias: Optional[int] = None,
+        min_ingresos_retiros: Optional[int] = None,
+        ordenar_por: Optional[str] = None
+    ):
+        """
+        Consulta filtrada y ordenada del listado (sin paginar)
+
+        Raises:
+            ValueError: si ordenar_por no es un orden conocido
+        """
+        if ordenar_por and ordenar_por not in REPORT_SORT_COLUMNS:
+            raise ValueError(f"Orden desconocido: {ordenar_por}")
+
+        query = self._apply_listing_filters(
+            self.db.query(Report), Report, administrador, cliente, fecha_inicio, fecha_fin
+        )
+        if min_incidencias is not None:
+            query = query.filter(Report.incident_count >= min_incidencias)
+        if min_ingresos_retiros is not None:
+            query = query.filter(Report.movement_count >= min_ingresos_retiros)
+
+        # Ordenar por fecha de creación (o por el orden pedido) descendente
+        sort_column = getattr(Report, REPORT_SORT_COLUMNS[ordenar_por or "fecha"])
+        return query.order_by(sort_column.desc(), Report.created_at.desc())
+
+    def list_reports(
+        self,
+        administrador: Optional[str] = None,
+        cliente: Optional[str] = None,
+        fecha_inicio: Optional[str] = None,
+        fecha_fin: Optional[str] = None,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+        min_incidencias: Optional[int] = None,
+        min_ingresos_retiros: Optional[int] = None,
+        ordenar_por: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Listar reportes con filtros y paginacion opcional
+
+        Con `fields`/`include` (ver parse_report_projection) se leen solo esas
+        columnas y esos hijos; sin ellos, el reporte completo con sus hijos.
+        Los filtros y el orden por cantidad usan los contadores del reporte.
+
+        Raises:
+            ValueError: si ordenar_por no es un orden conocido
+        """
+        query = self.listing_query(
+            administrador, cliente, fecha_inicio, fecha_fin,
+            min_incidencias, min_ingresos_retiros, ordenar_por
+        )
+
+        # Contar total de reportes
+        total_reports = query.count()
+
+        if fields is not None:
+            # Proyección: solo las columnas de los campos pedidos (report_date acota los hijos)
+            columns = dict.fromkeys(["id", "report_date"] + [REPORT_FIELD_COLUMNS[field] for field in fields])
+            query = query.with_entities(*[getattr(Report, column) for column in columns])
+
+        # Aplicar paginacion solo si se especifica limit
+        if limit is not None and page is not None:
+            skip = (page - 1) * limit
+            query = query.offset(skip).limit(limit)
+        # Sin paginación - devolver todos los reportes
+
+        if fields is None:
+            reports_list = self._serialize_many(query.all(), include_client_info=True)
+        else:
+            rows = [dict(row._mapping) for row in query.all()]
+            reports_list = self._serialize_projection(rows, fields, include or [])
+
+        logger.info(f"Reportes obtenidos desde PostgreSQL: {len(reports_list)} de {total_reports}")
+        return reports_list
+
+    def list_changes(
+        self,
+        since: Optional[str] = None,
+        limit: int = 500,
+        administrador: Optional[str] = None,
+        cliente: Optional[str] = None,
+        fecha_inicio: Optional[str] = None,
+        fecha_fin: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Cambios del listado desde un token de sincronización
+
+        Devuelve los reportes creados o modificados después del token (orden
+        updated_at, id), los eliminados desde entonces (tombstones) y el token
+        para la siguiente llamada. Sin token es una sincronización completa,
+        paginada con `has_more`.
+
+        Al ponerse al día, el siguiente token retrocede SYNC_OVERLAP_SECONDS:
+        una transacción que empezó antes y confirmó después tiene un
+        updated_at anterior al corte. Los reportes repetidos se aplican por ID.
+
+        Raises:
+            ValueError: si el token no es válido
+        """
+        cursor_time, cursor_id = decode_sync_token(since) if since else (None, None)
+        server_now = self.db.query(func.now()).scalar()
+
+        query = self._apply_listing_filters(
+            self.db.query(Report), Report, administrador, cliente, fecha_inicio, fecha_fin
+        )
+        if cursor_time is not None:
+            query = query.filter(
+                (Report.updated_at > cursor_time)
+                | ((Report.updated_at == cursor_time) & (Report.id > cursor_id))
+            )
+        reports = query.order_by(Report.updated_at, Report.id).limit(limit + 1).all()
+
+        has_more = len(reports) > limit
+        reports = reports[:limit]
+        if has_more:
+            next_token = encode_sync_token(reports[-1].updated_at, reports[-1].id)
+        else:
+            next_token = encode_sync_token(server_now - timedelta(seconds=SYNC_OVERLAP_SECONDS))
+
+        changes = self._serialize_many(reports, include_client_info=True)
+
+        deleted = []
+        if cursor_time is not None:
+            deletions = self._apply_listing_filters(
+                self.db.query(ReportDeletion), ReportDeletion, administrador, cliente, fecha_inicio, fecha_fin
+            ).filter(ReportDeletion.deleted_at > cursor_time).order_by(ReportDeletion.deleted_at).all()
+            deleted = [
+                {
+                    "ID": str(d.report_id),
+                    "legacy_id": d.legacy_id,
+                    "deleted_at": convert_to_bogota_timezone(d.deleted_at)
+                }
+                for d in deletions
+            ]
+
+        return {"changes": changes, "deleted": deleted, "next_token": next_token, "has_more": has_more}
+
+    def report_by_id_query(self, report_id, report_date: Optional[date] = None):
+        """Consulta de un reporte por ID; con report_date lee una sola partición"""
+        query = self.db.query(Report).filter(Report.id == report_id)
+        if report_date is not None:
+            query = query.filter(Report.report_date == report_date)
+        return query
+
+    def _find_report(self, report_id, report_date: Optional[date] = None) -> Optional[Report]:
+        """
+        Reporte por ID usando report_date como pista de partición
+
+        Si la pista no acierta se busca en todas las particiones, así una
+        fecha equivocada no convierte el reporte en inexistente.
+        """
+        report = self.report_by_id_query(report_id, report_date).first()
+        if report is None and report_date is not None:
+            report = self.report_by_id_query(report_id).first()
+        return report
+
+    def get_report_details(self, report_id: str, report_date: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """Obtener un reporte con sus incidencias y movimientos (None si no existe)"""
+        report = self._find_report(report_id, report_date)
+        if not report:
+            return None
+
+        incidents_list, movements_list = self._load_children(report_id, report.report_date)
+        return self.serialize_report(report, incidents_list, movements_list)
+
+    def get_reports_details(
+        self,
+        report_ids: List[uuid.UUID],
+        report_dates: Optional[List[date]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Detalles de varios reportes con tres consultas (reportes, incidencias, movimientos)
+
+        report_dates (opcional) acota las particiones leídas; los IDs que no
+        estén en esas fechas se buscan después en todas. Devuelve los
+        encontrados en el orden pedido; los IDs inexistentes se omiten.
+        """
+        report_ids = list(dict.fromkeys(report_ids))
+        if not report_ids:
+            return []
+        query = self.db.query(Report).filter(Report.id.in_(report_ids))
+        if report_dates:
+            reports = query.filter(Report.report_date.in_(set(report_dates))).all()
+            found = {report.id for report in reports}
+            missing = [report_id for report_id in report_ids if report_id not in found]
+            if missing:
+                reports += self.db.query(Report).filter(Report.id.in_(missing)).all()
+        else:
+            reports = query.all()
+        position = {report_id: index for index, report_id in enumerate(report_ids)}
+        reports.sort(key=lambda report: position[report.id])
+        return self._serialize_many(reports)
+
+    def admin_reports_for_date_query(
+        self,
+        admin_name: str,
+        report_date: date,
+        operacion: Optional[str] = None
+    ):
+        """Consulta de get_admin_reports_for_date (usa idx_reports_date_admin_lower)"""
+        query = self.db.query(Report).filter(
+            func.lower(Report.administrator) == admin_name.lower(),
+            Report.report_date == report_date
+        )
+
+        if operacion:
+            query = query.filter(func.lower(Report.client_operation) == operacion.lower())
+
+        return query
+
+    def get_admin_reports_for_date(
+        self,
+        admin_name: str,
+        report_date: date,
+        operacion: Optional[str] = None
+    ) -> List[Report]:
+        """Reportes de un administrador para una fecha (opcionalmente por operación)"""
+        return self.admin_reports_for_date_query(admin_name, report_date, operacion).all()
+
+    # Escritura
+
+    @staticmethod
+    def build_create_payload(
+        report: DailyReportCreate,
+        admin_name: str,
+        client_info: Dict[str, str],
+        report_date: date,
+        legacy_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Serializar un reporte nuevo a un payload JSON autocontenido
+
+        El payload no se vuelve a validar con los modelos Pydantic al aplicarse
+        (p. ej. la fecha de fin de una incidencia deja de ser "futura" al día
+        siguiente), por eso guarda los valores ya validados y la hora de creación.
+        """
+        data = report.model_dump(mode="json")
+        return {
+            "legacy_id": legacy_id,
+            "administrator": admin_name,
+            "client_operation": data["cliente_operacion"],
+            "daily_hours": data["horas_diarias"],
+            "staff_personnel": data["personal_staff"],
+            "base_personnel": data["personal_base"],
+            "relevant_facts": data.get("hechos_relevantes") or "",
+            "report_date": report_date.isoformat(),
+            "created_at": get_bogota_now().isoformat(),
+            "client_ip": client_info.get("ip", "Unknown"),
+            "user_agent": client_info.get("user_agent", "Unknown"),
+            "incidents": [
+                {
+                    "incident_type": inc["tipo"],
+                    "employee_name": inc["nombre_empleado"],
+                    "end_date": inc["fecha_fin"],
+                }
+                for inc in data.get("incidencias") or []
+            ],
+            "movements": [
+                {
+                    "employee_name": mov["nombre_empleado"],
+                    "position": mov["cargo"],
+                    "movement_type": mov["estado"],
+                }
+                for mov in data.get("ingresos_retiros") or []
+            ],
+        }
+
+    def apply_create_payload(self, payload: Dict[str, Any]) -> str:
+        """
+        Insertar en PostgreSQL un reporte serializado con build_create_payload
+
+        Es idempotente por legacy_id: si el reporte ya existe devuelve su ID sin
+        volver a insertarlo, así que puede reintentarse sin duplicar filas.
+
+        Raises:
+            LookupError: No existe usuario para el administrador
+            Exception: Errores de base de datos (la transacción se revierte)
+        """
+        db = self.db
+        legacy_id = payload.get("legacy_id")
+        if legacy_id:
+            existing_id = db.query(Report.id).filter(Report.legacy_id == legacy_id).scalar()
+            if existing_id:
+                return str(existing_id)
+
+        admin_name = payload["administrator"]
+        report_date = date.fromisoformat(payload["report_date"])
+        # Los hijos se registran con el reporte (como en Excel), no al aplicar el outbox
+        created_at = datetime.fromisoformat(payload["created_at"])
+
+        try:
+            # Buscar usuario por administrator_name
+            user = db.query(User).filter(
+                User.administrator_name == admin_name
+            ).first()
+
+            if not user:
+                raise LookupError(f"User not found for admin: {admin_name}")
+
+            # Crear reporte en PostgreSQL
+            postgres_report = Report(
+                legacy_id=legacy_id,
+                user_id=user.id,
+                administrator=admin_name,
+                client_operation=payload["client_operation"],
+                daily_hours=payload["daily_hours"],
+                staff_personnel=payload["staff_personnel"],
+                base_personnel=payload["base_personnel"],
+                relevant_facts=payload["relevant_facts"],
+                status="completed",
+                report_date=report_date,
+                created_at=created_at,
+                client_ip=payload["client_ip"],
+                user_agent=payload["user_agent"]
+            )
+
+            # Encriptar campos sensibles
+            postgres_report = self.encryptor.encrypt_model_fields(postgres_report, "reports")
+
+            db.add(postgres_report)
+            db.flush()  # Para obtener el ID
+
+            # Guardar incidencias
+            for inc_data in payload["incidents"]:
+                incident = Incident(
+                    report_id=postgres_report.id,
+                    report_date=report_date,
+                    incident_type=inc_data["incident_type"],
+                    employee_name=inc_data["employee_name"],
+                    end_date=date.fromisoformat(inc_data["end_date"]),
+                    notes="",
+                    created_at=created_at
+                )
+                db.add(self.encryptor.encrypt_model_fields(incident, "incidents"))
+
+            # Guardar movimientos
+            for mov_data in payload["movements"]:
+                movement = Movement(
+                    report_id=postgres_report.id,
+                    report_date=report_date,
+                    employee_name=mov_data["employee_name"],
+                    position=mov_data["position"],
+                    movement_type=mov_data["movement_type"],
+                    effective_date=report_date,
+                    notes="",
+                    created_at=created_at
+                )
+                db.add(self.encryptor.encrypt_model_fields(movement, "movements"))
+
+            db.commit()
+            logger.info(f"Reporte guardado en PostgreSQL: {postgres_report.id}")
+            invalidate_report_write(report_date, postgres_report.id)
+            # Después del commit: quien reaccione al evento ya encuentra el reporte
+            event_broadcaster.publish(
+                REPORT_CREATED,
+                id=str(postgres_report.id),
+                administrador=admin_name,
+                cliente_operacion=payload["client_operation"],
+                fecha=report_date
+            )
+            return str(postgres_report.id)
+
+        except Exception:
+            db.rollback()
+            raise
+
+    def create_report(
+        self,
+        report: DailyReportCreate,
+        admin_name: str,
+        client_info: Dict[str, str],
+        report_date: date,
+        legacy_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Guardar reporte en PostgreSQL de forma síncrona
+
+        Args:
+            report: Datos del reporte a guardar
+            admin_name: Nombre del administrador
+            client_info: Información del cliente (IP, user agent)
+            report_date: Fecha del reporte
+            legacy_id: ID del reporte en Excel (enlaza ambos sistemas)
+
+        Returns:
+            ID del reporte creado en PostgreSQL o None si hay error
+        """
+        payload = self.build_create_payload(report, admin_name, client_info, report_date, legacy_id)
+        try:
+            return self.apply_create_payload(payload)
+        except LookupError as e:
+            logger.warning(f"{e}, skipping PostgreSQL save")
+            return None
+        except Exception as e:
+            logger.error(f"Error guardando en PostgreSQL: {e}")
+            return None
+
+    def update_report(self, report_id: str, report_update: DailyReportUpdate, today: date) -> Dict[str, Any]:
+        """
+        Actualizar campos editables de un reporte del día actual
+
+        Raises:
+            HTTPException 404: Reporte no encontrado
+            HTTPException 403: El reporte no es del día actual
+            HTTPException 400: No hay campos para actualizar
+        """
+        db = self.db
+        # Solo se editan reportes de hoy: la búsqueda lee la partición del día
+        report = self._find_report(report_id, today)
+
+        if not report:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Reporte {report_id} no encontrado"
+            )
+
+        # Solo permitir editar reportes del mismo día
+        if report.report_date != today:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Solo se pueden editar reportes del día actual"
+            )
+
+        # Verificar que al menos algo se va a actualizar
+        has_basic_updates = any([
+            report_update.horas_diarias is not None,
+            report_update.personal_staff is not None,
+            report_update.personal_base is not None,
+            report_update.hechos_relevantes is not None
+        ])
+        has_incidents = report_update.incidencias is not None
+        has_movements = report_update.ingresos_retiros is not None
+
+        if not (has_basic_updates or has_incidents or has_movements):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No se proporcionaron campos para actualizar"
+            )
+
+        # Actualizar campos básicos del reporte
+        if report_update.horas_diarias is not None:
+            report.daily_hours = report_update.horas_diarias
+        if report_update.personal_staff is not None:
+            report.staff_personnel = report_update.personal_staff
+        if report_update.personal_base is not None:
+            report.base_personnel = report_update.personal_base
+        if report_update.hechos_relevantes is not None:
+            report.relevant_facts = report_update.hechos_relevantes
+
+        # Actualizar timestamp
+        report.updated_at = func.now()
+
+        # Reemplazar incidencias si se proporcionaron
+        if has_incidents:
+            db.query(Incident).filter(
+                Incident.report_id == report_id, Incident.report_date == report.report_date
+            ).delete()
+
+            for inc_data in report_update.incidencias:
+                incident = Incident(
+                    report_id=report_id,
+                    report_date=report.report_date,
+                    incident_type=inc_data.tipo.value if hasattr(inc_data.tipo, 'value') else str(inc_data.tipo) if inc_data.tipo else "",
+                    employee_name=inc_data.nombre_empleado if inc_data.nombre_empleado else "",
+                    end_date=inc_data.fecha_fin,
+                    notes=""
+                )
+                db.add(self.encryptor.encrypt_model_fields(incident, "incidents"))
+
+        # Reemplazar movimientos si se proporcionaron
+        if has_movements:
+            db.query(Movement).filter(
+                Movement.report_id == report_id, Movement.report_date == report.report_date
+            ).delete()
+
+            for mov_data in report_update.ingresos_retiros:
+                movement = Movement(
+                    report_id=report_id,
+                    report_date=report.report_date,
+                    employee_name=mov_data.nombre_empleado if mov_data.nombre_empleado else "",
+                    position=mov_data.cargo if mov_data.cargo else "",
+                    movement_type=mov_data.estado.value if hasattr(mov_data.estado, 'value') else str(mov_data.estado) if mov_data.estado else "Ingreso",
+                    effective_date=today,
+                    notes=""
+                )
+                db.add(self.encryptor.encrypt_model_fields(movement, "movements"))
+
+        db.commit()
+        db.refresh(report)
+        invalidate_report_write(report.report_date, report_id)
+
+        incidents_list, movements_list = self._load_children(report_id, report.report_date)
+        return self.serialize_report(report, incidents_list, movements_list)
+
+    def get_legacy_id(self, report_id: str, report_date: Optional[date] = None) -> Optional[str]:
+        """ID del reporte en Excel (None si solo existe en PostgreSQL)"""
+        return self.report_by_id_query(report_id, report_date).with_entities(Report.legacy_id).scalar()
+
+    def delete_report(self, report_id: str, report_date: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Eliminar un reporte (incidencias y movimientos se eliminan en cascada)
+
+        Args:
+            report_id: ID del reporte
+            report_date: Fecha del reporte si se conoce (pista de partición)
+
+        Returns:
+            Diccionario con `found`, el `legacy_id` y el origen (administrador,
+            operación, fecha) del reporte eliminado
+        """
+        report = self._find_report(report_id, report_date)
+        if not report:
+            return {"found": False, "legacy_id": None}
+
+        legacy_id = report.legacy_id
+        report_date = report.report_date
+        administrator = report.administrator
+        client_operation = report.client_operation
+        try:
+            # Tombstone en la misma transacción para la sincronización incremental
+            self.db.merge(ReportDeletion(
+                report_id=report.id,
+                legacy_id=legacy_id,
+                administrator=administrator,
+                client_operation=client_operation,
+                report_date=report_date
+            ))
+            self.db.delete(report)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        invalidate_report_write(report_date, report_id)
+        return {
+            "found": True,
+            "legacy_id": legacy_id,
+            "administrator": administrator,
+            "client_operation": client_operation,
+            "report_date": report_date
+        }
+
+
+def report_status_value(report_status: Any) -> str:
+    """Valor del estado del reporte (enum o string)"""
+    return report_status.value if hasattr(report_status, 'value') else str(report_status)
+
+
+def get_report_service(db: Session = Depends(get_db)) -> ReportService:
+    """Dependency de FastAPI para obtener el servicio de reportes"""
+    return ReportService(db)
+
+
+def apply_report_create_entry(payload: Dict[str, Any]) -> Optional[str]:
+    """
+    Handler del outbox para `report.create` (usa su propia sesión)
+
+    Un administrador sin usuario no se resuelve reintentando: la entrada se da
+    por aplicada con una advertencia (como en create_report) y la
+    sincronización incremental recupera el reporte cuando exista el usuario.
+    """
+    db = SessionLocal()
+    try:
+        return ReportService(db).apply_create_payload(payload)
+    except LookupError as e:
+        logger.warning(f"{e}, skipping PostgreSQL save (legacy_id: {payload.get('legacy_id')})")
+        return None
+    finally:
+        db.close()
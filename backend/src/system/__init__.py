@@ -0,0 +1 @@
+# Módulo system.
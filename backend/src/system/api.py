@@ -0,0 +1,97 @@
+"""
+Endpoints del sistema
+Información de la API, sondas de salud y stream de eventos (SSE)
+"""
+from datetime import datetime
+from fastapi import APIRouter, Request, status
+from fastapi.responses import StreamingResponse
+
+from ..config import settings
+from ..models import APIResponse, HealthCheck
+from ..services.event_service import event_broadcaster
+from ..services.health_service import health_monitor
+from ..utils.responses import FastJSONResponse
+
+# El stream de eventos va sin comprimir (ver SelectiveGZipMiddleware en api.py)
+EVENTS_PATH = f"{settings.api_v1_prefix}/events"
+
+router = APIRouter(tags=["Sistema"])
+
+
+# Endpoint de informacion de la API
+@router.get(
+    "/",
+    summary="Informacion de la API",
+    description="Informacion basica sobre la API"
+)
+async def root():
+    """Informacion basica de la API"""
+    return APIResponse(
+        success=True,
+        message=f"API {settings.app_name} v{settings.app_version} funcionando correctamente",
+        data={
+            "version": settings.app_version,
+            "docs_url": settings.docs_url,
+            "admin_panel_url": "/admin",
+            "endpoints_disponibles": {
+                "POST /api/v1/reportes": "Crear nuevo reporte diario",
+                "GET /api/v1/admin/reportes": "Obtener lista de reportes", 
+                "GET /api/v1/admin/analytics": "Obtener metricas dashboard",
+                "GET /api/v1/config": "Obtener configuraciones del sistema",
+                "POST /api/v1/notifications/test-email": "Probar conexion de email",
+                "POST /api/v1/notifications/send-reminder/{admin}": "Enviar recordatorio",
+                "POST /api/v1/notifications/send-bulk-reminders": "Recordatorios masivos",
+                "GET /health": "Health check"
+            }
+        }
+    )
+
+
+# Health Check
+@router.get("/health", response_model=HealthCheck)
+async def health_check(request: Request):
+    """Health check (compatibilidad): último estado de las sondas, sin I/O"""
+    components = health_monitor.snapshot()["components"]
+
+    return HealthCheck(
+        status="healthy",
+        timestamp=datetime.now(),
+        version=settings.app_version,
+        services={
+            "excel": components.get("excel", {}).get("status", "unknown"),
+            "database": components.get("database", {}).get("status", "unknown"),
+            "auth": "enabled" if request.app.state.auth_enabled else "disabled"
+        }
+    )
+
+
+@router.get("/health/live", include_in_schema=False)
+async def health_live():
+    """Liveness: el proceso responde (sin I/O)"""
+    return {"status": "alive"}
+
+
+@router.get("/health/ready", include_in_schema=False)
+async def health_ready():
+    """Readiness: resultado cacheado de las sondas de BD, Redis y Excel"""
+    snapshot = health_monitor.snapshot()
+    return FastJSONResponse(
+        snapshot,
+        status_code=status.HTTP_200_OK if snapshot["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+# Eventos en vivo de reportes
+@router.get(EVENTS_PATH, include_in_schema=False)
+async def report_events(request: Request):
+    """
+    Stream Server-Sent Events con los cambios de reportes
+
+    Eventos report.created / report.updated / report.deleted con id,
+    administrador, cliente_operacion y fecha; `resync` si el cliente debe
+    recargar (se perdieron eventos).
+    """
+    return StreamingResponse(
+        event_broadcaster.stream(request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
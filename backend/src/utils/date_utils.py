@@ -0,0 +1,50 @@
+"""
+Utilidades de fecha y zona horaria
+Sin dependencias pesadas para poder importarse en el arranque de la API
+"""
+from datetime import date, datetime
+from typing import Optional
+
+import pytz
+
+from ..config import settings
+
+# Timezone de Bogotá (GMT-5)
+BOGOTA_TZ = pytz.timezone('America/Bogota')
+
+
+def get_bogota_now() -> datetime:
+    """Obtiene la fecha y hora actual en timezone de Bogotá (sin timezone para Excel)"""
+    # Excel no soporta timezones, convertir a naive datetime
+    return datetime.now(BOGOTA_TZ).replace(tzinfo=None)
+
+
+def get_local_today() -> date:
+    """Obtiene la fecha actual en la timezone configurada (America/Bogota)"""
+    return datetime.now(pytz.timezone(settings.timezone)).date()
+
+
+def convert_to_bogota_timezone(dt: Optional[datetime]) -> Optional[str]:
+    """
+    Convierte un datetime a timezone de Bogotá y retorna como ISO string
+
+    Args:
+        dt: datetime a convertir (puede ser naive o con timezone)
+
+    Returns:
+        String ISO con timezone de Bogotá o None si dt es None
+    """
+    if not dt:
+        return None
+
+    local_tz = pytz.timezone(settings.timezone)
+
+    if dt.tzinfo is None:
+        # Si es naive, asumir UTC y convertir a Bogotá
+        dt_utc = pytz.UTC.localize(dt)
+        dt_bogota = dt_utc.astimezone(local_tz)
+    else:
+        # Si ya tiene timezone, convertir a Bogotá
+        dt_bogota = dt.astimezone(local_tz)
+
+    return dt_bogota.isoformat()
@@ -0,0 +1,174 @@
+"""
+Pipeline único de logging
+
+- Los módulos escriben con logging (stdlib) o loguru; loguru se reenvía a
+  logging para que ambos salgan por el mismo camino y con el mismo formato.
+- El handler raíz es un QueueHandler: el request solo encola el registro y un
+  QueueListener en otro hilo lo formatea y escribe en stdout.
+- Cada registro lleva el request id y la ruta del request en curso
+  (utils.request_context), en JSON (settings.log_json) o en texto.
+- log_access() escribe una línea por request y muestrea las rutas de alto
+  volumen (health checks, polling del estado del día).
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from ..config import settings
+from .request_context import get_current_route, get_request_id
+
+ACCESS_LOGGER = "access"
+
+# Atributos propios de LogRecord; el resto son campos `extra=`
+_RECORD_ATTRS = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "request_id", "route"}
+
+_listener: Optional[QueueListener] = None
+
+
+class ContextFilter(logging.Filter):
+    """Agrega request_id y route (se ejecuta en el hilo que genera el registro)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = get_request_id() or "-"
+        if not hasattr(record, "route"):
+            record.route = get_current_route()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Un objeto JSON por línea"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        route = getattr(record, "route", None)
+        if route:
+            data["route"] = route
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    """
+    Encola una copia con el mensaje ya interpolado
+
+    A diferencia de QueueHandler.prepare() no formatea el registro completo en
+    el hilo del request: el formato (JSON o texto) lo aplica el listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _forward_loguru(message) -> None:
+    """Sink de loguru: reenviar el registro al logger stdlib del mismo nombre"""
+    record = message.record
+    exc_info = None
+    if record["exception"] is not None:
+        exception = record["exception"]
+        exc_info = (exception.type, exception.value, exception.traceback)
+    name = record["name"] or "loguru"
+    target = logging.getLogger(name)
+    log_record = target.makeRecord(
+        name, record["level"].no, record["file"].path, record["line"],
+        record["message"], (), exc_info, record["function"]
+    )
+    target.handle(log_record)
+
+
+def _intercept_loguru(level: int) -> None:
+    try:
+        from loguru import logger as loguru_logger
+    except ImportError:
+        return
+    loguru_logger.remove()
+    loguru_logger.add(_forward_loguru, level=level, format="{message}")
+
+
+def setup_logging() -> None:
+    """Configurar el logging del proceso (idempotente)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    level = getattr(logging, settings.log_level.upper(), logging.INFO)
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.log_json:
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+        ))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    # uvicorn trae sus propios handlers síncronos: pasan por la raíz
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+
+    _intercept_loguru(level)
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def _is_sampled_path(path: str) -> bool:
+    return any(path.startswith(prefix) for prefix in settings.log_sampled_paths)
+
+
+def log_access(method: str, path: str, status_code: int, duration_ms: float, client_ip: Optional[str] = None) -> None:
+    """Línea de acceso de un request (muestreada en las rutas de alto volumen)"""
+    access_logger = logging.getLogger(ACCESS_LOGGER)
+    if not access_logger.isEnabledFor(logging.INFO):
+        return
+    sampled = _is_sampled_path(path)
+    if (sampled and status_code < 400 and duration_ms < settings.log_slow_request_ms
+            and random.random() >= settings.log_sample_rate):
+        return
+    access_logger.info(
+        "%s %s %s %.1fms", method, path, status_code, duration_ms,
+        extra={
+            "method": method,
+            "path": path,
+            "status": status_code,
+            "duration_ms": round(duration_ms, 1),
+            "client_ip": client_ip,
+            "sampled": sampled,
+        }
+    )
@@ -0,0 +1,42 @@
+"""
+Contexto del request en curso (contextvars)
+
+Permite que código sin acceso al Request (listeners de SQLAlchemy, servicios,
+el logging) sepa qué ruta lo originó y con qué request id, p. ej. para el log
+de consultas lentas o para correlacionar registros de un mismo request.
+"""
+from contextvars import ContextVar
+from typing import Optional
+
+_current_route: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def set_current_route(route: Optional[str]):
+    """Fijar la ruta del request actual; devuelve el token para restaurarla"""
+    return _current_route.set(route)
+
+
+def reset_current_route(token) -> None:
+    """Restaurar el valor anterior"""
+    _current_route.reset(token)
+
+
+def get_current_route() -> Optional[str]:
+    """Ruta del request en curso ("METODO /path") o None fuera de un request"""
+    return _current_route.get()
+
+
+def set_request_id(request_id: Optional[str]):
+    """Fijar el id del request actual; devuelve el token para restaurarlo"""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token) -> None:
+    """Restaurar el valor anterior"""
+    _request_id.reset(token)
+
+
+def get_request_id() -> Optional[str]:
+    """Id del request en curso o None fuera de un request"""
+    return _request_id.get()
@@ -0,0 +1,54 @@
+"""
+Respuestas JSON serializadas con orjson
+
+FastJSONResponse es la clase de respuesta por defecto de la API. Para las
+respuestas grandes que se construyen internamente (listados y vistas) los
+handlers usan json_response(), que evita la segunda validación contra
+response_model y el recorrido de jsonable_encoder.
+"""
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from starlette.responses import JSONResponse, Response
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Tipos que orjson no serializa de forma nativa (igual que jsonable_encoder)"""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Serializar a JSON (bytes) con las mismas opciones que las respuestas"""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse renderizada con orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """
+    Respuesta JSON directa (sin validación de response_model)
+
+    Args:
+        content: Datos ya serializables construidos por el servicio
+        response: Sub-respuesta inyectada por FastAPI cuyos headers se conservan
+            (ETag, Last-Modified, Cache-Control)
+        status_code: Código HTTP
+    """
+    headers = dict(response.headers) if response is not None else None
+    return FastJSONResponse(content=content, status_code=status_code, headers=headers)
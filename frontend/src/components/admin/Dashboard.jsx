@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react'
 import { API_BASE_URL } from '../../services/constants'
 import { adaptAnalyticsData } from '../../services/dataAdapter'
+import { useReportEvents } from '../../hooks/useReportEvents'
 
 const Dashboard = () => {
   const [stats, setStats] = useState({
@@ -19,9 +20,12 @@ const Dashboard = () => {
     fetchDashboardData()
   }, [])
 
-  const fetchDashboardData = async () => {
+  // Recargar las métricas cuando se crea, edita o elimina un reporte
+  useReportEvents(() => fetchDashboardData({ silent: true }), { debounceMs: 2000 })
+
+  const fetchDashboardData = async ({ silent = false } = {}) => {
     try {
-      setLoading(true)
+      if (!silent) setLoading(true)
       const response = await fetch(`${API_BASE_URL}/admin/analytics`)
       
       if (!response.ok) {
@@ -58,7 +62,7 @@ const Dashboard = () => {
       <div className="alert alert-error" style={{ margin: '2rem 0' }}>
         � {error}
         <button 
-          onClick={fetchDashboardData}
+          onClick={() => fetchDashboardData()}
           style={{
             marginLeft: '1rem',
             padding: '0.25rem 0.5rem',
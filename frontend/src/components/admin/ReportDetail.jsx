@@ -3,7 +3,13 @@ import { API_BASE_URL, INCIDENT_TYPES, EMPLOYEE_STATUSES } from '../../services/
 import NumberInput from '../common/NumberInput'
 import { useAuth } from '../../contexts/AuthContext'
 
-const ReportDetail = ({ report, onClose, allowEdit = false, onReportUpdated }) => {
+// Fecha del reporte (Fecha_Creacion viene en hora de Bogotá) para acotar la búsqueda por ID
+const reportDateQuery = (data) => {
+  const fecha = data?.Fecha_Creacion || data?.fecha_creacion
+  return typeof fecha === 'string' && fecha.length >= 10 ? `?fecha=${fecha.slice(0, 10)}` : ''
+}
+
+const ReportDetail = ({ report, onClose, allowEdit = false, onReportUpdated, preloaded = false }) => {
   const { hasAdminAccess } = useAuth()
   const [detailedReport, setDetailedReport] = useState(null)
   const [loading, setLoading] = useState(true)
@@ -15,33 +21,38 @@ const ReportDetail = ({ report, onClose, allowEdit = false, onReportUpdated }) =
   const [deleting, setDeleting] = useState(false)
 
   useEffect(() => {
-    if (report && (report.ID || report.id)) {
+    if (preloaded && report) {
+      // Detalle ya obtenido (p. ej. por /admin/reportes/batch)
+      setDetailedReport(report)
+      setEditData(prepareEditData(report))
+      setError(null)
+      setLoading(false)
+    } else if (report && (report.ID || report.id)) {
       fetchReportDetails(report.ID || report.id)
     }
-  }, [report])
+  }, [report, preloaded])
+
+  // Preparar datos de edición con formatos correctos
+  const prepareEditData = (data) => ({
+    ...data,
+    // Asegurar que las incidencias mantengan sus fechas
+    incidencias: data.incidencias ? data.incidencias.map(inc => ({
+      ...inc,
+      // Convertir fecha a formato YYYY-MM-DD si es necesario
+      fecha_fin: inc.fecha_fin ? (inc.fecha_fin.includes('T') ? inc.fecha_fin.split('T')[0] : inc.fecha_fin) : ''
+    })) : [],
+    // Asegurar que los movimientos se preserven
+    ingresos_retiros: data.ingresos_retiros || []
+  })
 
   const fetchReportDetails = async (reportId) => {
     try {
       setLoading(true)
-      const response = await fetch(`${API_BASE_URL}/admin/reportes/${reportId}`)
+      const response = await fetch(`${API_BASE_URL}/admin/reportes/${reportId}${reportDateQuery(report)}`)
       if (response.ok) {
         const data = await response.json()
         setDetailedReport(data)
-        
-        // Preparar datos de edición con formatos correctos
-        const editableData = {
-          ...data,
-          // Asegurar que las incidencias mantengan sus fechas
-          incidencias: data.incidencias ? data.incidencias.map(inc => ({
-            ...inc,
-            // Convertir fecha a formato YYYY-MM-DD si es necesario
-            fecha_fin: inc.fecha_fin ? (inc.fecha_fin.includes('T') ? inc.fecha_fin.split('T')[0] : inc.fecha_fin) : ''
-          })) : [],
-          // Asegurar que los movimientos se preserven
-          ingresos_retiros: data.ingresos_retiros || []
-        }
-        
-        setEditData(editableData)
+        setEditData(prepareEditData(data))
         setError(null)
       } else {
         throw new Error('Error cargando detalles del reporte')
@@ -50,18 +61,7 @@ const ReportDetail = ({ report, onClose, allowEdit = false, onReportUpdated }) =
       console.error('Error fetching report details:', err)
       setError(err.message)
       setDetailedReport(report) // Fallback al reporte básico
-      
-      // Preparar datos de fallback con formatos correctos
-      const fallbackData = {
-        ...report,
-        incidencias: report.incidencias ? report.incidencias.map(inc => ({
-          ...inc,
-          fecha_fin: inc.fecha_fin ? (inc.fecha_fin.includes('T') ? inc.fecha_fin.split('T')[0] : inc.fecha_fin) : ''
-        })) : [],
-        ingresos_retiros: report.ingresos_retiros || []
-      }
-      
-      setEditData(fallbackData)
+      setEditData(prepareEditData(report))
     } finally {
       setLoading(false)
     }
@@ -118,7 +118,7 @@ const ReportDetail = ({ report, onClose, allowEdit = false, onReportUpdated }) =
     try {
       setDeleting(true)
       const reportId = detailedReport.ID || detailedReport.id
-      const response = await fetch(`${API_BASE_URL}/reportes/${reportId}`, {
+      const response = await fetch(`${API_BASE_URL}/reportes/${reportId}${reportDateQuery(detailedReport)}`, {
         method: 'DELETE'
       })
 
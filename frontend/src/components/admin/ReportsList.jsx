@@ -1,6 +1,11 @@
 import React, { useState, useEffect } from 'react'
 import { API_BASE_URL } from '../../services/constants'
 
+const LIST_FIELDS = [
+  'ID', 'Fecha_Creacion', 'Administrador', 'Cliente_Operacion', 'Horas_Diarias',
+  'Personal_Staff', 'Personal_Base', 'Cantidad_Incidencias', 'Cantidad_Ingresos_Retiros'
+].join(',')
+
 const ReportsList = ({ onViewReport }) => {
   const [reports, setReports] = useState([])
   const [loading, setLoading] = useState(true)
@@ -38,6 +43,9 @@ const ReportsList = ({ onViewReport }) => {
         }
       })
 
+      // La tabla solo muestra estos campos: sin hijos ni campos encriptados
+      queryParams.append('fields', LIST_FIELDS)
+
       const response = await fetch(`${API_BASE_URL}/admin/reportes?${queryParams}`)
 
       if (!response.ok) {
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react'
 import { useAuth } from '../../contexts/AuthContext'
 import { API_BASE_URL } from '../../services/constants'
 import ReportDetail from '../admin/ReportDetail'
+import { useReportEvents } from '../../hooks/useReportEvents'
 
 const TodayReportsStatus = ({ onReportsChange, selectedOperation }) => {
   const { user } = useAuth()
@@ -9,13 +10,15 @@ const TodayReportsStatus = ({ onReportsChange, selectedOperation }) => {
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
   const [selectedReport, setSelectedReport] = useState(null) // Reporte seleccionado para ver detalle
+  const [reportDetails, setReportDetails] = useState({}) // Detalles precargados por ID
 
-  const fetchTodayReports = async () => {
-    const adminName = user?.full_name || user?.fullName || user?.administrator_name
+  const adminName = user?.full_name || user?.fullName || user?.administrator_name
+
+  const fetchTodayReports = async ({ silent = false } = {}) => {
     if (!adminName) return
 
     try {
-      setLoading(true)
+      if (!silent) setLoading(true)
       // Agregar operación a la URL si está seleccionada
       const url = selectedOperation
         ? `${API_BASE_URL}/reportes/admin/${encodeURIComponent(adminName)}/today?operacion=${encodeURIComponent(selectedOperation)}`
@@ -27,6 +30,7 @@ const TodayReportsStatus = ({ onReportsChange, selectedOperation }) => {
         const data = await response.json()
         setReportsInfo(data.data)
         setError(null)
+        fetchReportDetails(data.data?.reportes || [], data.data?.fecha)
       } else {
         throw new Error('Error al verificar reportes del día')
       }
@@ -38,7 +42,34 @@ const TodayReportsStatus = ({ onReportsChange, selectedOperation }) => {
     }
   }
 
+  // Detalles de todos los reportes del día en una sola llamada (la fecha acota la búsqueda)
+  const fetchReportDetails = async (reportes, fecha) => {
+    const ids = reportes.map(reporte => reporte.id).filter(Boolean)
+    if (ids.length === 0) {
+      setReportDetails({})
+      return
+    }
+    try {
+      const response = await fetch(`${API_BASE_URL}/admin/reportes/batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(fecha ? { ids, fechas: [fecha] } : { ids })
+      })
+      if (response.ok) {
+        const data = await response.json()
+        setReportDetails(Object.fromEntries(data.reportes.map(reporte => [reporte.ID, reporte])))
+      }
+    } catch (err) {
+      // Sin precarga: el detalle se pide al abrir el reporte
+      console.error('Error prefetching report details:', err)
+    }
+  }
+
   const handleViewReport = async (reportId) => {
+    if (reportDetails[reportId]) {
+      setSelectedReport(reportDetails[reportId])
+      return
+    }
     try {
       const response = await fetch(`${API_BASE_URL}/admin/reportes/${reportId}`)
       if (response.ok) {
@@ -67,6 +98,12 @@ const TodayReportsStatus = ({ onReportsChange, selectedOperation }) => {
     fetchTodayReports()
   }, [user?.full_name, user?.fullName, user?.administrator_name, selectedOperation])
 
+  // Actualizar en vivo cuando cambian los reportes de este administrador
+  useReportEvents(() => fetchTodayReports({ silent: true }), {
+    enabled: Boolean(adminName),
+    filter: (event) => event.administrador === adminName
+  })
+
   // Notify parent component when reports status changes
   // Solo notificar si hay operación seleccionada (para usuarios multi-operación)
   useEffect(() => {
@@ -105,7 +142,7 @@ const TodayReportsStatus = ({ onReportsChange, selectedOperation }) => {
       }}>
         ❌ {error}
         <button 
-          onClick={fetchTodayReports}
+          onClick={() => fetchTodayReports()}
           style={{
             marginLeft: '1rem',
             padding: '0.25rem 0.5rem',
@@ -264,6 +301,7 @@ const TodayReportsStatus = ({ onReportsChange, selectedOperation }) => {
       {selectedReport && (
         <ReportDetail 
           report={selectedReport}
+          preloaded={Boolean(reportDetails[selectedReport.ID])}
           onClose={handleCloseReportDetail}
           allowEdit={true}
           onReportUpdated={handleReportUpdated}
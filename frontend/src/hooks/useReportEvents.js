@@ -0,0 +1,50 @@
+import { useEffect, useRef } from 'react'
+import { API_BASE_URL } from '../services/constants'
+
+const REPORT_EVENTS = ['report.created', 'report.updated', 'report.deleted', 'resync']
+
+/**
+ * Suscribirse a los eventos en vivo de reportes (Server-Sent Events)
+ *
+ * onEvent recibe { type, id, administrador, cliente_operacion, fecha }.
+ * Los eventos seguidos se agrupan (debounceMs) para no recargar de más
+ * durante el pico de la mañana; `resync` siempre se entrega.
+ */
+export const useReportEvents = (onEvent, { enabled = true, filter = null, debounceMs = 500 } = {}) => {
+  const handlerRef = useRef(onEvent)
+  const filterRef = useRef(filter)
+  handlerRef.current = onEvent
+  filterRef.current = filter
+
+  useEffect(() => {
+    if (!enabled || typeof window === 'undefined' || !window.EventSource) return undefined
+
+    const source = new EventSource(`${API_BASE_URL}/events`)
+    let timer = null
+    let lastEvent = null
+
+    const listener = (message) => {
+      let event
+      try {
+        event = JSON.parse(message.data)
+      } catch {
+        return
+      }
+      if (event.type !== 'resync' && filterRef.current && !filterRef.current(event)) return
+
+      lastEvent = event
+      clearTimeout(timer)
+      timer = setTimeout(() => handlerRef.current?.(lastEvent), debounceMs)
+    }
+
+    REPORT_EVENTS.forEach((type) => source.addEventListener(type, listener))
+
+    return () => {
+      clearTimeout(timer)
+      REPORT_EVENTS.forEach((type) => source.removeEventListener(type, listener))
+      source.close()
+    }
+  }, [enabled, debounceMs])
+}
+
+export default useReportEvents